@@ -1,10 +1,20 @@
 class DataQualityPipeline:
     """
     Automated pipeline for data quality detection
+    
+    Pass either a DataFrame or a profile (e.g. from profile_chunks); the
+    specialized checks need the rows and are skipped for a profile alone.
     """
-    def __init__(self, df):
+    def __init__(self, df=None, show_plots=None, profile=None):
         self.df = df
         self.quality_report = {}
+        # One detector (and one column profile) shared by every step
+        self.detector = DataQualityDetector(df, profile=profile, show_plots=show_plots)
+        
+    @classmethod
+    def from_chunks(cls, chunks, top_k=10):
+        """Pipeline over DataFrame chunks of a table too large to load"""
+        return cls(profile=profile_chunks(chunks, top_k))
         
     def run_pipeline(self):
         """Run complete quality detection pipeline"""
@@ -17,8 +27,7 @@ class DataQualityPipeline:
         
         # Step 2: Data quality detection
         print("\n🔍 Step 2: Running Quality Detector")
-        detector = DataQualityDetector(self.df)
-        self.quality_report['issues'] = detector.run_full_quality_check()
+        self.quality_report['issues'] = self.detector.run_full_quality_check()
         
         # Step 3: Specialized checks
         print("\n🎯 Step 3: Specialized Checks")
@@ -36,13 +45,14 @@ class DataQualityPipeline:
     
     def _basic_statistics(self):
         """Calculate basic dataset statistics"""
+        profile = self.detector.profile
         stats = {
-            'rows': len(self.df),
-            'columns': len(self.df.columns),
-            'memory_usage': self.df.memory_usage(deep=True).sum() / 1024**2,
-            'numeric_cols': len(self.df.select_dtypes(include=[np.number]).columns),
-            'categorical_cols': len(self.df.select_dtypes(include=['object']).columns),
-            'datetime_cols': len(self.df.select_dtypes(include=['datetime64']).columns)
+            'rows': profile.rows,
+            'columns': len(profile.columns),
+            'memory_usage': profile.memory_bytes / 1024**2,
+            'numeric_cols': len(profile.numeric_columns),
+            'categorical_cols': len(profile.object_columns),
+            'datetime_cols': len(profile.datetime_columns)
         }
         
         print(f"  • Rows: {stats['rows']:,}")
@@ -58,26 +68,33 @@ class DataQualityPipeline:
         """Run specialized checks based on data types"""
         specialized_issues = {}
         
+        if self.df is None:
+            print("  • Skipped: specialized checks need the rows, not just a profile")
+            self.quality_report['specialized_issues'] = specialized_issues
+            return
+        
+        profile = self.detector.profile
+        
         # Time series check
-        datetime_cols = self.df.select_dtypes(include=['datetime64']).columns
-        if len(datetime_cols) > 0 and len(self.df.select_dtypes(include=[np.number]).columns) > 0:
+        datetime_cols = profile.datetime_columns
+        if len(datetime_cols) > 0 and len(profile.numeric_columns) > 0:
             print("  • Running time series checks...")
             ts_issues = detect_time_series_issues(
                 self.df, 
                 datetime_cols[0], 
-                self.df.select_dtypes(include=[np.number]).columns[0]
+                profile.numeric_columns[0]
             )
             specialized_issues['time_series'] = ts_issues
         
         # Categorical checks
-        cat_cols = self.df.select_dtypes(include=['object']).columns
+        cat_cols = profile.object_columns
         if len(cat_cols) > 0:
             print("  • Running categorical data checks...")
             cat_issues = detect_categorical_issues(self.df, cat_cols[:5])
             specialized_issues['categorical'] = cat_issues
         
         # Text checks (if applicable)
-        text_cols = [col for col in cat_cols if self.df[col].astype(str).str.len().mean() > 50]
+        text_cols = [col for col in cat_cols if profile[col].str_len_mean > 50]
         if len(text_cols) > 0:
             print("  • Running text data checks...")
             text_issues = detect_text_issues(self.df, text_cols[0])
@@ -121,6 +138,16 @@ class DataQualityPipeline:
                         'impact': 'Model stability and accuracy'
                     })
         
+        # Memory recommendations (compact dtypes are not counted as issues)
+        suggestions = self.detector.dtype_suggestions
+        if suggestions:
+            recommendations.append({
+                'priority': 'LOW',
+                'issue': f"{len(suggestions)} columns use wider dtypes than their values need",
+                'action': f"Convert with detector.profile.apply_dtype_suggestions(df): {suggestions}",
+                'impact': 'Memory footprint and load time'
+            })
+        
         # Display recommendations
         print("\n🔧 RECOMMENDATIONS:")
         print("-" * 60)
@@ -135,9 +162,9 @@ class DataQualityPipeline:
         """Create final quality report"""
         report = {
             'timestamp': datetime.now().isoformat(),
-            'dataset_shape': self.df.shape,
-            'quality_score': self.quality_report.get('issues', {}).get('quality_score', 0),
-            'total_issues': sum(len(v) for v in self.quality_report.get('issues', {}).items() 
+            'dataset_shape': (self.detector.profile.rows, len(self.detector.profile.columns)),
+            'quality_score': self.detector.quality_score,
+            'total_issues': sum(len(v) for v in self.quality_report.get('issues', {}).values() 
                                if isinstance(v, list)),
             'recommendations': recommendations
         }
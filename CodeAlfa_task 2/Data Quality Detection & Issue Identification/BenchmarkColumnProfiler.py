@@ -0,0 +1,140 @@
+"""
+Quality-check statistics at 1M, 10M and 50M rows: per-check pandas calls vs ColumnProfiler
+
+The legacy side repeats what the checks computed before the profiler
+(isnull, duplicated, apply(type), nunique, to_datetime, quantiles,
+zscore, skew/kurtosis, value_counts, four str.contains scans per text
+column, corr and two deep memory_usage calls). The profiled side runs
+the full DataQualityDetector with plots off. Where both run, their
+decision statistics are compared.
+
+    python BenchmarkColumnProfiler.py                 # 1M, 10M, 50M
+    python BenchmarkColumnProfiler.py 1000000 --legacy-max-rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from scipy import stats
+
+from ColumnProfiler import DataFrameProfile
+from ComprehensiveDataQualityDetector import DataQualityDetector
+
+CATEGORIES = ['Electronics', 'books', 'Home ', 'garden', 'toys', 'Sports', 'beauty', 'auto']
+REGIONS = ['US', 'EU', 'APAC', 'LATAM']
+
+
+def make_table(rows, seed=0):
+    """Retail-like table: numeric measures with nulls/outliers, text and categorical columns"""
+    rng = np.random.default_rng(seed)
+    # The last 1% repeats the first 1%, as appended extracts produce
+    source = np.arange(rows)
+    source[rows - rows // 100:] = source[:rows // 100]
+    price = rng.lognormal(4, 0.8, rows)
+    price[rng.random(rows) < 0.02] = np.nan
+    price = price[source]
+    codes = rng.integers(0, len(CATEGORIES), rows).astype('int32')[source]
+    category = pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(CATEGORIES)).cast(pa.large_string())
+    return pd.DataFrame({
+        'price': price,
+        'discount': price * 0.1 + rng.normal(0, 1, rows)[source],
+        'quantity': rng.poisson(3, rows).astype('int32')[source],
+        'rating': rng.choice(np.array([1, 2, 3, 4, 5], dtype='float32'), rows)[source],
+        'category': pd.Series(pd.arrays.ArrowStringArray(pa.chunked_array([category]))),
+        'region': pd.Categorical.from_codes(rng.integers(0, len(REGIONS), rows)[source], REGIONS),
+    }, copy=False)
+
+
+def legacy_statistics(df):
+    """What the checks computed, one pandas call at a time"""
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    text_cols = df.select_dtypes(include=['object']).columns
+    result = {'memory': df.memory_usage(deep=True).sum(),
+              'missing': df.isnull().sum().to_dict(),
+              'duplicate_rows': int(df.duplicated().sum())}
+    for col in text_cols[:3]:
+        df[col].duplicated().sum()
+    for col in df.columns:
+        df[col].apply(type).unique()
+        if df[col].dtype in ['int64', 'float64']:
+            df[col].nunique()
+        if df[col].dtype == 'object':
+            with contextlib.suppress(Exception):
+                pd.to_datetime(df[col])
+    result['iqr_outliers'] = {}
+    for col in numeric_cols[:6]:
+        data = df[col].dropna()
+        np.abs(stats.zscore(data))
+        q1, q3 = data.quantile(0.25), data.quantile(0.75)
+        iqr = q3 - q1
+        result['iqr_outliers'][col] = int(np.sum((data < q1 - 1.5 * iqr) | (data > q3 + 1.5 * iqr)))
+    for col in text_cols:
+        text = df[col].astype(str)
+        for pattern in (r'^\s|\s$', '[A-Z]', '[a-z]', r'[^a-zA-Z0-9\s]'):
+            text.str.contains(pattern).any()
+        if df[col].nunique() < 20:
+            df[col].value_counts()
+    result['skew'] = {}
+    for col in numeric_cols[:6]:
+        data = df[col].dropna()
+        result['skew'][col] = data.skew()
+        data.kurtosis()
+    result['corr'] = df[numeric_cols].corr()
+    (1 - df.isnull().sum() / len(df)) * 100
+    df.memory_usage(deep=True)
+    return result
+
+
+def profiled_check(df, profile):
+    detector = DataQualityDetector(df, profile=profile, show_plots=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector.run_full_quality_check()
+    return detector
+
+
+def compare(legacy, profile):
+    assert legacy['missing'] == profile.null_counts().to_dict()
+    assert legacy['duplicate_rows'] == profile.duplicate_rows
+    assert legacy['iqr_outliers'] == {c: profile[c].iqr_outliers for c in legacy['iqr_outliers']}
+    for col, skew in legacy['skew'].items():
+        assert np.isclose(skew, profile[col].skew), col
+    assert np.allclose(legacy['corr'].to_numpy(), profile.correlation.to_numpy(), atol=1e-9)
+
+
+# Usage
+if __name__ == "__main__":
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser(description="Benchmark ColumnProfiler against per-check pandas calls")
+    parser.add_argument('rows', nargs='*', type=int, default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=10_000_000,
+                        help="skip the legacy side above this size (it needs several copies in memory)")
+    args = parser.parse_args()
+
+    print(f"{'Rows':>12}{'Legacy s':>11}{'Profile s':>11}{'Total s':>10}{'Speedup':>9}  Score")
+    for rows in args.rows:
+        df = make_table(rows)
+        legacy_time = None
+        if rows <= args.legacy_max_rows:
+            start = time.perf_counter()
+            legacy = legacy_statistics(df)
+            legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        profile = DataFrameProfile(df)
+        profile_time = time.perf_counter() - start
+        detector = profiled_check(df, profile)
+        total = time.perf_counter() - start
+        if legacy_time is not None:
+            compare(legacy, profile)
+
+        speedup = f"{legacy_time / total:.1f}x" if legacy_time else '-'
+        legacy_text = f"{legacy_time:.2f}" if legacy_time else '-'
+        print(f"{rows:>12,}{legacy_text:>11}{profile_time:>11.2f}{total:>10.2f}{speedup:>9}  "
+              f"{detector.quality_score}")
+        del df, profile, detector
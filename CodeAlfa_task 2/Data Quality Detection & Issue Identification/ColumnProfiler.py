@@ -0,0 +1,499 @@
+"""
+Single-pass column profiler shared by the DataQualityDetector checks
+
+Each column is read once into one ColumnProfile: null count, exact
+distinct count, min/max, moments (mean, std, skew, kurtosis), quantiles,
+IQR outlier count, top-k values, value types, string lengths and memory.
+Numeric columns are sorted once, and the sorted array yields quantiles,
+distinct values and value counts together. Object and string columns are
+factorized once, and their per-value checks (regexes, type inference)
+then run on the distinct values only. A row hash built from the
+same per-column keys finds duplicate rows; candidates are re-checked
+exactly with DataFrame.duplicated. Pairwise-complete correlations come
+from blocked matrix products instead of pandas' per-pair loop. The moment,
+text-flag and correlation helpers are shared with StreamingProfiler, which
+builds the same profile from chunks.
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from TypeInference import TypeInferencer, convert_column, suggest_dtype
+
+QUANTILES = (0.25, 0.5, 0.75)
+# Patterns the inconsistency check looks for in text columns
+TEXT_PATTERNS = {
+    'edge_spaces': r'^\s|\s$',
+    'upper': '[A-Z]',
+    'lower': '[a-z]',
+    'special': r'[^a-zA-Z0-9\s]',
+}
+# Rows per block for the correlation matrix products and the moment sums
+CORRELATION_BLOCK = 1_000_000
+MOMENT_BLOCK = 4_000_000
+# A pair whose one-pass sum of squares exceeds its centred one by this much
+# has lost too many digits to cancellation and is recomputed exactly
+ILL_CONDITIONED = 1e6
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(31)
+
+
+@dataclass
+class ColumnProfile:
+    """Statistics of one column, computed in a single read of its values"""
+    name: object
+    dtype: object
+    kind: str
+    rows: int
+    null_count: int = 0
+    distinct: int = 0
+    duplicate_values: int = 0
+    min: object = None
+    max: object = None
+    mean: float = np.nan
+    std: float = np.nan
+    skew: float = np.nan
+    kurtosis: float = np.nan
+    quantiles: dict = field(default_factory=dict)
+    iqr_outliers: int = 0
+    top_values: pd.Series = None
+    value_types: list = field(default_factory=list)
+    # Text columns: which TEXT_PATTERNS occur, and what the values hold (TypeInference.InferredType)
+    text_flags: dict = field(default_factory=dict)
+    inferred: object = None
+    suggested_dtype: str = None
+    # All present values when there are too few for the profile alone (streaming only)
+    sample: np.ndarray = None
+    memory_bytes: int = 0
+    str_len_min: float = np.nan
+    str_len_mean: float = np.nan
+    str_len_max: float = np.nan
+
+    @property
+    def count(self):
+        return self.rows - self.null_count
+
+    @property
+    def null_pct(self):
+        return self.null_count / self.rows * 100 if self.rows else 0.0
+
+
+def column_kind(series):
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'boolean'
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'categorical'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_string_dtype(dtype) and dtype != object:
+        return 'string'
+    return 'object'
+
+
+def interpolate_quantile(sorted_values, q):
+    """Linear-interpolated quantile of sorted data, as Series.quantile computes it"""
+    position = q * (len(sorted_values) - 1)
+    low = int(np.floor(position))
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = position - low
+    low_value, high_value = float(sorted_values[low]), float(sorted_values[high])
+    return low_value + (high_value - low_value) * fraction
+
+
+def top_counts(values, counts, k):
+    """The k most frequent values, ties kept in the order given (as value_counts does)"""
+    candidates = np.arange(len(counts))
+    if len(counts) > 4 * k:
+        # Only values at least as frequent as the k-th largest count can make the cut
+        threshold = np.sort(counts)[-k]
+        candidates = np.flatnonzero(counts >= threshold)
+    order = candidates[np.argsort(-counts[candidates], kind='stable')[:k]]
+    return pd.Series(counts[order], index=pd.Index(values).take(order), name='count')
+
+
+def central_moments(values):
+    """(n, mean, M2, M3, M4): sums of powers of deviations from the mean"""
+    n = len(values)
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    mean = values.mean(dtype='float64')
+    m2 = m3 = m4 = 0.0
+    # Blocks keep the temporaries small on long columns
+    for start in range(0, n, MOMENT_BLOCK):
+        deviations = values[start:start + MOMENT_BLOCK] - mean
+        squared = deviations * deviations
+        m2 += squared.sum()
+        m3 += np.dot(squared, deviations)
+        m4 += np.dot(squared, squared)
+    return n, float(mean), float(m2), float(m3), float(m4)
+
+
+def set_moments(profile, n, mean, m2, m3, m4):
+    """Mean, std and the bias-corrected skew/kurtosis pandas reports, from central moments"""
+    if n == 0:
+        return
+    profile.mean = float(mean)
+    profile.std = float(np.sqrt(m2 / (n - 1))) if n > 1 else np.nan
+    if n > 2:
+        profile.skew = 0.0 if m2 == 0 else float(n * (n - 1) ** 0.5 / (n - 2) * m3 / m2 ** 1.5)
+    if n > 3:
+        if m2 == 0:
+            profile.kurtosis = 0.0
+        else:
+            adjust = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            profile.kurtosis = float(n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2) - adjust)
+
+
+def _profile_sorted(profile, series, top_k):
+    """Numeric and datetime columns: one sort gives ranges, quantiles, distincts and top-k"""
+    if profile.kind == 'datetime':
+        raw = series.to_numpy(dtype='datetime64[ns]')
+        values = raw.view('int64')
+        mask = np.isnat(raw)
+    else:
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+        if values.dtype.kind == 'f':
+            mask = np.isnan(values)
+        else:
+            mask = np.zeros(len(values), dtype=bool)
+
+    profile.null_count = int(mask.sum())
+    profile.value_types = sampled_types(series, mask)
+    if profile.null_count < len(values):
+        sorted_statistics(profile, values, mask, top_k)
+
+    # Per-row key for the duplicate-row hash, built once the sort buffers are freed
+    if profile.kind == 'datetime':
+        return values.view('uint64')
+    if values.dtype.kind != 'f':
+        return values.astype('int64', copy=False).view('uint64')
+    # Equal rows must hash equal: one NaN pattern, and -0.0 as 0.0
+    key = values.astype('float64')
+    key += 0.0
+    if profile.null_count:
+        key[mask] = np.nan
+    return key.view('uint64')
+
+
+def sorted_statistics(profile, values, mask, top_k):
+    """Everything that needs the column in order, from a single sort"""
+    if profile.kind == 'datetime':
+        ordered = np.sort(values[~mask]) if profile.null_count else np.sort(values)
+    else:
+        # NaN sorts last, so the present values are the leading slice
+        ordered = np.sort(values)[:len(values) - profile.null_count]
+
+    change = np.empty(len(ordered), dtype=bool)
+    change[0] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=change[1:])
+    profile.distinct = int(np.count_nonzero(change))
+    profile.duplicate_values = profile.rows - profile.distinct - (1 if profile.null_count else 0)
+    if profile.distinct <= len(ordered) // 2:
+        # Low cardinality: run lengths of the sorted values are the value counts
+        starts = np.flatnonzero(change)
+        counts = np.diff(np.append(starts, len(ordered)))
+        distinct = ordered[starts]
+    else:
+        distinct, counts = _frequent_values(ordered, change, top_k)
+    del change
+
+    if profile.kind == 'datetime':
+        distinct = distinct.view('datetime64[ns]')
+        profile.min = pd.Timestamp(ordered[0].view('datetime64[ns]'))
+        profile.max = pd.Timestamp(ordered[-1].view('datetime64[ns]'))
+    else:
+        profile.min, profile.max = ordered[0].item(), ordered[-1].item()
+        profile.quantiles = {q: interpolate_quantile(ordered, q) for q in QUANTILES}
+        q1, q3 = profile.quantiles[0.25], profile.quantiles[0.75]
+        iqr = q3 - q1
+        below = np.searchsorted(ordered, q1 - 1.5 * iqr, side='left')
+        above = len(ordered) - np.searchsorted(ordered, q3 + 1.5 * iqr, side='right')
+        profile.iqr_outliers = int(below + above)
+        set_moments(profile, *central_moments(ordered))
+    profile.top_values = top_counts(distinct, counts, top_k)
+
+
+def _frequent_values(ordered, change, k):
+    """Top-k candidates of a mostly-unique sorted column without per-value run arrays"""
+    # Each repeat is one extra occurrence of a value that appeared just before it
+    repeats = ordered[~change]
+    distinct, counts = np.unique(repeats, return_counts=True)
+    counts += 1
+    if len(distinct) < k:
+        # Pad with values seen once, taken from the start of the column
+        block = min(len(ordered), 4 * k + 2 * len(repeats) + 1)
+        following = np.append(change[1:block + 1], True)[:block]
+        singles = ordered[:block][change[:block] & following][:k - len(distinct)]
+        distinct = np.concatenate([distinct, singles])
+        counts = np.concatenate([counts, np.ones(len(singles), dtype=counts.dtype)])
+    return distinct, counts
+
+
+def sampled_types(series, mask):
+    """Value types of a single-dtype column: one present and one null cell decide them"""
+    positions = [int(np.argmax(~mask))] if not mask.all() else []
+    if mask.any():
+        positions.append(int(np.argmax(mask)))
+    return list(series.iloc[positions].apply(type).unique())
+
+
+def object_value_types(series, inferred):
+    """Python types of an object column in order of appearance, like apply(type).unique()"""
+    if inferred.from_text or inferred.kind == 'empty':
+        # Strings only equal strings, so the distinct values already carry every type
+        return list(inferred.value_types)
+    # factorize merges hash-equal values of different types (1, 1.0, True)
+    types = np.frompyfunc(type, 1, 1)(series.to_numpy(dtype=object))
+    return list(pd.unique(types))
+
+
+def text_flags(values, names=None):
+    """Which TEXT_PATTERNS (or the named ones) occur in the values, after astype(str) as the checks apply it"""
+    text = values.astype(str)
+    return {name: bool(text.str.contains(TEXT_PATTERNS[name]).any()) for name in names or TEXT_PATTERNS}
+
+
+def object_memory(uniques, counts, null_values, null_count):
+    """What memory_usage(deep=True) sums per cell, summed per distinct value"""
+    sizes = np.array([sys.getsizeof(v) for v in uniques], dtype='int64')
+    null_size = sys.getsizeof(null_values[0]) if null_values else 0
+    return int((counts.sum() + null_count) * 8 + (sizes * counts).sum() + null_size * null_count)
+
+
+def _profile_factorized(profile, series, top_k, inferencer):
+    """Object, string, boolean and categorical columns: one factorize, then work on the distinct values"""
+    if profile.kind == 'categorical':
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    codes = np.asarray(codes, dtype='int64')
+    mask = codes < 0
+    profile.null_count = int(mask.sum())
+    counts = np.bincount(codes[~mask] if profile.null_count else codes, minlength=len(uniques))
+    if profile.kind == 'categorical':
+        present = counts > 0
+        uniques, counts = uniques[present], counts[present]
+    profile.distinct = len(uniques)
+    profile.duplicate_values = profile.rows - profile.distinct - (1 if profile.null_count else 0)
+    profile.top_values = top_counts(uniques, counts, top_k)
+
+    null_values = []
+    if profile.kind in ('object', 'string'):
+        if profile.null_count:
+            null_values = list(pd.unique(series.to_numpy()[mask]))
+        profile.inferred = inferencer.infer(uniques, series.name, null_values)
+    if profile.kind == 'object':
+        profile.value_types = object_value_types(series, profile.inferred)
+    else:
+        if profile.null_count:
+            null_values = series[mask].iloc[:1].tolist()
+        profile.value_types = sampled_types(series, mask)
+
+    if profile.kind in ('object', 'string'):
+        # Per-value checks run once per distinct value; nulls kept as the checks saw them
+        values = pd.Series(np.concatenate([uniques.to_numpy(dtype=object), np.array(null_values, dtype=object)]),
+                           dtype=series.dtype)
+        profile.text_flags = text_flags(values)
+        if len(uniques):
+            lengths = pd.Series(uniques).astype(str).str.len().to_numpy(dtype='float64')
+            profile.str_len_min = float(lengths.min())
+            profile.str_len_max = float(lengths.max())
+            profile.str_len_mean = float((lengths * counts).sum() / counts.sum())
+        if profile.kind == 'object':
+            profile.memory_bytes = object_memory(uniques, counts, null_values, profile.null_count)
+
+    if len(uniques) and (profile.kind == 'boolean'
+                         or (profile.kind == 'categorical' and series.cat.ordered)):
+        profile.min, profile.max = uniques.min(), uniques.max()
+    return codes.view('uint64')
+
+
+def profile_column(series, top_k=10, inferencer=None):
+    """ColumnProfile of a Series plus the per-row key used for duplicate detection"""
+    kind = column_kind(series)
+    profile = ColumnProfile(name=series.name, dtype=series.dtype, kind=kind, rows=len(series))
+    if kind in ('numeric', 'datetime'):
+        key = _profile_sorted(profile, series, top_k)
+    else:
+        key = _profile_factorized(profile, series, top_k, inferencer or TypeInferencer())
+    if kind != 'object':
+        profile.memory_bytes = int(series.memory_usage(deep=True, index=False))
+    profile.suggested_dtype = suggest_dtype(profile)
+    return profile, key
+
+
+def _mix(row_hash, key):
+    """Fold one column's per-row key into the running row hash"""
+    row_hash ^= key
+    row_hash *= _MIX
+    row_hash ^= row_hash >> _SHIFT
+    return row_hash
+
+
+class CorrelationSums:
+    """Pairwise-complete co-moments; blocks can come from one frame or many chunks
+
+    For every column pair (i, j) it keeps the rows both are present in, the
+    mean of i over those rows, the squared deviations of i from that mean
+    and the co-moment with j. Blocks are merged with Chan's update, so the
+    sums never mix values centred on different means.
+    """
+
+    def __init__(self, columns):
+        k = len(columns)
+        self.columns = list(columns)
+        self.pairs = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.m2 = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, block):
+        """Add a rows x columns float array (NaN for nulls)"""
+        present = ~np.isnan(block)
+        with np.errstate(invalid='ignore'):
+            center = np.nan_to_num(np.nanmean(block, axis=0)) if len(block) else np.zeros(block.shape[1])
+        shifted = block - center
+        shifted[~present] = 0.0
+        weights = present.astype('float64')
+
+        # One-pass sums from matrix products, shifted to the block's column means
+        pairs = weights.T @ weights
+        sum_x = shifted.T @ weights
+        sum_xx = (shifted * shifted).T @ weights
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(pairs > 0, sum_x / pairs, 0.0)
+            m2 = sum_xx - sum_x * mean
+            comoment = shifted.T @ shifted - sum_x * mean.T
+        m2 = np.maximum(m2, 0.0)
+
+        # A pair's rows can sit far from the column mean (a sentinel in a row the
+        # other column lacks): re-centre those pairs on their own means exactly
+        unstable = (pairs > 0) & ~(m2 * ILL_CONDITIONED >= sum_xx)
+        for i, j in zip(*np.nonzero(unstable | unstable.T)):
+            if i > j:
+                continue
+            rows = present[:, i] & present[:, j]
+            x, y = shifted[rows, i], shifted[rows, j]
+            dx, dy = x - x.mean(), y - y.mean()
+            mean[i, j], mean[j, i] = x.mean(), y.mean()
+            m2[i, j], m2[j, i] = dx @ dx, dy @ dy
+            comoment[i, j] = comoment[j, i] = dx @ dy
+
+        self._combine(pairs, mean + center[:, None], m2, comoment)
+
+    def merge(self, other):
+        """Fold in co-moments over the same columns"""
+        self._combine(other.pairs, other.mean, other.m2, other.comoment)
+        return self
+
+    def _combine(self, pairs, mean, m2, comoment):
+        # Chan et al.: combine two sets of centred sums, pair by pair
+        total = self.pairs + pairs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.where(total > 0, pairs / total, 0.0)
+        delta = mean - self.mean
+        weight = self.pairs * share
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + m2 + delta * delta * weight
+        self.comoment = self.comoment + comoment + delta * delta.T * weight
+        self.pairs = total
+
+    def result(self):
+        """Pearson correlation matrix, like DataFrame.corr()"""
+        variance = self.m2 * self.m2.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comoment / np.sqrt(variance)
+        corr[(self.pairs < 1) | ~(variance > 0)] = np.nan
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(np.diag(variance) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def numeric_block(df, columns, start=0, stop=None):
+    """Rows [start, stop) of the columns as one float64 array, NaN for nulls"""
+    return np.column_stack([
+        df[c].iloc[start:stop].to_numpy(dtype='float64', na_value=np.nan) for c in columns
+    ])
+
+
+def pairwise_correlation(df, columns):
+    """Pearson correlations over pairwise-complete rows, like DataFrame.corr()"""
+    sums = CorrelationSums(columns)
+    for start in range(0, len(df), CORRELATION_BLOCK):
+        sums.update(numeric_block(df, columns, start, start + CORRELATION_BLOCK))
+    return sums.result()
+
+
+class DataFrameProfile:
+    """Per-column profiles, duplicate rows and correlations of a DataFrame"""
+
+    def __init__(self, df, top_k=10):
+        self.rows = len(df)
+        self.dtypes = df.dtypes
+        self.numeric_columns = list(df.select_dtypes(include=[np.number]).columns)
+        self.object_columns = list(df.select_dtypes(include=['object']).columns)
+        self.datetime_columns = list(df.select_dtypes(include=['datetime64']).columns)
+        self.columns = {}
+        self.types = TypeInferencer()
+
+        row_hash = np.zeros(self.rows, dtype='uint64')
+        for name in df.columns:
+            profile, key = profile_column(df[name], top_k, self.types)
+            self.columns[name] = profile
+            _mix(row_hash, key)
+        self.duplicate_rows = self._count_duplicate_rows(df, row_hash)
+        self.index_memory_bytes = int(df.index.memory_usage(deep=True))
+
+        self.correlation = None
+        if len(self.numeric_columns) > 1:
+            self.correlation = pairwise_correlation(df, self.numeric_columns)
+
+    @staticmethod
+    def _count_duplicate_rows(df, row_hash):
+        """Exact df.duplicated().sum(): only rows sharing a hash are compared"""
+        if len(row_hash) < 2:
+            return 0
+        ordered = np.sort(row_hash)
+        repeated = ordered[1:][ordered[1:] == ordered[:-1]]
+        if len(repeated) == 0:
+            return 0
+        candidates = np.flatnonzero(pd.Series(row_hash).isin(np.unique(repeated)).to_numpy())
+        return int(df.iloc[candidates].duplicated().sum())
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __iter__(self):
+        return iter(self.columns.values())
+
+    @property
+    def memory_bytes(self):
+        return self.index_memory_bytes + sum(p.memory_bytes for p in self)
+
+    def dtype_suggestions(self):
+        """{column: compact dtype} for the columns that have one; apply with apply_dtype_suggestions"""
+        return {name: p.suggested_dtype for name, p in self.columns.items() if p.suggested_dtype}
+
+    def apply_dtype_suggestions(self, df):
+        """Copy of df with the suggested dtypes, text parsed the way it was inferred"""
+        compact = df.copy(deep=False)
+        for name, dtype in self.dtype_suggestions().items():
+            compact[name] = convert_column(df[name], dtype, self.columns[name].inferred)
+        return compact
+
+    def null_counts(self):
+        return pd.Series({name: p.null_count for name, p in self.columns.items()}, dtype='int64')
+
+    def memory_usage(self):
+        """Per-column deep memory in bytes, like df.memory_usage(deep=True) without the index"""
+        return pd.Series({name: p.memory_bytes for name, p in self.columns.items()}, dtype='int64')
@@ -1,20 +1,58 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ColumnProfiler import DataFrameProfile
+from StreamingProfiler import profile_chunks
+
+try:
+    import matplotlib.pyplot as plt
+    import missingno as msno
+    import seaborn as sns
+except ImportError:
+    # Headless runs: checks still work with show_plots=False
+    plt = msno = sns = None
+
+
 class DataQualityDetector:
     """
     Comprehensive data quality detection and issue identification
+    
+    Every check reads one shared DataFrameProfile, built lazily with a
+    single pass per column, instead of rescanning the DataFrame. Without a
+    DataFrame (see from_chunks) the checks run on a streamed profile alone.
     """
-    def __init__(self, df, dataset_name="Dataset"):
+    def __init__(self, df, dataset_name="Dataset", profile=None, show_plots=None):
         self.df = df
         self.dataset_name = dataset_name
         self.issues = {}
+        self.dtype_suggestions = {}
         self.quality_score = 100
+        self._profile = profile
+        # The plots draw from the rows themselves
+        if show_plots is None:
+            show_plots = plt is not None and df is not None
+        self.show_plots = show_plots
+        
+    @classmethod
+    def from_chunks(cls, chunks, dataset_name="Dataset", top_k=10):
+        """Detector over DataFrame chunks (e.g. iter_csv_chunks) without loading the whole table"""
+        return cls(None, dataset_name, profile=profile_chunks(chunks, top_k), show_plots=False)
+        
+    @property
+    def profile(self):
+        """Shared per-column statistics, computed on first use"""
+        if self._profile is None:
+            self._profile = DataFrameProfile(self.df)
+        return self._profile
         
     def run_full_quality_check(self):
         """Run all quality checks and generate report"""
         print(f"\n{'='*60}")
         print(f"DATA QUALITY REPORT: {self.dataset_name}")
         print(f"{'='*60}")
-        print(f"Dataset Shape: {self.df.shape}")
-        print(f"Memory Usage: {self.df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+        print(f"Dataset Shape: {(self.profile.rows, len(self.profile.columns))}")
+        print(f"Memory Usage: {self.profile.memory_bytes / 1024**2:.2f} MB")
         
         # Run all checks
         self.check_missing_values()
@@ -27,14 +65,15 @@ class DataQualityDetector:
         
         # Generate summary
         self.generate_summary()
-        self.create_quality_dashboard()
+        if self.show_plots:
+            self.create_quality_dashboard()
         
         return self.issues
     
     def check_missing_values(self):
         """Detect missing value patterns"""
-        missing = self.df.isnull().sum()
-        missing_pct = (missing / len(self.df)) * 100
+        missing = self.profile.null_counts()
+        missing_pct = (missing / self.profile.rows) * 100
         
         issues_found = []
         
@@ -55,7 +94,7 @@ class DataQualityDetector:
                     self.quality_score -= 5
                     
             # Visualize missing patterns
-            if len(cols_with_missing) > 0:
+            if len(cols_with_missing) > 0 and self.show_plots:
                 fig, axes = plt.subplots(1, 2, figsize=(15, 5))
                 
                 # Missing value matrix
@@ -75,8 +114,8 @@ class DataQualityDetector:
         
     def check_duplicates(self):
         """Detect duplicate records"""
-        duplicate_rows = self.df.duplicated().sum()
-        duplicate_pct = (duplicate_rows / len(self.df)) * 100
+        duplicate_rows = self.profile.duplicate_rows
+        duplicate_pct = (duplicate_rows / self.profile.rows) * 100
         
         issues_found = []
         
@@ -92,10 +131,10 @@ class DataQualityDetector:
                 self.quality_score -= 5
                 
             # Check for partial duplicates
-            for col in self.df.select_dtypes(include=['object']).columns[:3]:
-                duplicate_values = self.df[col].duplicated().sum()
+            for col in self.profile.object_columns[:3]:
+                duplicate_values = self.profile[col].duplicate_values
                 if duplicate_values > 0:
-                    duplicate_value_pct = (duplicate_values / len(self.df)) * 100
+                    duplicate_value_pct = (duplicate_values / self.profile.rows) * 100
                     print(f"  • {col}: {duplicate_values} duplicate values ({duplicate_value_pct:.2f}%)")
         else:
             print("\n✅ No duplicate rows detected")
@@ -108,11 +147,11 @@ class DataQualityDetector:
         
         print(f"\n📊 DATA TYPE ANALYSIS:")
         
-        for col in self.df.columns:
-            dtype = self.df[col].dtype
+        for col, column in self.profile.columns.items():
+            dtype = column.dtype
             
             # Check for mixed types
-            unique_types = self.df[col].apply(type).unique()
+            unique_types = np.array(column.value_types, dtype=object)
             if len(unique_types) > 1:
                 issues_found.append(f"Mixed types in {col}: {unique_types}")
                 self.quality_score -= 5
@@ -120,48 +159,44 @@ class DataQualityDetector:
             
             # Check numeric columns that might be categorical
             if dtype in ['int64', 'float64']:
-                unique_values = self.df[col].nunique()
+                unique_values = column.distinct
                 if unique_values < 10 and unique_values > 0:
                     issues_found.append(f"{col} might be categorical (only {unique_values} unique values)")
                     print(f"  ℹ️ {col}: Only {unique_values} unique values - consider categorical type")
             
-            # Check for date columns stored as strings
-            if dtype == 'object':
-                try:
-                    pd.to_datetime(self.df[col])
-                    issues_found.append(f"{col} should be datetime type")
-                    print(f"  ⚠️ {col}: Should be datetime type")
-                except:
-                    pass
+            # Check for date columns stored as strings (inferred from a sample, then confirmed)
+            if dtype == 'object' and column.inferred is not None and column.inferred.kind == 'datetime':
+                issues_found.append(f"{col} should be datetime type")
+                print(f"  ⚠️ {col}: Should be datetime type")
                     
         self.issues['data_types'] = issues_found
         
+        # Compact dtypes are advice only: they do not count as issues
+        self.dtype_suggestions = self.profile.dtype_suggestions()
+        for col, suggested in self.dtype_suggestions.items():
+            print(f"  💾 {col}: {self.profile[col].dtype} -> {suggested}")
+        
     def check_outliers(self):
         """Detect outliers using multiple methods"""
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.profile.numeric_columns
         issues_found = []
         
         if len(numeric_cols) > 0:
             print(f"\n📊 OUTLIER DETECTION:")
             
-            fig, axes = plt.subplots(2, 3, figsize=(15, 10))
-            axes = axes.flatten()
+            if self.show_plots:
+                fig, axes = plt.subplots(2, 3, figsize=(15, 10))
+                axes = axes.flatten()
             plot_idx = 0
             
             for col in numeric_cols[:6]:  # Limit to 6 columns for visualization
-                data = self.df[col].dropna()
+                column = self.profile[col]
+                if column.count == 0:
+                    continue
                 
-                # Z-score method
-                z_scores = np.abs(stats.zscore(data))
-                outliers_z = np.sum(z_scores > 3)
-                pct_outliers_z = (outliers_z / len(data)) * 100
-                
-                # IQR method
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
-                IQR = Q3 - Q1
-                outliers_iqr = np.sum((data < (Q1 - 1.5 * IQR)) | (data > (Q3 + 1.5 * IQR)))
-                pct_outliers_iqr = (outliers_iqr / len(data)) * 100
+                # IQR method (fences from the profiled quartiles)
+                outliers_iqr = column.iqr_outliers
+                pct_outliers_iqr = (outliers_iqr / column.count) * 100
                 
                 if pct_outliers_iqr > 5:
                     issues_found.append(f"High outlier percentage in {col}: {pct_outliers_iqr:.2f}%")
@@ -173,19 +208,20 @@ class DataQualityDetector:
                     print(f"  ℹ️ {col}: {outliers_iqr} outliers ({pct_outliers_iqr:.2f}%)")
                 
                 # Visualization
-                if plot_idx < 6:
-                    axes[plot_idx].boxplot(data)
+                if self.show_plots and plot_idx < 6:
+                    axes[plot_idx].boxplot(self.df[col].dropna())
                     axes[plot_idx].set_title(f'{col}\nOutliers: {pct_outliers_iqr:.1f}%')
                     axes[plot_idx].set_ylabel('Value')
                     plot_idx += 1
             
             # Hide unused subplots
-            for i in range(plot_idx, 6):
-                axes[i].set_visible(False)
-                
-            plt.suptitle('Outlier Detection - Box Plots', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.show()
+            if self.show_plots:
+                for i in range(plot_idx, 6):
+                    axes[i].set_visible(False)
+                    
+                plt.suptitle('Outlier Detection - Box Plots', fontsize=14, fontweight='bold')
+                plt.tight_layout()
+                plt.show()
         else:
             print("\nℹ️ No numeric columns for outlier detection")
             
@@ -197,60 +233,65 @@ class DataQualityDetector:
         
         print(f"\n📊 DATA INCONSISTENCY CHECK:")
         
-        for col in self.df.select_dtypes(include=['object']).columns:
+        for col in self.profile.object_columns:
+            column = self.profile[col]
+            # Pattern checks ran on the distinct values; any() over them equals any() over all rows
+            flags = column.text_flags
+            
             # Check for leading/trailing spaces
-            has_spaces = self.df[col].astype(str).str.contains('^\s|\s$').any()
+            has_spaces = flags['edge_spaces']
             if has_spaces:
                 issues_found.append(f"Leading/trailing spaces in {col}")
                 print(f"  ⚠️ {col}: Contains leading/trailing spaces")
                 self.quality_score -= 2
             
             # Check for inconsistent case
-            if self.df[col].dtype == 'object':
-                case_mixed = self.df[col].astype(str).str.contains('[A-Z]').any() and \
-                            self.df[col].astype(str).str.contains('[a-z]').any()
+            if column.dtype == 'object':
+                case_mixed = flags['upper'] and flags['lower']
                 if case_mixed:
                     print(f"  ℹ️ {col}: Mixed case detected")
             
             # Check for special characters
-            special_chars = self.df[col].astype(str).str.contains('[^a-zA-Z0-9\s]').any()
+            special_chars = flags['special']
             if special_chars:
                 print(f"  ℹ️ {col}: Contains special characters")
             
             # Check value distributions for categorical columns
-            if self.df[col].nunique() < 20:
-                value_counts = self.df[col].value_counts()
+            if column.distinct < 20:
+                value_counts = column.top_values
                 print(f"  📊 {col} value distribution:")
                 for val, count in value_counts.head().items():
-                    pct = (count / len(self.df)) * 100
+                    pct = (count / self.profile.rows) * 100
                     print(f"      {val}: {count} ({pct:.1f}%)")
                     
         self.issues['inconsistencies'] = issues_found
         
     def check_distribution_issues(self):
         """Check for distribution problems"""
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.profile.numeric_columns
         issues_found = []
         
         if len(numeric_cols) > 0:
             print(f"\n📊 DISTRIBUTION ANALYSIS:")
             
-            fig, axes = plt.subplots(2, 3, figsize=(15, 10))
-            axes = axes.flatten()
+            if self.show_plots:
+                fig, axes = plt.subplots(2, 3, figsize=(15, 10))
+                axes = axes.flatten()
             plot_idx = 0
             
             for col in numeric_cols[:6]:
-                data = self.df[col].dropna()
+                column = self.profile[col]
                 
-                # Normality test
-                if len(data) > 3 and len(data) < 5000:
-                    _, p_value = stats.shapiro(data)
+                # Normality test (small columns only, so reading them is cheap)
+                if column.count > 3 and column.count < 5000:
+                    values = self.df[col].dropna() if self.df is not None else column.sample
+                    _, p_value = stats.shapiro(values)
                     if p_value < 0.05:
                         issues_found.append(f"{col} is not normally distributed (p={p_value:.4f})")
                         print(f"  ℹ️ {col}: Not normally distributed (p={p_value:.4f})")
                 
                 # Skewness
-                skewness = data.skew()
+                skewness = column.skew
                 if abs(skewness) > 2:
                     issues_found.append(f"High skewness in {col}: {skewness:.2f}")
                     print(f"  ⚠️ {col}: Highly skewed ({skewness:.2f})")
@@ -259,39 +300,41 @@ class DataQualityDetector:
                     print(f"  ℹ️ {col}: Moderately skewed ({skewness:.2f})")
                 
                 # Kurtosis
-                kurtosis = data.kurtosis()
+                kurtosis = column.kurtosis
                 if abs(kurtosis) > 3:
                     print(f"  ℹ️ {col}: High kurtosis ({kurtosis:.2f})")
                 
                 # Visualization
-                if plot_idx < 6:
-                    axes[plot_idx].hist(data, bins=30, edgecolor='black', alpha=0.7)
-                    axes[plot_idx].axvline(data.mean(), color='red', linestyle='--', label=f'Mean: {data.mean():.2f}')
-                    axes[plot_idx].axvline(data.median(), color='green', linestyle='--', label=f'Median: {data.median():.2f}')
+                if self.show_plots and plot_idx < 6:
+                    median = column.quantiles.get(0.5, np.nan)
+                    axes[plot_idx].hist(self.df[col].dropna(), bins=30, edgecolor='black', alpha=0.7)
+                    axes[plot_idx].axvline(column.mean, color='red', linestyle='--', label=f'Mean: {column.mean:.2f}')
+                    axes[plot_idx].axvline(median, color='green', linestyle='--', label=f'Median: {median:.2f}')
                     axes[plot_idx].set_title(f'{col}\nSkewness: {skewness:.2f}')
                     axes[plot_idx].legend()
                     plot_idx += 1
             
             # Hide unused subplots
-            for i in range(plot_idx, 6):
-                axes[i].set_visible(False)
-                
-            plt.suptitle('Distribution Analysis - Histograms', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.show()
+            if self.show_plots:
+                for i in range(plot_idx, 6):
+                    axes[i].set_visible(False)
+                    
+                plt.suptitle('Distribution Analysis - Histograms', fontsize=14, fontweight='bold')
+                plt.tight_layout()
+                plt.show()
             
         self.issues['distribution'] = issues_found
         
     def check_correlations(self):
         """Check for problematic correlations"""
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.profile.numeric_columns
         issues_found = []
         
         if len(numeric_cols) > 1:
             print(f"\n📊 CORRELATION ANALYSIS:")
             
-            # Calculate correlation matrix
-            corr_matrix = self.df[numeric_cols].corr()
+            # Correlation matrix from the profile (pairwise-complete, like DataFrame.corr)
+            corr_matrix = self.profile.correlation
             
             # Find highly correlated pairs
             high_corr = []
@@ -311,14 +354,15 @@ class DataQualityDetector:
                     self.quality_score -= 2
             
             # Visualization
-            plt.figure(figsize=(10, 8))
-            mask = np.triu(np.ones_like(corr_matrix), k=1)
-            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
-                       mask=mask, square=True, linewidths=1,
-                       cbar_kws={"shrink": 0.8})
-            plt.title('Correlation Matrix (Upper Triangle)')
-            plt.tight_layout()
-            plt.show()
+            if self.show_plots:
+                plt.figure(figsize=(10, 8))
+                mask = np.triu(np.ones_like(corr_matrix), k=1)
+                sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0,
+                           mask=mask, square=True, linewidths=1,
+                           cbar_kws={"shrink": 0.8})
+                plt.title('Correlation Matrix (Upper Triangle)')
+                plt.tight_layout()
+                plt.show()
             
         self.issues['correlations'] = issues_found
         
@@ -345,6 +389,7 @@ class DataQualityDetector:
             grade = "D (Poor)"
             color = 'red'
             
+        self.grade = grade
         print(f"Quality Score: {self.quality_score:.1f}/100 - Grade: {grade}")
         
         # Count issues by category
@@ -390,7 +435,7 @@ class DataQualityDetector:
         
         # Data completeness
         ax3 = plt.subplot(2, 3, 3)
-        completeness = (1 - self.df.isnull().sum() / len(self.df)) * 100
+        completeness = (1 - self.profile.null_counts() / self.profile.rows) * 100
         ax3.barh(range(len(completeness)), completeness.values)
         ax3.set_yticks(range(len(completeness)))
         ax3.set_yticklabels(completeness.index)
@@ -400,13 +445,13 @@ class DataQualityDetector:
         
         # Memory usage
         ax4 = plt.subplot(2, 3, 4)
-        memory_usage = self.df.memory_usage(deep=True)[1:] / 1024  # KB
+        memory_usage = self.profile.memory_usage() / 1024  # KB
         ax4.pie(memory_usage.values, labels=memory_usage.index, autopct='%1.1f%%')
         ax4.set_title('Memory Usage Distribution')
         
         # Data types distribution
         ax5 = plt.subplot(2, 3, 5)
-        dtype_counts = self.df.dtypes.value_counts()
+        dtype_counts = self.profile.dtypes.value_counts()
         ax5.pie(dtype_counts.values, labels=dtype_counts.index.astype(str), autopct='%1.1f%%')
         ax5.set_title('Data Types Distribution')
         
@@ -414,7 +459,7 @@ class DataQualityDetector:
         ax6 = plt.subplot(2, 3, 6)
         ax6.text(0.5, 0.5, f'Quality Score:\n{self.quality_score:.1f}/100', 
                 ha='center', va='center', fontsize=20, fontweight='bold')
-        ax6.text(0.5, 0.3, f'Grade: {grade}', ha='center', va='center', fontsize=14)
+        ax6.text(0.5, 0.3, f'Grade: {self.grade}', ha='center', va='center', fontsize=14)
         ax6.axis('off')
         
         plt.suptitle(f'Data Quality Dashboard - {self.dataset_name}', fontsize=16, fontweight='bold')
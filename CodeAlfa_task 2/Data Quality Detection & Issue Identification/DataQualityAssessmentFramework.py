@@ -6,6 +6,7 @@ from scipy import stats
 import missingno as msno
 from datetime import datetime
 import warnings
+from StreamingProfiler import iter_csv_chunks, iter_parquet_batches, profile_chunks
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -0,0 +1,801 @@
+"""
+Out-of-core column profiles for CSV/Parquet files larger than memory
+
+StreamingProfiler reads a table chunk by chunk (read_csv chunks or Parquet
+record batches) and keeps only mergeable accumulators per column, so a
+profile can be built from any number of chunks, or from several partial
+profilers merged together. The result is a StreamingProfile with the same
+interface as DataFrameProfile, so DataQualityDetector runs its checks on it
+unchanged and reports the same issues and quality score.
+
+What is exact and what is estimated:
+
+- rows, null counts, value types, min/max, mean/std/skew/kurtosis (Pébay's
+  pairwise moment merge), string lengths, text pattern flags, inferred
+  types (one shared TypeInferencer keeps each column's datetime format
+  across chunks) and correlations are exact (up to float rounding)
+- numeric and datetime columns keep their values up to EXACT_VALUES
+  present values and are then profiled exactly like in memory. Past that,
+  quartiles and IQR outlier counts come from a t-digest (compression
+  1000): quantile ranks are off by well under 0.1% of the rows in the
+  middle of the distribution and far less in the tails, where the outlier
+  fences fall
+- text, boolean and categorical value counts and distinct counts are exact
+  up to EXACT_DISTINCT distinct values
+- past those limits, top values come from a Misra-Gries summary of
+  HEAVY_HITTERS counters (each count is low by at most present/(HEAVY_HITTERS + 1))
+  and distinct counts from a HyperLogLog sketch with 2**14 registers
+  (relative standard error 0.8%)
+- duplicate rows are exact (64-bit row hashes) up to EXACT_ROWS distinct
+  rows, then rows minus a 2**18-register HyperLogLog estimate of distinct
+  rows (relative standard error 0.2% of the distinct rows)
+
+A check whose statistic lands within these bounds of its threshold may
+flip; StreamingProfile.estimated lists the statistics that were estimated.
+A column must keep one kind across chunks: int chunks may widen to float,
+later all-null chunks fit any column, and str/bool/object chunks mix as
+object. Otherwise pass an explicit dtype to the reader.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ColumnProfiler import (
+    ColumnProfile, CorrelationSums, DataFrameProfile, QUANTILES, TEXT_PATTERNS, central_moments,
+    column_kind, numeric_block, object_memory, object_value_types, sampled_types, set_moments,
+    sorted_statistics, text_flags, top_counts,
+)
+from TypeInference import TypeInferencer, combine_inferred, suggest_dtype
+
+EXACT_VALUES = 1_000_000
+EXACT_DISTINCT = 10_000
+HEAVY_HITTERS = 1_000
+EXACT_ROWS = 2_000_000
+# Columns with fewer present values keep them, for the normality test
+SAMPLE_LIMIT = 5_000
+SORTED_KINDS = ('numeric', 'datetime')
+
+
+class HyperLogLog:
+    """Distinct-count sketch over 64-bit hashes, mergeable by register max"""
+
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype='uint8')
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype='uint64')
+        index = (hashes >> np.uint64(64 - self.p)).astype('int64')
+        # Rank of the first set bit in the next 32 bits (33 if none)
+        rest = ((hashes << np.uint64(self.p)) >> np.uint64(32)).astype('float64')
+        rank = (33 - np.frexp(rest)[1]).astype('uint8')
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype('int64')))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+def _sorted_unique(values):
+    ordered = np.sort(values)
+    keep = np.empty(len(ordered), dtype=bool)
+    keep[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=keep[1:])
+    return ordered[keep]
+
+
+class DistinctHashes:
+    """Exact set of 64-bit hashes up to a limit, then a HyperLogLog sketch"""
+
+    def __init__(self, limit, p):
+        self.limit = limit
+        self.p = p
+        # Hash arrays not yet deduplicated; combined once they pass twice the limit
+        self.parts = []
+        self.pending = 0
+        self.sketch = None
+
+    @property
+    def exact(self):
+        return self.sketch is None
+
+    def _combine(self):
+        if self.parts:
+            self.parts = [_sorted_unique(np.concatenate(self.parts))]
+        self.pending = sum(len(part) for part in self.parts)
+
+    def update(self, hashes):
+        if self.sketch is not None:
+            self.sketch.update(hashes)
+            return
+        self.parts.append(hashes)
+        self.pending += len(hashes)
+        if self.pending > 2 * self.limit:
+            self._combine()
+            if self.pending > self.limit:
+                self._to_sketch()
+
+    def _to_sketch(self):
+        self.sketch = HyperLogLog(self.p)
+        for part in self.parts:
+            self.sketch.update(part)
+        self.parts = None
+
+    def merge(self, other):
+        if other.sketch is None:
+            for part in other.parts:
+                self.update(part)
+        else:
+            if self.sketch is None:
+                self._to_sketch()
+            self.sketch.merge(other.sketch)
+        return self
+
+    def count(self):
+        if self.sketch is not None:
+            return self.sketch.estimate()
+        self._combine()
+        return self.pending
+
+
+class TDigest:
+    """Merging t-digest with the k1 (arcsine) scale function
+
+    Each update sorts the centroids together with the new points and groups
+    them by the integer part of k(q), so centroids stay small near the tails.
+    """
+
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype='float64')
+        if len(values) == 0:
+            return
+        if weights is None:
+            # Raw points: sort them and slot the (already sorted) centroids in
+            values = np.sort(values)
+            weights = np.ones(len(values))
+        else:
+            order = np.argsort(values, kind='stable')
+            values, weights = values[order], np.asarray(weights, dtype='float64')[order]
+        self.min = min(self.min, float(values[0]))
+        self.max = max(self.max, float(values[-1]))
+        slots = np.searchsorted(values, self.means)
+        means = np.insert(values, slots, self.means)
+        weights = np.insert(weights, slots, self.weights)
+
+        midpoints = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * midpoints - 1)
+        bucket = np.floor(k)
+        starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def merge(self, other):
+        if len(other.means):
+            self.update(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def _ranks(self):
+        """Centroid means against the rank at their centres, pinned to min/max"""
+        centres = np.cumsum(self.weights) - self.weights / 2
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        ranks = np.concatenate([[0.0], centres, [self.count]])
+        return values, ranks
+
+    def quantile(self, q):
+        values, ranks = self._ranks()
+        return float(np.interp(q * self.count, ranks, values))
+
+    def count_below(self, x):
+        """Estimated number of values < x"""
+        values, ranks = self._ranks()
+        return float(np.interp(x, values, ranks, left=0.0, right=self.count))
+
+
+class MomentSums:
+    """Count, mean and central moment sums M2-M4, merged with Pébay's formulas"""
+
+    def __init__(self):
+        self.n, self.mean, self.m2, self.m3, self.m4 = 0, 0.0, 0.0, 0.0, 0.0
+
+    def update(self, values):
+        self.merge_moments(*central_moments(values))
+
+    def merge(self, other):
+        self.merge_moments(other.n, other.mean, other.m2, other.m3, other.m4)
+        return self
+
+    def merge_moments(self, n_b, mean_b, m2_b, m3_b, m4_b):
+        n_a, mean_a, m2_a, m3_a, m4_a = self.n, self.mean, self.m2, self.m3, self.m4
+        if n_b == 0:
+            return
+        if n_a == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = n_b, mean_b, m2_b, m3_b, m4_b
+            return
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        delta_n = delta / n
+        self.n = n
+        self.mean = mean_a + delta_n * n_b
+        self.m2 = m2_a + m2_b + delta * delta_n * n_a * n_b
+        self.m3 = (m3_a + m3_b + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b)
+                   + 3 * delta_n * (n_a * m2_b - n_b * m2_a))
+        self.m4 = (m4_a + m4_b + delta * delta_n ** 3 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b)
+                   + 6 * delta_n ** 2 * (n_a * n_a * m2_b + n_b * n_b * m2_a)
+                   + 4 * delta_n * (n_a * m3_b - n_b * m3_a))
+
+
+class FrequencySketch:
+    """Exact value counts up to EXACT_DISTINCT values, then a Misra-Gries summary"""
+
+    def __init__(self, exact_limit=EXACT_DISTINCT, counters=HEAVY_HITTERS):
+        self.exact_limit = exact_limit
+        self.counters = counters
+        self.counts = pd.Series([], dtype='int64')
+        self.exact = True
+        # Total count removed by the reductions, the bound on each undercount
+        self.error = 0
+
+    def update(self, counts):
+        """Fold in value -> count for one chunk (values in order of appearance)
+
+        Returns the combined counts before any reduction, which are every
+        count seen so far while the sketch was still exact.
+        """
+        if len(self.counts) == 0:
+            combined = counts.astype('int64')
+        else:
+            combined = pd.concat([self.counts, counts]).groupby(level=0, sort=False).sum()
+        if self.exact and len(combined) <= self.exact_limit:
+            self.counts = combined
+            return combined
+        self.exact = False
+        full = combined
+        if len(combined) > self.counters:
+            # Mergeable Misra-Gries: drop the (k+1)-th largest count from every counter
+            cut = np.partition(combined.to_numpy(), len(combined) - self.counters - 1)[-self.counters - 1]
+            combined = combined[combined > cut] - cut
+            self.error += int(cut)
+        self.counts = combined
+        return full
+
+    def merge(self, other):
+        """Fold in another sketch; returns the combined counts like update"""
+        self.exact = self.exact and other.exact
+        self.error += other.error
+        return self.update(other.counts)
+
+
+def _weighted_quantile(values, counts, q):
+    """Series.quantile's linear interpolation over sorted distinct values and their counts"""
+    ends = np.cumsum(counts)
+    position = q * (ends[-1] - 1)
+    low = int(np.floor(position))
+    low_value = float(values[np.searchsorted(ends, low, side='right')])
+    high_value = float(values[np.searchsorted(ends, min(low + 1, ends[-1] - 1), side='right')])
+    return float(low_value + (high_value - low_value) * (position - low))
+
+
+def _numpy_dtype(dtype):
+    """numpy dtype behind a masked (Int64, Float64) or numpy dtype"""
+    return np.dtype(getattr(dtype, 'numpy_dtype', dtype))
+
+
+def _hash_values(values):
+    return pd.util.hash_array(np.asarray(values, dtype=object) if values.dtype.kind in 'OU' else values)
+
+
+class ColumnAccumulator:
+    """Mergeable state for one column: counts, types and the sketches its kind needs"""
+
+    def __init__(self, name, kind, dtype, top_k=10, types=None):
+        self.name = name
+        self.kind = kind
+        self.dtype = dtype
+        self.top_k = top_k
+        self.rows = 0
+        self.null_count = 0
+        self.value_types = []
+        self.memory_bytes = 0
+        self.frequencies = FrequencySketch()
+        self.distinct = None
+        self.min = self.max = None
+        if kind in SORTED_KINDS:
+            # Present values, kept (and profiled exactly) up to EXACT_VALUES
+            self.values = []
+            self.retained = 0
+            self.moments = MomentSums()
+            self.digest = None
+        else:
+            self.flags = dict.fromkeys(TEXT_PATTERNS, False)
+            self.types = types or TypeInferencer()
+            self.inferred = None
+            self.str_len_min = np.inf
+            self.str_len_max = -np.inf
+            self.str_len_sum = 0.0
+
+    def _add_types(self, types):
+        for value_type in types:
+            if value_type not in self.value_types:
+                self.value_types.append(value_type)
+
+    def _widen(self, series):
+        """Reconcile the dtype of a chunk with what earlier chunks had"""
+        kind = column_kind(series)
+        if series.dtype == self.dtype:
+            return kind
+        if (kind in SORTED_KINDS) != (self.kind in SORTED_KINDS) or \
+                (kind in SORTED_KINDS and kind != self.kind):
+            raise ValueError(f"Column {self.name!r} changes from {self.kind} to {kind} between chunks; "
+                             f"pass an explicit dtype when reading")
+        if kind == 'numeric':
+            self.dtype = np.result_type(_numpy_dtype(self.dtype), _numpy_dtype(series.dtype))
+        elif isinstance(series.dtype, pd.CategoricalDtype) and isinstance(self.dtype, pd.CategoricalDtype):
+            categories = self.dtype.categories.append(series.dtype.categories).unique()
+            self.dtype = pd.CategoricalDtype(categories, ordered=self.dtype.ordered)
+        elif kind not in SORTED_KINDS:
+            self.dtype = np.dtype(object)
+            self.kind = 'object'
+        return kind
+
+    def update(self, series):
+        self.rows += len(series)
+        mask = series.isna().to_numpy()
+        nulls = int(mask.sum())
+        self.null_count += nulls
+        if nulls == len(series) and (column_kind(series) in SORTED_KINDS) != (self.kind in SORTED_KINDS):
+            # An all-null chunk reads as float or object whatever the column is
+            self._add_types(sampled_types(series, mask))
+            return
+        kind = self._widen(series)
+        if self.kind in SORTED_KINDS:
+            self._update_sorted(series, kind, mask)
+        else:
+            self._update_factorized(series, kind, mask)
+
+    def _update_sorted(self, series, kind, mask):
+        self._add_types(sampled_types(series, mask))
+        self.memory_bytes += int(series.memory_usage(deep=True, index=False))
+        if kind == 'datetime':
+            values = series.to_numpy(dtype='datetime64[ns]')[~mask].view('int64')
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iu':
+            values = series.to_numpy().astype('int64', copy=False)
+        else:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)[~mask]
+        if len(values) == 0:
+            return
+        low, high = values.min(), values.max()
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        if kind == 'numeric':
+            self.moments.update(values)
+        if self.values is not None:
+            self.values.append(values)
+            self.retained += len(values)
+            if self.retained > EXACT_VALUES:
+                self._spill()
+        else:
+            self._update_sketches(values)
+
+    def _spill(self):
+        """Past EXACT_VALUES: fold the kept values into value counts (and sketches once those overflow)"""
+        values = np.concatenate(self.values)
+        self.values = None
+        self._update_sketches(values)
+
+    def _update_sketches(self, values):
+        if self.kind == 'numeric':
+            # Numbers count as float64 so int and float chunks agree; -0.0 is 0.0
+            values = values.astype('float64') + 0.0
+            if self.digest is not None:
+                self.digest.update(values)
+        self._update_counts(pd.Series(values).value_counts(sort=False))
+
+    def _update_counts(self, counts):
+        """Exact value counts, then a heavy-hitter summary with distinct and quantile sketches"""
+        was_exact = self.frequencies.exact
+        combined = self.frequencies.update(counts)
+        if was_exact and not self.frequencies.exact:
+            self._start_sketches(combined)
+        elif not was_exact:
+            self.distinct.update(_hash_values(counts.index.to_numpy()))
+
+    def _start_sketches(self, counts):
+        """Seed the distinct (and numeric quantile) sketches from exact value counts"""
+        self.distinct = HyperLogLog(14)
+        self.distinct.update(_hash_values(counts.index.to_numpy()))
+        if self.kind == 'numeric':
+            self.digest = TDigest()
+            self.digest.update(counts.index.to_numpy(dtype='float64'), counts.to_numpy(dtype='float64'))
+
+    def _merge_counts(self, other):
+        own = self.frequencies.counts if self.frequencies.exact else None
+        theirs = other.frequencies.counts if other.frequencies.exact else None
+        combined = self.frequencies.merge(other.frequencies)
+        if self.frequencies.exact:
+            return
+        if own is not None and theirs is not None:
+            self._start_sketches(combined)
+            return
+        # At least one side has sketches already; build them for the other
+        if own is not None:
+            self._start_sketches(own)
+        if theirs is not None:
+            other._start_sketches(theirs)
+        self.distinct.merge(other.distinct)
+        if self.digest is not None:
+            self.digest.merge(other.digest)
+
+    def _update_factorized(self, series, kind, mask):
+        if kind == 'categorical':
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        codes = np.asarray(codes, dtype='int64')
+        counts = np.bincount(codes[~mask], minlength=len(uniques))
+        if kind == 'categorical':
+            present = counts > 0
+            uniques, counts = uniques[present], counts[present]
+        self._update_counts(pd.Series(counts, index=pd.Index(uniques, dtype=object)))
+
+        null_values = []
+        if kind == 'object':
+            if mask.any():
+                null_values = list(pd.unique(series.to_numpy()[mask]))
+            self.memory_bytes += object_memory(uniques, counts, null_values, int(mask.sum()))
+        else:
+            if mask.any():
+                null_values = series[mask].iloc[:1].tolist()
+            self._add_types(sampled_types(series, mask))
+            self.memory_bytes += int(series.memory_usage(deep=True, index=False))
+
+        if kind in ('object', 'string'):
+            values = pd.Series(np.concatenate([pd.Index(uniques).to_numpy(dtype=object),
+                                               np.array(null_values, dtype=object)]), dtype=series.dtype)
+            # Patterns already found stay found; only the others are searched for
+            missing = [name for name, seen in self.flags.items() if not seen]
+            if missing:
+                self.flags.update(text_flags(values, missing))
+            if len(uniques):
+                lengths = pd.Series(uniques).astype(str).str.len().to_numpy(dtype='float64')
+                self.str_len_min = min(self.str_len_min, lengths.min())
+                self.str_len_max = max(self.str_len_max, lengths.max())
+                self.str_len_sum += float((lengths * counts).sum())
+        if self.kind in ('object', 'string'):
+            inferred = self.types.infer(pd.Index(uniques).to_numpy(dtype=object), self.name, null_values)
+            self.inferred = combine_inferred(self.inferred, inferred)
+            if kind == 'object':
+                self._add_types(object_value_types(series, inferred))
+
+        if len(uniques) and (kind == 'boolean' or (kind == 'categorical' and series.cat.ordered)):
+            low, high = uniques.min(), uniques.max()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        """Fold in the accumulator of the same column from other chunks (other may be spilled too)"""
+        if other.rows == 0:
+            return self
+        if self.rows == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        if (self.kind in SORTED_KINDS) != (other.kind in SORTED_KINDS):
+            raise ValueError(f"Column {self.name!r} is {self.kind} in one part and {other.kind} in another")
+        self.rows += other.rows
+        self.null_count += other.null_count
+        self.memory_bytes += other.memory_bytes
+        self._add_types(other.value_types)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        if self.dtype != other.dtype:
+            self.dtype = (np.result_type(_numpy_dtype(self.dtype), _numpy_dtype(other.dtype))
+                          if self.kind == 'numeric' else np.dtype(object))
+
+        if self.kind in SORTED_KINDS:
+            self.moments.merge(other.moments)
+            if self.values is not None and other.values is not None:
+                self.values += other.values
+                self.retained += other.retained
+                if self.retained > EXACT_VALUES:
+                    self._spill()
+                return self
+            for side in (self, other):
+                if side.values is not None:
+                    side._spill()
+            self._merge_counts(other)
+            return self
+
+        self._merge_counts(other)
+        self.flags = {name: self.flags[name] or other.flags[name] for name in TEXT_PATTERNS}
+        self.inferred = combine_inferred(self.inferred, other.inferred)
+        self.str_len_min = min(self.str_len_min, other.str_len_min)
+        self.str_len_max = max(self.str_len_max, other.str_len_max)
+        self.str_len_sum += other.str_len_sum
+        return self
+
+    def profile(self):
+        """ColumnProfile from the accumulated state, with the names of estimated fields"""
+        profile = ColumnProfile(name=self.name, dtype=self.dtype, kind=self.kind, rows=self.rows,
+                                null_count=self.null_count, value_types=list(self.value_types),
+                                memory_bytes=self.memory_bytes)
+        if self.kind in SORTED_KINDS:
+            estimated = self._sorted_profile(profile)
+        else:
+            estimated = self._factorized_profile(profile)
+        profile.suggested_dtype = suggest_dtype(profile)
+        return profile, estimated
+
+    def _sorted_profile(self, profile):
+        if self.values is not None:
+            if self.retained:
+                values = np.concatenate(self.values)
+                if profile.count < SAMPLE_LIMIT:
+                    profile.sample = values
+                mask = np.zeros(len(values), dtype=bool)
+                if self.kind == 'numeric' and profile.null_count:
+                    # Same layout as the in-memory sort: NaN for the nulls
+                    values = np.concatenate([values.astype('float64'), np.full(profile.null_count, np.nan)])
+                sorted_statistics(profile, values, mask, self.top_k)
+            return []
+
+        estimated = []
+        counts = self.frequencies.counts
+        if self.frequencies.exact:
+            profile.distinct = len(counts)
+        else:
+            profile.distinct = self.distinct.estimate()
+            estimated = ['distinct', 'duplicate_values', 'top_values']
+        profile.duplicate_values = profile.rows - profile.distinct - (1 if profile.null_count else 0)
+        # Ties in value order, as the in-memory sort gives them
+        counts = counts.sort_index()
+        if self.kind == 'datetime':
+            counts.index = pd.DatetimeIndex(counts.index.to_numpy(dtype='int64').view('datetime64[ns]'))
+            profile.min = pd.Timestamp(np.int64(self.min).view('datetime64[ns]'))
+            profile.max = pd.Timestamp(np.int64(self.max).view('datetime64[ns]'))
+        else:
+            values = counts.index.to_numpy(dtype='float64')
+            if _numpy_dtype(self.dtype).kind in 'iu':
+                counts.index = counts.index.astype('int64')
+            profile.min, profile.max = self.min.item(), self.max.item()
+            set_moments(profile, self.moments.n, self.moments.mean, self.moments.m2, self.moments.m3,
+                        self.moments.m4)
+            if self.frequencies.exact:
+                weights = counts.to_numpy()
+                profile.quantiles = {q: _weighted_quantile(values, weights, q) for q in QUANTILES}
+                q1, q3 = profile.quantiles[0.25], profile.quantiles[0.75]
+                iqr = q3 - q1
+                outside = (values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)
+                profile.iqr_outliers = int(weights[outside].sum())
+            else:
+                profile.quantiles = {q: self.digest.quantile(q) for q in QUANTILES}
+                q1, q3 = profile.quantiles[0.25], profile.quantiles[0.75]
+                iqr = q3 - q1
+                below = self.digest.count_below(q1 - 1.5 * iqr)
+                above = profile.count - self.digest.count_below(np.nextafter(q3 + 1.5 * iqr, np.inf))
+                profile.iqr_outliers = int(round(below + above))
+                estimated += ['quantiles', 'iqr_outliers']
+        profile.top_values = top_counts(counts.index, counts.to_numpy(), self.top_k)
+        return estimated
+
+    def _factorized_profile(self, profile):
+        estimated = []
+        counts = self.frequencies.counts
+        if self.frequencies.exact:
+            profile.distinct = len(counts)
+        else:
+            profile.distinct = self.distinct.estimate()
+            estimated = ['distinct', 'duplicate_values', 'top_values']
+        profile.duplicate_values = profile.rows - profile.distinct - (1 if profile.null_count else 0)
+        profile.top_values = top_counts(counts.index, counts.to_numpy(), self.top_k)
+        if self.kind in ('object', 'string'):
+            profile.text_flags = dict(self.flags)
+            profile.inferred = self.inferred
+        if np.isfinite(self.str_len_min):
+            profile.str_len_min = float(self.str_len_min)
+            profile.str_len_max = float(self.str_len_max)
+            profile.str_len_mean = self.str_len_sum / profile.count
+        if self.min is not None:
+            profile.min, profile.max = self.min, self.max
+        return estimated
+
+
+class StreamingProfile(DataFrameProfile):
+    """DataFrameProfile built from accumulators instead of an in-memory DataFrame"""
+
+    def __init__(self, rows, columns, duplicate_rows, correlation, estimated):
+        self.rows = rows
+        self.columns = columns
+        self.dtypes = pd.Series({name: p.dtype for name, p in columns.items()}, dtype=object)
+        # An empty frame with the final dtypes selects columns the way the in-memory profile does
+        empty = pd.DataFrame({name: pd.Series(dtype=p.dtype) for name, p in columns.items()})
+        self.numeric_columns = list(empty.select_dtypes(include=[np.number]).columns)
+        self.object_columns = list(empty.select_dtypes(include=['object']).columns)
+        self.datetime_columns = list(empty.select_dtypes(include=['datetime64']).columns)
+        self.duplicate_rows = duplicate_rows
+        self.index_memory_bytes = int(pd.RangeIndex(rows).memory_usage(deep=True))
+        self.correlation = correlation
+        # 'duplicate_rows' or '<column>.<field>' for each statistic that came from a sketch
+        self.estimated = estimated
+
+
+class StreamingProfiler:
+    """Accumulates a profile over DataFrame chunks that share one schema"""
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.rows = 0
+        self.columns = {}
+        self.types = TypeInferencer()
+        self.row_hashes = DistinctHashes(EXACT_ROWS, 18)
+        self.correlation = None
+
+    def update(self, chunk):
+        """Add one chunk (a DataFrame with the same columns as the first one)"""
+        if not self.columns:
+            for name in chunk.columns:
+                series = chunk[name]
+                self.columns[name] = ColumnAccumulator(name, column_kind(series), series.dtype,
+                                                       self.top_k, self.types)
+            numeric = list(chunk.select_dtypes(include=[np.number]).columns)
+            if len(numeric) > 1:
+                self.correlation = CorrelationSums(numeric)
+        elif list(chunk.columns) != list(self.columns):
+            raise ValueError("Chunk columns differ from the first chunk")
+
+        self.rows += len(chunk)
+        for name, accumulator in self.columns.items():
+            accumulator.update(chunk[name])
+        self.row_hashes.update(_row_hashes(chunk))
+        if self.correlation is not None:
+            self.correlation.update(numeric_block(chunk, self.correlation.columns))
+        return self
+
+    def merge(self, other):
+        """Fold in a profiler that read other chunks of the same table"""
+        if not other.columns:
+            return self
+        if not self.columns:
+            self.__dict__.update(other.__dict__)
+            return self
+        self.rows += other.rows
+        for name, accumulator in self.columns.items():
+            accumulator.merge(other.columns[name])
+        self.row_hashes.merge(other.row_hashes)
+        if self.correlation is not None:
+            self.correlation.merge(other.correlation)
+        return self
+
+    def profile(self):
+        columns = {}
+        estimated = []
+        for name, accumulator in self.columns.items():
+            columns[name], fields = accumulator.profile()
+            estimated += [f"{name}.{field}" for field in fields]
+
+        duplicate_rows = max(self.rows - self.row_hashes.count(), 0)
+        if not self.row_hashes.exact:
+            estimated.insert(0, 'duplicate_rows')
+        profile = StreamingProfile(self.rows, columns, duplicate_rows, None, estimated)
+        if len(profile.numeric_columns) > 1:
+            numeric = profile.numeric_columns
+            profile.correlation = self.correlation.result().loc[numeric, numeric]
+        return profile
+
+
+def _row_hashes(chunk):
+    """64-bit hash per row; numbers hash as float64 so int and float chunks agree"""
+    normalized = {}
+    for name in chunk.columns:
+        series = chunk[name]
+        kind = column_kind(series)
+        if kind == 'numeric':
+            values = series.to_numpy(dtype='float64', na_value=np.nan) + 0.0
+            values[np.isnan(values)] = np.nan
+            series = pd.Series(values, index=chunk.index)
+        elif kind == 'boolean':
+            series = series.astype(object)
+        normalized[name] = series
+    return pd.util.hash_pandas_object(pd.DataFrame(normalized, index=chunk.index), index=False).to_numpy()
+
+
+def iter_csv_chunks(path, chunksize=100_000, **read_csv_kwargs):
+    """DataFrame chunks of a CSV file, read with pandas' chunked reader"""
+    with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+        yield from reader
+
+
+def iter_parquet_batches(path, batch_size=100_000, columns=None):
+    """DataFrame chunks of a Parquet file or dataset directory, one record batch at a time"""
+    import pyarrow.dataset as ds
+
+    # No readahead: one batch in memory at a time
+    batches = ds.dataset(path, format='parquet').to_batches(columns=columns, batch_size=batch_size,
+                                                           batch_readahead=0, fragment_readahead=0)
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+def profile_chunks(chunks, top_k=10):
+    """StreamingProfile of an iterable of DataFrame chunks"""
+    profiler = StreamingProfiler(top_k)
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler.profile()
+
+
+# Usage
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import io
+    import os
+    import tempfile
+    import time
+    import warnings
+
+    from BenchmarkColumnProfiler import make_table
+    from ComprehensiveDataQualityDetector import DataQualityDetector
+
+    warnings.filterwarnings('ignore')
+    parser = argparse.ArgumentParser(description="Compare streaming and in-memory quality checks")
+    parser.add_argument('rows', nargs='?', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    args = parser.parse_args()
+
+    def run(detector):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return detector.run_full_quality_check(), detector.quality_score
+
+    df = make_table(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'table.csv')
+        parquet_path = os.path.join(tmp, 'table.parquet')
+        df.to_csv(csv_path, index=False)
+        df.to_parquet(parquet_path, row_group_size=args.chunksize)
+        del df
+
+        sources = {
+            'CSV': (lambda: pd.read_csv(csv_path), lambda: iter_csv_chunks(csv_path, args.chunksize)),
+            'Parquet': (lambda: pd.read_parquet(parquet_path),
+                        lambda: iter_parquet_batches(parquet_path, args.chunksize)),
+        }
+        for label, (read, chunks) in sources.items():
+            start = time.perf_counter()
+            expected = run(DataQualityDetector(read(), label, show_plots=False))
+            in_memory = time.perf_counter() - start
+
+            start = time.perf_counter()
+            detector = DataQualityDetector.from_chunks(chunks(), label)
+            result = run(detector)
+            streaming = time.perf_counter() - start
+            print(f"{label}: in-memory {in_memory:.2f}s score {expected[1]}, "
+                  f"streaming {streaming:.2f}s score {result[1]}, same issues: {result == expected}")
+            if result != expected:
+                for category, issues in expected[0].items():
+                    if issues != result[0][category]:
+                        print(f"  {category}: {issues} vs {result[0][category]}")
+            print(f"  estimated: {', '.join(detector.profile.estimated) or 'nothing'}")
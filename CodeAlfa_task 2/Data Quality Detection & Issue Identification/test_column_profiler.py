@@ -0,0 +1,65 @@
+"""
+DataFrameProfile and StreamingProfiler against the pandas results they replace
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ColumnProfiler import DataFrameProfile
+from StreamingProfiler import StreamingProfiler
+
+warnings.filterwarnings('ignore')
+
+
+def streamed(df, chunk_rows):
+    profiler = StreamingProfiler()
+    for start in range(0, len(df), chunk_rows):
+        profiler.update(df.iloc[start:start + chunk_rows])
+    return profiler.profile()
+
+
+def assert_corr_matches(df, chunk_rows):
+    expected = df.corr()
+    for profile in (DataFrameProfile(df), streamed(df, chunk_rows)):
+        np.testing.assert_allclose(profile.correlation.to_numpy(), expected.to_numpy(),
+                                   atol=1e-9, equal_nan=True)
+
+
+def test_correlation_with_a_sentinel_the_other_column_lacks():
+    rng = np.random.default_rng(1)
+    a = rng.normal(size=10_000)
+    b = 0.9 * a + rng.normal(scale=0.4, size=10_000)
+    a[17] = 9.99e11
+    b[rng.random(10_000) < 0.2] = np.nan
+    b[17] = np.nan
+    df = pd.DataFrame({'a': a, 'b': b, 'c': rng.normal(size=10_000)})
+
+    assert DataFrameProfile(df).correlation.loc['a', 'b'] == pytest.approx(df.corr().loc['a', 'b'])
+    assert_corr_matches(df, 3_000)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_correlation_matches_pandas_with_nulls_and_outliers(seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = int(rng.integers(2, 40)), int(rng.integers(2, 5))
+    if seed % 2:
+        # Few distinct values: constant pairs, exact zeros, far-off sentinels
+        values = rng.choice([0.0, 1.0, 2.0, -3.5, 0.1, 1e9], size=(rows, cols))
+    else:
+        values = rng.normal(size=(rows, cols)) * 10.0 ** rng.integers(-3, 12, size=cols)
+    values[rng.random((rows, cols)) < 0.3] = np.nan
+    assert_corr_matches(pd.DataFrame(values, columns=list('wxyz')[:cols]), 7)
+
+
+def test_value_types_keep_hash_equal_values_of_different_types():
+    df = pd.DataFrame({
+        'flags': pd.Series([1, True, 0, False, None], dtype=object),
+        'numbers': pd.Series([1, 1.0, 2, 3, 4], dtype=object),
+        'text': pd.Series(['a', None, 'b', 'a', 'c'], dtype=object),
+    })
+    for profile in (DataFrameProfile(df), streamed(df, 2)):
+        for name in df.columns:
+            assert profile[name].value_types == list(df[name].apply(type).unique()), name
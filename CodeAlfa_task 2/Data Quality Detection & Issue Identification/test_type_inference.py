@@ -0,0 +1,55 @@
+"""
+dtype suggestions applied with DataFrameProfile.apply_dtype_suggestions keep the values
+"""
+
+import warnings
+
+import pandas as pd
+
+from ColumnProfiler import DataFrameProfile
+
+warnings.filterwarnings('ignore')
+
+
+def convert(df):
+    profile = DataFrameProfile(df)
+    return profile.dtype_suggestions(), profile.apply_dtype_suggestions(df)
+
+
+def test_boolean_tokens_keep_false_values():
+    df = pd.DataFrame({'flag': ['yes', 'no', 'Yes', 'NO'] * 3, 'maybe': ['True', 'False', None, 'true'] * 3})
+    suggestions, compact = convert(df)
+    assert suggestions == {'flag': 'bool', 'maybe': 'boolean'}
+    assert compact['flag'].tolist() == [True, False, True, False] * 3
+    assert compact['maybe'].tolist()[:4] == [True, False, pd.NA, True]
+
+
+def test_dates_use_the_inferred_format():
+    df = pd.DataFrame({'day': ['13/01/2024', '05/02/2024', None, '28/02/2024'] * 3})
+    suggestions, compact = convert(df)
+    assert suggestions == {'day': 'datetime64[ns]'}
+    assert compact['day'].iloc[1] == pd.Timestamp('2024-02-05')
+
+
+def test_offsets_convert_to_utc():
+    df = pd.DataFrame({'at': ['2024-01-01T10:00:00+02:00', '2024-01-02T11:30:00-05:00',
+                              None, '2024-03-01T00:00:00+00:00'] * 3})
+    suggestions, compact = convert(df)
+    assert suggestions == {'at': 'datetime64[ns, UTC]'}
+    assert compact['at'].iloc[0] == pd.Timestamp('2024-01-01T08:00:00Z')
+    assert compact['at'].iloc[1] == pd.Timestamp('2024-01-02T16:30:00Z')
+
+
+def test_zero_padded_and_signed_codes_stay_text():
+    df = pd.DataFrame({
+        'zip': ['02139', '10001', '94105', '00501'] * 3,
+        'sku': ['000123', '000124', '1', '2'] * 3,
+        'phone': ['+4412', '+331', '+12', '+5'] * 3,
+        'qty': ['0', '12', '-3', '40'] * 3,
+        'share': ['0.5', '0', '-0.25', '1'] * 3,
+    })
+    suggestions, compact = convert(df)
+    assert suggestions == {'zip': 'category', 'sku': 'category', 'phone': 'category',
+                           'qty': 'int8', 'share': 'float64'}
+    assert compact['zip'].astype(str).tolist() == df['zip'].tolist()
+    assert compact['qty'].tolist()[:4] == [0, 12, -3, 40]
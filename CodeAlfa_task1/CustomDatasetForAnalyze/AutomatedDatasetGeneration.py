@@ -1,19 +1,73 @@
+import copy
+import hashlib
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from DatasetCache import DatasetCache, dataset_key
+from PartitionedDatasets import PartitionedDataset
+
+
+def _generate_one(generator, analysis_type, parameters, columns, filters):
+    """Process-pool entry point for generate_many"""
+    return generator.generate_dataset(analysis_type, parameters, columns, filters)
+
+
 class AutomatedDatasetGenerator:
     """Generate custom datasets based on analysis type"""
     
-    def __init__(self):
+    version = '1.0'
+    
+    def __init__(self, cache_dir='dataset_cache', max_cache_bytes=2 * 1024**3,
+                 max_cache_age=7 * 86400):
         self.templates = {
             'price_analysis': self._price_analysis_template,
             'sentiment_analysis': self._sentiment_template,
             'trend_analysis': self._trend_template,
             'competitive_analysis': self._competitive_template
         }
+        # Content-addressed Parquet cache; cache_dir=None writes a new
+        # timestamped directory per call as before
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = DatasetCache(cache_dir, max_cache_bytes, max_cache_age)
     
-    def generate_dataset(self, analysis_type, parameters):
-        """Generate dataset for specific analysis type"""
+    def cache_key(self, analysis_type, parameters):
+        template = getattr(self.templates[analysis_type], '__func__', self.templates[analysis_type])
+        return dataset_key(analysis_type, parameters, self.version, template)
+    
+    # Sort key inside each partition, so row-group min/max stay narrow
+    sort_columns = {
+        'price_analysis': ['price'],
+        'sentiment_analysis': ['rating'],
+        'trend_analysis': ['date'],
+        'competitive_analysis': ['competitor', 'price'],
+    }
+    
+    def generate_dataset(self, analysis_type, parameters, columns=None, filters=None):
+        """Generate dataset for specific analysis type
+        
+        The dataset is stored as Hive-partitioned Parquet (category, region,
+        date). columns and filters (DNF, e.g. [('price', '<', 100)]) are pushed
+        down to the Parquet scan, so only the matching row groups are read.
+        """
         if analysis_type not in self.templates:
             raise ValueError(f"Unknown analysis type: {analysis_type}")
         
+        # Identical (template, version, parameters) requests reuse the stored Parquet
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(analysis_type, parameters)
+            path = self.cache.lookup(key)
+            if path is not None:
+                store = PartitionedDataset(path)
+                dataset = store.read(columns, filters)
+                dataset.attrs['cache_hit'] = True
+                return dataset, self._generate_quick_insights(store, analysis_type)
+        
         # Get template and collect data
         template_func = self.templates[analysis_type]
         dataset = template_func(parameters)
@@ -22,35 +76,183 @@ class AutomatedDatasetGenerator:
         dataset.attrs['analysis_type'] = analysis_type
         dataset.attrs['generation_date'] = datetime.now().isoformat()
         dataset.attrs['parameters'] = parameters
-        dataset.attrs['version'] = '1.0'
+        dataset.attrs['version'] = self.version
+        
+        def write(root):
+            return PartitionedDataset.write(dataset, root, sort_by=self.sort_columns.get(analysis_type))
+        
+        if self.cache is not None:
+            dataset.attrs['cache_key'] = key
+            store = PartitionedDataset(self.cache.put(key, write))
+            dataset.attrs['cache_hit'] = False
+        else:
+            # Save with analysis-specific naming; the suffix keeps calls in the
+            # same minute from writing into (and reading back) one directory
+            store = write(f"{analysis_type}_dataset_{datetime.now().strftime('%Y%m%d_%H%M')}"
+                          f"_{uuid.uuid4().hex[:8]}")
         
-        # Save with analysis-specific naming
-        filename = f"{analysis_type}_dataset_{datetime.now().strftime('%Y%m%d_%H%M')}.parquet"
-        dataset.to_parquet(filename)
+        # Read back what was stored, so misses return the same dtypes as hits
+        # (e.g. Parquet keeps datetime64[s] dates as datetime64[ms])
+        dataset = store.read(columns, filters)
+        dataset.attrs['cache_hit'] = False
         
         # Generate quick insights
-        insights = self._generate_quick_insights(dataset, analysis_type)
+        insights = self._generate_quick_insights(store, analysis_type)
         
         return dataset, insights
     
-    def _generate_quick_insights(self, dataset, analysis_type):
-        """Generate initial insights based on analysis type"""
+    def generate_many(self, requests, max_workers=None, columns=None, filters=None):
+        """Generate several (analysis_type, parameters) datasets in a process pool
+        
+        Cache hits are served in this process and duplicate requests are
+        built once, each getting its own copy. Results come back in request order.
+        """
+        results = [None] * len(requests)
+        pending = {}
+        for i, (analysis_type, parameters) in enumerate(requests):
+            if analysis_type not in self.templates:
+                raise ValueError(f"Unknown analysis type: {analysis_type}")
+            key = dataset_key(analysis_type, parameters, self.version)
+            if self.cache is not None:
+                key = self.cache_key(analysis_type, parameters)
+                path = self.cache.lookup(key)
+                if path is not None:
+                    store = PartitionedDataset(path)
+                    dataset = store.read(columns, filters)
+                    dataset.attrs['cache_hit'] = True
+                    results[i] = (dataset, self._generate_quick_insights(store, analysis_type))
+                    continue
+            pending.setdefault(key, (analysis_type, parameters, []))[2].append(i)
+        
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(max_workers or len(pending), len(pending))) as pool:
+                futures = {
+                    pool.submit(_generate_one, self, analysis_type, parameters, columns, filters): indexes
+                    for analysis_type, parameters, indexes in pending.values()
+                }
+                for future, indexes in futures.items():
+                    dataset, insights = future.result()
+                    results[indexes[0]] = (dataset, insights)
+                    # Duplicates get their own copies, so mutating one result leaves the others alone
+                    for i in indexes[1:]:
+                        results[i] = (dataset.copy(), copy.deepcopy(insights))
+        
+        if self.cache is not None:
+            self.cache.evict()
+        return results
+    
+    @staticmethod
+    def _rng(parameters):
+        """Generator seeded from the parameters, so equal requests give equal data"""
+        seed = hashlib.sha256(repr(sorted(parameters.items())).encode('utf-8')).digest()
+        return np.random.default_rng(int.from_bytes(seed[:8], 'big'))
+    
+    @staticmethod
+    def _dates(parameters, rows, rng):
+        days = int(str(parameters.get('timeframe', '30d')).rstrip('d'))
+        end = pd.Timestamp(datetime.now().date())
+        return end - pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+    
+    def _price_analysis_template(self, parameters):
+        """Competitor prices per product over the timeframe"""
+        rng = self._rng(parameters)
+        rows = parameters.get('rows', 100_000)
+        competitors = parameters.get('competitors', ['Amazon', 'BestBuy', 'Walmart', 'Target', 'eBay'])
+        base = rng.uniform(10, 2000, 1000)
+        product_id = rng.integers(0, 1000, rows)
+        return pd.DataFrame({
+            'date': self._dates(parameters, rows, rng),
+            'product_id': product_id,
+            'competitor': pd.Categorical.from_codes(rng.integers(0, len(competitors), rows), competitors),
+            'price': np.round(base[product_id] * rng.normal(1, 0.08, rows), 2),
+            'in_stock': rng.random(rows) > 0.1,
+            'category': parameters.get('category', 'all'),
+            'region': parameters.get('region', 'US'),
+        })
+    
+    def _sentiment_template(self, parameters):
+        """Product reviews with ratings and sentiment labels"""
+        rng = self._rng(parameters)
+        rows = parameters.get('rows', 100_000)
+        rating = rng.choice([1, 2, 3, 4, 5], rows, p=[0.08, 0.07, 0.15, 0.3, 0.4])
+        return pd.DataFrame({
+            'date': self._dates(parameters, rows, rng),
+            'product_id': rng.integers(0, 1000, rows),
+            'rating': rating,
+            'sentiment': pd.Categorical(np.select([rating <= 2, rating == 3], ['negative', 'neutral'],
+                                                  'positive')),
+            'review_length': rng.integers(5, 500, rows),
+            'category': parameters.get('category', 'all'),
+        })
+    
+    def _trend_template(self, parameters):
+        """Daily sales, price and search interest per category"""
+        rng = self._rng(parameters)
+        days = int(str(parameters.get('timeframe', '30d')).rstrip('d'))
+        dates = pd.date_range(end=datetime.now().date(), periods=days, freq='D')
+        trend = np.linspace(100, 100 * (1 + parameters.get('growth', 0.1)), days)
+        return pd.DataFrame({
+            'date': dates,
+            'category': parameters.get('category', 'all'),
+            'sales': np.round(trend * rng.normal(1, 0.1, days)).astype(int),
+            'avg_price': np.round(rng.normal(250, 20, days), 2),
+            'search_interest': np.clip(trend / trend.max() * 100 + rng.normal(0, 5, days), 0, 100),
+        })
+    
+    def _competitive_template(self, parameters):
+        """Per-competitor catalogue snapshot"""
+        rng = self._rng(parameters)
+        rows = parameters.get('rows', 100_000)
+        competitors = parameters.get('competitors', ['Amazon', 'BestBuy', 'Walmart', 'Target', 'eBay'])
+        share = rng.dirichlet(np.ones(len(competitors)))
+        codes = rng.choice(len(competitors), rows, p=share)
+        return pd.DataFrame({
+            'competitor': pd.Categorical.from_codes(codes, competitors),
+            'product_id': rng.integers(0, 1000, rows),
+            'price': np.round(rng.uniform(10, 2000, rows), 2),
+            'rating': np.round(rng.uniform(1, 5, rows), 1),
+            'review_count': rng.poisson(120, rows),
+            'market_share': share[codes],
+        })
+    
+    def _generate_quick_insights(self, store, analysis_type):
+        """Generate initial insights based on analysis type
+        
+        Reads only what each insight needs: ranges come from the row-group
+        statistics, averages and counts from single-column scans.
+        """
         if analysis_type == 'price_analysis':
             return {
-                'avg_price': dataset['price'].mean(),
-                'price_range': [dataset['price'].min(), dataset['price'].max()],
-                'competitor_count': dataset['competitor'].nunique()
+                'avg_price': store.mean('price'),
+                'price_range': list(store.column_range('price')),
+                'competitor_count': store.count_distinct('competitor')
             }
         elif analysis_type == 'sentiment_analysis':
             return {
-                'avg_rating': dataset['rating'].mean(),
-                'sentiment_distribution': dataset['sentiment'].value_counts().to_dict()
+                'avg_rating': store.mean('rating'),
+                'sentiment_distribution': store.value_counts('sentiment')
             }
-        return {'message': 'Dataset ready for analysis'}
+        return {'message': 'Dataset ready for analysis', 'rows': store.num_rows}
 
 # Usage
-generator = AutomatedDatasetGenerator()
-price_dataset, insights = generator.generate_dataset(
-    'price_analysis',
-    {'category': 'electronics', 'region': 'US', 'timeframe': '30d'}
-)
\ No newline at end of file
+if __name__ == "__main__":
+    generator = AutomatedDatasetGenerator()
+    price_dataset, insights = generator.generate_dataset(
+        'price_analysis',
+        {'category': 'electronics', 'region': 'US', 'timeframe': '30d'}
+    )
+
+    # Dashboards asking for the same datasets again are served from the cache
+    import time
+    requests = [
+        ('price_analysis', {'category': 'electronics', 'region': 'US', 'timeframe': '30d'}),
+        ('sentiment_analysis', {'category': 'electronics', 'timeframe': '30d'}),
+        ('trend_analysis', {'category': 'electronics', 'timeframe': '365d'}),
+        ('competitive_analysis', {'category': 'electronics'}),
+        ('price_analysis', {'category': 'books', 'region': 'EU', 'timeframe': '90d'}),
+    ]
+    for label in ('cold', 'warm'):
+        start = time.perf_counter()
+        results = generator.generate_many(requests)
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {len(results)} datasets in {elapsed:.2f}s, cache {generator.cache.stats()}")
\ No newline at end of file
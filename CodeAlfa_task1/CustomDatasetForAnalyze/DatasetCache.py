@@ -0,0 +1,165 @@
+"""
+Content-addressed cache of partitioned Parquet datasets
+
+A dataset is stored under the SHA-256 of its template (name and code),
+the template version and the parameters, so identical requests map to
+the same directory and any change to one of them is a miss. Datasets are
+written to a temp directory and renamed into place, which keeps concurrent
+writers from different processes safe. Eviction drops entries older than
+max_age, then the least recently used ones until the cache fits in
+max_bytes. Last use is the mtime of a <key>.used file next to the dataset
+directory, since directory atimes are unreliable under relatime/noatime
+and are bumped by every os.walk.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+
+def template_fingerprint(template):
+    """Hash of a template function's bytecode and constants"""
+    code = getattr(template, '__code__', None)
+    if code is None:
+        return getattr(template, '__qualname__', repr(template))
+    digest = hashlib.sha256(code.co_code)
+    digest.update(repr(code.co_consts).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def dataset_key(analysis_type, parameters, version, template=None):
+    """Stable content key for one (template, version, parameters) request"""
+    payload = json.dumps({
+        'analysis_type': analysis_type,
+        'template': template_fingerprint(template) if template is not None else None,
+        'version': version,
+        'parameters': parameters,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class DatasetCache:
+    """Dataset directories under root/<key[:2]>/<key>/ with size and age limits"""
+
+    def __init__(self, root='dataset_cache', max_bytes=2 * 1024**3, max_age=7 * 86400):
+        # max_age in seconds since the entry was written
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    @staticmethod
+    def _touch(path):
+        """Mark a dataset directory as used now"""
+        marker = f"{path}.used"
+        try:
+            os.utime(marker)
+        except FileNotFoundError:
+            open(marker, 'a').close()
+
+    def lookup(self, key):
+        """Directory of the cached dataset for a key, or None on a miss or an expired entry"""
+        path = self.path(key)
+        try:
+            written = os.path.getmtime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        if self.max_age is not None and time.time() - written > self.max_age:
+            self._remove(path)
+            self.misses += 1
+            return None
+        # Record the use for LRU eviction; the directory mtime stays the write time
+        self._touch(path)
+        if not os.path.isdir(path):
+            # Evicted by another process meanwhile
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, write):
+        """Store a dataset atomically: write(tmp_dir) fills a temp directory that is renamed into place"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            write(tmp_path)
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                # Another process stored the same key first; its copy is identical
+                if not os.path.isdir(path):
+                    raise
+            self._touch(path)
+        finally:
+            if os.path.exists(tmp_path):
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        return path
+
+    def entries(self):
+        """(path, size, last_used, written) of every cached dataset directory"""
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.is_dir() or entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    written = entry.stat().st_mtime
+                    size = sum(os.path.getsize(os.path.join(dirpath, name))
+                               for dirpath, _, filenames in os.walk(entry.path)
+                               for name in filenames)
+                except OSError:
+                    continue
+                try:
+                    last_used = os.path.getmtime(f"{entry.path}.used")
+                except OSError:
+                    last_used = written
+                yield entry.path, size, last_used, written
+
+    def _remove(self, path):
+        # Rename first so readers never see a half-deleted dataset
+        doomed = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.rename(path, doomed)
+        except OSError:
+            return
+        shutil.rmtree(doomed, ignore_errors=True)
+        try:
+            os.remove(f"{path}.used")
+        except OSError:
+            pass
+        self.evictions += 1
+
+    def evict(self):
+        """Apply the age limit, then the size limit; returns the bytes still cached"""
+        now = time.time()
+        kept = []
+        for path, size, last_used, written in self.entries():
+            if self.max_age is not None and now - written > self.max_age:
+                self._remove(path)
+            else:
+                kept.append((last_used, size, path))
+
+        total = sum(size for _, size, _ in kept)
+        if self.max_bytes is not None and total > self.max_bytes:
+            for _, size, path in sorted(kept):
+                self._remove(path)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        return total
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'bytes': sum(size for _, size, _, _ in self.entries())}
@@ -21,8 +21,23 @@ def scrape_ajax_content():
     
     response = requests.get(api_url, params=params, headers=headers)
     
-    if response.headers.get('content-type') == 'application/json':
+    if response.headers.get('content-type', '').startswith('application/json'):
         return response.json()
     else:
         # Fallback to HTML parsing
-        return None
\ No newline at end of file
+        return None
+
+def harvest_ajax_content(api_url, category=None, page_size=50, max_concurrency=8):
+    """Harvest every page of an AJAX endpoint, not just the first one"""
+    from JsonApiHarvester import JsonApiHarvester
+    
+    # Pagination (page count, total or cursor) is discovered from page 1,
+    # then the remaining pages are fetched concurrently and stream-parsed
+    harvester = JsonApiHarvester(
+        api_url,
+        params={'sort': 'latest'},
+        category=category,
+        page_size=page_size,
+        max_concurrency=max_concurrency,
+    )
+    return harvester.run()
@@ -0,0 +1,204 @@
+"""
+Asyncio crawl mode for EcommerceScraper built on a pooled aiohttp client
+
+Requests go through aiohttp rather than the scraper's requests session, so
+their timings are fed to the scraper's transport (and so its profiler) by
+hand. Parsing runs in the default executor to keep the event loop free.
+Frontier checkpoints are honoured; the conditional-GET HttpCache is tied to
+the requests session and is not supported here.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from functools import partial
+from urllib.parse import urlparse
+
+import aiohttp
+
+from ExOfScraper import RETRY_LATER_STATUSES
+from HttpTransport import RequestMetric
+
+
+class AsyncCategoryCrawler:
+    """Crawl many category paginations concurrently with shared connection pools"""
+
+    def __init__(self, scraper, max_concurrency=50, per_host_limit=8, timeout=30):
+        if getattr(scraper, 'cache', None) is not None:
+            raise ValueError("AsyncCategoryCrawler does not support an HttpCache; "
+                             "use navigate_category for cached crawls")
+        self.scraper = scraper
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.pages_fetched = 0
+        self.logger = logging.getLogger(__name__)
+
+    def _make_session(self):
+        """Create one pooled client; the connector enforces both concurrency limits"""
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers=dict(self.scraper.session.headers),
+        )
+
+    def _record(self, url, status, nbytes, ttfb, total, error=None):
+        """Report a request to the scraper's transport metrics and profiler"""
+        transport = getattr(self.scraper, 'transport', None)
+        if transport is not None:
+            transport.record(RequestMetric(
+                url, urlparse(url).netloc, 'GET', status, nbytes, nbytes, ttfb, total, error
+            ))
+
+    async def _fetch(self, session, url):
+        """GET a page; returns (status, html)"""
+        limiter = getattr(self.scraper, 'rate_limiter', None)
+        if limiter is not None:
+            await limiter.wait_async(url)
+
+        start = time.perf_counter()
+        try:
+            async with session.get(url) as response:
+                ttfb = time.perf_counter() - start
+                body = await response.read()
+                html = await response.text(errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            elapsed = time.perf_counter() - start
+            self._record(url, None, 0, elapsed, elapsed, type(e).__name__)
+            if limiter is not None:
+                limiter.record(url, 599, elapsed)
+            raise
+        total = time.perf_counter() - start
+        self._record(url, response.status, len(body), ttfb, total)
+        if limiter is not None:
+            limiter.record(url, response.status, total, response.headers)
+        return response.status, html
+
+    @staticmethod
+    async def _in_thread(fn, *args):
+        """Run a blocking call (parsing, SQLite) in the default executor"""
+        return await asyncio.get_running_loop().run_in_executor(None, partial(fn, *args))
+
+    def _parse(self, url, html, category_url):
+        """parse_or_reuse with the same profiling as the sync crawl (runs in a worker thread)"""
+        profiler = getattr(self.scraper, 'profiler', None)
+        if profiler is None:
+            return self.scraper.parse_or_reuse(url, html, category_url)
+        with profiler.timer('parse'):
+            result = self.scraper.parse_or_reuse(url, html, category_url)
+        profiler.observe('items_per_page', result[0])
+        return result
+
+    async def crawl_category(self, session, category_url, max_pages, queue):
+        """Walk one category's pagination, pushing parsed records onto the queue"""
+        in_thread = self._in_thread
+        frontier = getattr(self.scraper, 'frontier', None)
+        page = 1
+
+        # Resume like navigate_category; a streaming sink already holds the old records
+        if frontier is not None:
+            if getattr(self.scraper, 'sink', None) is None:
+                for record in await in_thread(frontier.load_records, category_url):
+                    await queue.put(record)
+            if frontier.is_finished(category_url):
+                return
+            page = frontier.resume_page(category_url)
+
+        while page <= max_pages:
+            url = self.scraper.page_url(category_url, page)
+            status, html = await self._fetch(session, url)
+            self.pages_fetched += 1
+
+            if status != 200:
+                self.logger.warning(f"HTTP {status} for {category_url} page {page}")
+                if status >= 500 or status in RETRY_LATER_STATUSES:
+                    # Leave the cursor open so a later run retries this page
+                    if frontier is not None:
+                        await in_thread(frontier.checkpoint)
+                    return
+                break
+
+            product_count, records, has_next = await in_thread(self._parse, url, html, category_url)
+            if not product_count:
+                break
+
+            for record in records:
+                await queue.put(record)
+            if frontier is not None:
+                await in_thread(frontier.complete_page, category_url, page, records)
+
+            if not has_next:
+                break
+
+            # Same politeness delay as the sync loop, without blocking other categories
+            if getattr(self.scraper, 'rate_limiter', None) is None:
+                delay = random.uniform(*self.scraper.delay_range)
+                if delay:
+                    await asyncio.sleep(delay)
+            page += 1
+        else:
+            # Stopped by max_pages; keep the cursor open for a later run
+            if frontier is not None:
+                await in_thread(frontier.checkpoint)
+            return
+
+        if frontier is not None:
+            await in_thread(frontier.mark_finished, category_url)
+
+    async def stream(self, category_urls, max_pages=10):
+        """Yield product records as soon as their page has been parsed"""
+        queue = asyncio.Queue(maxsize=self.max_concurrency * 100)
+        done = object()
+
+        async with self._make_session() as session:
+            async def worker(category_url):
+                try:
+                    await self.crawl_category(session, category_url, max_pages, queue)
+                finally:
+                    await queue.put(done)
+
+            tasks = [asyncio.create_task(worker(url)) for url in category_urls]
+            remaining = len(tasks)
+
+            try:
+                while remaining:
+                    item = await queue.get()
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    yield item
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Surface crawl errors instead of silently dropping a category
+                for result in await asyncio.gather(*tasks, return_exceptions=True):
+                    if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+                        raise result
+
+    async def crawl(self, category_urls, max_pages=10):
+        """Collect every streamed record through scraper.collect"""
+        count = 0
+        async for record in self.stream(category_urls, max_pages=max_pages):
+            self.scraper.collect([record])
+            count += 1
+        return count
+
+    def run(self, category_urls, max_pages=10):
+        """Blocking entry point for callers outside an event loop"""
+        return asyncio.run(self.crawl(category_urls, max_pages=max_pages))
+
+
+# Usage
+if __name__ == "__main__":
+    from ExOfScraper import EcommerceScraper
+
+    scraper = EcommerceScraper("https://example-store.com")
+    crawler = AsyncCategoryCrawler(scraper, max_concurrency=50, per_host_limit=8)
+    total = crawler.run(["/electronics", "/books", "/toys"], max_pages=5)
+    print(f"Collected {total} products from {crawler.pages_fetched} pages")
@@ -0,0 +1,52 @@
+"""
+Benchmark sync vs async category crawling against the local fixture server
+"""
+
+import time
+from FixtureServer import FixtureServer
+from ExOfScraper import EcommerceScraper
+
+
+def benchmark_sync(base_url, categories, max_pages):
+    scraper = EcommerceScraper(base_url, delay_range=(0, 0))
+    responses = []
+    scraper.session.hooks['response'].append(lambda r, *args, **kwargs: responses.append(r.status_code))
+
+    start = time.perf_counter()
+    for category in categories:
+        scraper.navigate_category(category, max_pages=max_pages)
+    elapsed = time.perf_counter() - start
+
+    return len(responses), len(scraper.results), elapsed
+
+
+def benchmark_async(base_url, categories, max_pages, max_concurrency, per_host_limit):
+    from AsyncCrawler import AsyncCategoryCrawler
+
+    scraper = EcommerceScraper(base_url, delay_range=(0, 0))
+    crawler = AsyncCategoryCrawler(
+        scraper, max_concurrency=max_concurrency, per_host_limit=per_host_limit
+    )
+
+    start = time.perf_counter()
+    crawler.run(categories, max_pages=max_pages)
+    elapsed = time.perf_counter() - start
+
+    return crawler.pages_fetched, len(scraper.results), elapsed
+
+
+# Usage
+if __name__ == "__main__":
+    categories = [f"/category-{i}" for i in range(16)]
+    max_pages = 10
+
+    with FixtureServer(latency=0.05, total_pages=max_pages) as server:
+        results = {
+            'sync': benchmark_sync(server.base_url, categories, max_pages),
+            'async': benchmark_async(server.base_url, categories, max_pages,
+                                     max_concurrency=32, per_host_limit=16),
+        }
+
+    print(f"\n{'Mode':<8}{'Pages':>8}{'Products':>10}{'Seconds':>10}{'Pages/sec':>12}")
+    for mode, (pages, products, elapsed) in results.items():
+        print(f"{mode:<8}{pages:>8}{products:>10}{elapsed:>10.2f}{pages / elapsed:>12.1f}")
@@ -0,0 +1,78 @@
+"""
+Micro-benchmark: per-value DataValidator methods vs the column variants
+"""
+
+import random
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from DataValidationTechnique import DataValidator
+
+
+# Rows where RE2's ASCII classes and Python's Unicode ones part ways
+EDGE_ROWS = [
+    {'email': 'josé@example.com', 'price': '١٢.5', 'url': ' http://x.com'},
+    {'email': 'a@b.com\n', 'price': '€ ٣٤٫٥', 'url': 'https://exämple.com/p/1'},
+    {'email': 'ünïcode@例え.jp', 'price': '\u00a012.00', 'url': 'ht\ttp://x.com'},
+    {'email': 'user@example.com ', 'price': '٠.٩٩', 'url': 'http://[::1'},
+]
+
+
+def make_rows(n, seed=7):
+    """Scraped-looking rows with a sprinkling of bad and non-ASCII values"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        bad = rng.random() < 0.05
+        rows.append({
+            'email': f"user{i}@example.com" if not bad else f"user{i}-at-example",
+            'price': f"${rng.randint(1, 5000)},{rng.randint(0, 999):03d}.{rng.randint(0, 99):02d}"
+                     if not bad else "Call for price",
+            'url': f"https://example-store.com/p/{i}" if not bad else f"/p/{i}",
+        })
+    # Every 1000th row is swapped for an edge case
+    for i in range(0, n, 1000):
+        rows[i] = EDGE_ROWS[(i // 1000) % len(EDGE_ROWS)]
+    return rows
+
+
+def rows_per_sec(func, n):
+    start = time.perf_counter()
+    result = func()
+    return result, n / (time.perf_counter() - start)
+
+
+# Usage
+if __name__ == "__main__":
+    for n in (100_000, 1_000_000):
+        rows = make_rows(n)
+        columns = {name: pa.array([r[name] for r in rows]) for name in ('email', 'price', 'url')}
+
+        checks = [
+            ('email', lambda: [DataValidator.validate_email(r['email']) for r in rows],
+             lambda: DataValidator.validate_email_column(columns['email'])),
+            ('price', lambda: [DataValidator.validate_price(r['price']) for r in rows],
+             lambda: DataValidator.validate_price_column(columns['price'])),
+            ('url', lambda: [DataValidator.validate_url(r['url']) for r in rows],
+             lambda: DataValidator.validate_url_column(columns['url'])),
+            ('schema', lambda: DataValidator.check_data_consistency(rows),
+             lambda: DataValidator.check_schema_conformance(rows)),
+        ]
+
+        print(f"\n{n:,} rows")
+        print(f"{'Check':<8}{'scalar rows/s':>16}{'column rows/s':>16}{'Speedup':>9}")
+        for name, scalar, column in checks:
+            expected, scalar_rate = rows_per_sec(scalar, n)
+            result, column_rate = rows_per_sec(column, n)
+
+            # Both paths must agree value for value
+            if name == 'price':
+                expected = np.array([np.nan if v is None else v for v in expected])
+                assert np.array_equal(result, expected, equal_nan=True)
+            elif name == 'schema':
+                assert bool(result.all()) == expected
+            else:
+                assert result.tolist() == expected
+            print(f"{name:<8}{scalar_rate:>16,.0f}{column_rate:>16,.0f}{column_rate / scalar_rate:>8.1f}x")
@@ -0,0 +1,94 @@
+"""
+Memory per million products: dicts vs ProductRecord vs ProductBatch
+
+Records are built the way the scrapers build them, 24 per page: the dict
+baseline stamps every item with its own isoformat() string, the other two
+take one timestamp per page. Memory is what tracemalloc sees allocated
+for the stored records, including their string values.
+"""
+
+import time
+import tracemalloc
+from datetime import datetime
+
+import pyarrow as pa
+
+from ProductRecords import ProductBatch, ProductRecord
+
+ITEMS = 1_000_000
+PER_PAGE = 24
+CATEGORIES = ['electronics', 'books', 'home', 'garden', 'toys']
+
+
+def page_items(page):
+    """Raw field values for one listing page"""
+    category_url = f"/{CATEGORIES[page % len(CATEGORIES)]}"
+    for i in range(page * PER_PAGE, (page + 1) * PER_PAGE):
+        yield (f"Product {i}", 10 + i % 500 + 0.99,
+               f"https://example-store.com/product/{i}", category_url.split('/')[-1])
+
+
+def build_dicts():
+    records = []
+    for page in range(ITEMS // PER_PAGE):
+        for title, price, url, category in page_items(page):
+            records.append({'title': title, 'price': price, 'url': url, 'category': category,
+                            'scrape_date': datetime.now().isoformat()})
+    return records
+
+
+def build_slotted():
+    records = []
+    for page in range(ITEMS // PER_PAGE):
+        scrape_date = datetime.now().isoformat()
+        for title, price, url, category in page_items(page):
+            records.append(ProductRecord(title=title, price=price, url=url, category=category,
+                                         scrape_date=scrape_date))
+    return records
+
+
+def build_batch():
+    batch = ProductBatch()
+    for page in range(ITEMS // PER_PAGE):
+        batch.start_page()
+        for title, price, url, category in page_items(page):
+            batch.append({'title': title, 'price': price, 'url': url, 'category': category})
+    return batch
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, current, elapsed
+
+
+# Usage
+if __name__ == "__main__":
+    n = ITEMS // PER_PAGE * PER_PAGE
+    print(f"{'Layout':<16}{'MB per 1M':>11}{'Bytes/item':>12}{'Build s':>9}")
+    for label, build in (('dict', build_dicts), ('ProductRecord', build_slotted),
+                         ('ProductBatch', build_batch)):
+        records, used, elapsed = measure(build)
+        per_million = used / n * 1_000_000 / 2 ** 20
+        print(f"{label:<16}{per_million:>11.1f}{used / n:>12.0f}{elapsed:>9.2f}")
+        del records
+
+    batch = build_batch()
+    # First conversion pays pyarrow's lazy imports; keep that out of the timing
+    ProductBatch().to_arrow()
+    start = time.perf_counter()
+    table = batch.to_arrow()
+    arrow_s = time.perf_counter() - start
+    # The Arrow columns point at the batch's own buffers
+    assert table.column('price').chunk(0).buffers()[1].address == batch.price.buffer_info()[0]
+    assert table.column('scrape_date').chunk(0).buffers()[1].address == batch.scrape_ts.buffer_info()[0]
+    assert table.column('url').chunk(0).buffers()[2].address == pa.py_buffer(batch.url.data).address
+    start = time.perf_counter()
+    df = batch.to_pandas()
+    pandas_s = time.perf_counter() - start
+    print(f"to_arrow {arrow_s * 1000:.1f} ms, to_pandas {pandas_s * 1000:.1f} ms for {len(df):,} rows")
+    print(df.dtypes)
@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: BeautifulSoup selector fallbacks vs compiled lxml chains
+"""
+
+import time
+from ExOfScraper import EcommerceScraper
+from FixtureServer import render_listing_page
+
+
+def time_parse(scraper, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        product_count, records, has_next = scraper.parse_listing(html, '/electronics')
+    elapsed = time.perf_counter() - start
+    return product_count, elapsed / repeat
+
+
+def comparable(scraper, html):
+    """Records without the per-call scrape_date, for cross-backend checks"""
+    _, records, _ = scraper.parse_listing(html, '/electronics')
+    return [{k: v for k, v in r.items() if k != 'scrape_date'} for r in records]
+
+
+# Usage
+if __name__ == "__main__":
+    with open('WebScraping.html', encoding='utf-8') as f:
+        pages = {'WebScraping.html': (f.read(), 2000)}
+
+    # Scaled synthetic listings; the fallback price class exercises winner memory
+    for size in (24, 200, 2000):
+        html = render_listing_page('electronics', 1, products_per_page=size)
+        pages[f"synthetic x{size}"] = (html.replace('class="price"', 'class="current-price"'),
+                                       max(3, 2000 // size))
+
+    bs4_scraper = EcommerceScraper('https://example-store.com')
+    lxml_scraper = EcommerceScraper('https://example-store.com', selector_backend='lxml')
+
+    print(f"{'Page':<20}{'Items':>7}{'bs4 ms':>10}{'lxml ms':>10}{'Speedup':>9}")
+    for name, (html, repeat) in pages.items():
+        items, bs4_seconds = time_parse(bs4_scraper, html, repeat)
+        _, lxml_seconds = time_parse(lxml_scraper, html, repeat)
+        print(f"{name:<20}{items:>7}{bs4_seconds * 1000:>10.2f}{lxml_seconds * 1000:>10.2f}"
+              f"{bs4_seconds / lxml_seconds:>8.1f}x")
+
+    # Both backends must extract the same records
+    html = pages['synthetic x200'][0]
+    assert comparable(bs4_scraper, html) == comparable(lxml_scraper, html)
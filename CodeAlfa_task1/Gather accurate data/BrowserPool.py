@@ -0,0 +1,242 @@
+"""
+Pool of warm headless browsers with event-driven waits
+
+Launching Chrome per URL and sleeping a fixed 2-3 s after every action
+dominate the cost of JS-rendered sources. The pool keeps drivers warm
+across URLs (recycling them after max_uses or an error), blocks images
+and fonts, and replaces fixed sleeps with a wait that returns as soon as
+the DOM has stopped mutating and no fetch/XHR is in flight.
+
+Anything with the WebDriver methods used here (get, execute_script,
+execute_async_script, set_script_timeout, find_element(s), quit) can be
+pooled, which is how FakeDriver replays recorded DOM states in tests.
+"""
+
+import atexit
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+SCROLL_TO_BOTTOM_JS = "window.scrollTo(0, document.body.scrollHeight);"
+SCROLL_HEIGHT_JS = "return document.body.scrollHeight"
+
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+]
+
+# Tracks the last DOM mutation and in-flight fetch/XHR calls on the page
+IDLE_TRACKER_JS = """
+(function () {
+  if (window.__idleTracker) { return; }
+  var t = window.__idleTracker = {last: performance.now(), inflight: 0};
+  var touch = function () { t.last = performance.now(); };
+  new MutationObserver(touch).observe(document, {
+    childList: true, subtree: true, attributes: true, characterData: true
+  });
+  if (window.fetch) {
+    var origFetch = window.fetch;
+    window.fetch = function () {
+      t.inflight++; touch();
+      return origFetch.apply(this, arguments).finally(function () { t.inflight--; touch(); });
+    };
+  }
+  var origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    t.inflight++; touch();
+    this.addEventListener('loadend', function () { t.inflight--; touch(); });
+    return origSend.apply(this, arguments);
+  };
+})();
+"""
+
+# Resolves once the page has been quiet (no mutations, no requests) for quiet_ms
+WAIT_FOR_IDLE_JS = IDLE_TRACKER_JS + """
+var quietMs = arguments[0], done = arguments[arguments.length - 1];
+var t = window.__idleTracker;
+(function check() {
+  var idle = performance.now() - t.last;
+  if (t.inflight === 0 && idle >= quietMs) { done(true); }
+  else { setTimeout(check, Math.max(16, quietMs - idle)); }
+})();
+"""
+
+
+def wait_for_idle(driver, quiet_ms=300, timeout=10):
+    """Block until the DOM and network have been idle for quiet_ms; False on timeout"""
+    driver.set_script_timeout(timeout)
+    try:
+        return bool(driver.execute_async_script(WAIT_FOR_IDLE_JS, quiet_ms))
+    except TimeoutException:
+        # Pages with endless animations never go quiet; carry on with what loaded
+        return False
+
+
+def make_chrome_driver(headless=True, block_resources=True, page_load_strategy='eager'):
+    """Chrome configured for scraping: headless, no images/fonts, idle tracker preinstalled"""
+    from selenium.webdriver import Chrome
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.page_load_strategy = page_load_strategy
+    if block_resources:
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+        })
+
+    driver = Chrome(options=options)
+    if block_resources:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
+    # Track mutations/requests from the very first script on every document
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': IDLE_TRACKER_JS})
+    return driver
+
+
+class BrowserPool:
+    """Thread-safe pool of reusable drivers created lazily by driver_factory"""
+
+    def __init__(self, driver_factory=make_chrome_driver, size=2, max_uses=100):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_uses = max_uses
+        self.drivers_created = 0
+        self.closed = False
+        self._uses = {}
+        self._all = set()
+        self._lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        # None marks a free slot that gets a driver on first checkout
+        for _ in range(size):
+            self._idle.put(None)
+
+    def _checkout(self):
+        driver = self._idle.get()
+        if self.closed:
+            # Wake the next waiter too; close() left only empty slots
+            self._idle.put(None)
+            raise RuntimeError("BrowserPool is closed")
+        if driver is None:
+            try:
+                driver = self.driver_factory()
+            except BaseException:
+                # A failed launch must not use up the slot, or the pool drains
+                self._idle.put(None)
+                raise
+            with self._lock:
+                self.drivers_created += 1
+                self._uses[id(driver)] = 0
+                self._all.add(driver)
+        return driver
+
+    def _retire(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._all.discard(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        self._idle.put(None)
+
+    def _checkin(self, driver, healthy):
+        if self.closed:
+            # close() already quit it; never hand it out again
+            with self._lock:
+                self._uses.pop(id(driver), None)
+            return
+        with self._lock:
+            self._uses[id(driver)] += 1
+            worn_out = self._uses[id(driver)] >= self.max_uses
+        if not healthy or worn_out:
+            self._retire(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """Borrow a warm driver; it is replaced if the block raises"""
+        driver = self._checkout()
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        except GeneratorExit:
+            # A generator holding the driver was closed early; the driver is fine
+            healthy = True
+            raise
+        finally:
+            self._checkin(driver, healthy)
+
+    def map(self, func, urls):
+        """Run func(driver, url) for each URL across the pool, preserving order"""
+        def task(url):
+            with self.driver() as driver:
+                return func(driver, url)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(task, urls))
+
+    def close(self):
+        """Quit every driver; later checkouts raise instead of getting a dead one"""
+        with self._lock:
+            self.closed = True
+            drivers = list(self._all)
+            self._all.clear()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        # Release anyone blocked in _checkout
+        self._idle.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def get_default_pool():
+    """Process-wide pool used by the Selenium helpers when none is passed; closed at exit"""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None or _default_pool.closed:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+# Usage
+if __name__ == "__main__":
+    from FakeDriver import FakeDriver
+    from InfiniteScrollHandling import scroll_and_extract
+
+    feed_states = [
+        "<div>" + "".join(
+            f'<div class="product-item"><span class="title">Item {i}</span>'
+            f'<span class="price">${i}.00</span></div>' for i in range(n)
+        ) + "</div>"
+        for n in (10, 20, 30)
+    ]
+
+    with BrowserPool(lambda: FakeDriver(feed_states), size=2) as pool:
+        results = pool.map(scroll_and_extract, ["https://example.com/feed"] * 4)
+        print(f"{[len(r) for r in results]} items; drivers launched: {pool.drivers_created}")
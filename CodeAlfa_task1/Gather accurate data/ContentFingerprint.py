@@ -0,0 +1,166 @@
+"""
+Content fingerprints for skipping unchanged listing pages on recrawls
+
+Only the product-list region is fingerprinted, with scripts, ad slots and
+timestamps stripped, so a page whose body changed only around the
+products still matches its previous crawl. Each page gets an exact digest
+of its normalised tokens plus a 64-bit simhash over token shingles.
+Pages whose digest matches, or whose simhash is within max_distance bits,
+reuse the records stored with the fingerprint instead of being parsed.
+Pagination is outside the region, so the page count and next link are
+always read from the current page.
+"""
+
+import hashlib
+import re
+import threading
+
+import numpy as np
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+REGION_SELECTOR = CSSSelector('.products, .product-list, .product-grid, .search-results')
+ITEM_SELECTOR = CSSSelector('.product-item, .product, .card')
+IGNORE_SELECTOR = CSSSelector(
+    'script, style, noscript, iframe, time, .ad, .ads, .advert, .sponsored, [data-ad-slot]'
+)
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def region_tokens(html, region_selector=REGION_SELECTOR, ignore_selector=IGNORE_SELECTOR):
+    """Normalised tokens (text and link targets) of the page's product-list region"""
+    tree = lxml_html.fromstring(html)
+    regions = region_selector(tree)
+    if not regions:
+        # No list container: fall back to the product items themselves
+        regions = ITEM_SELECTOR(tree) or [tree]
+
+    tokens = []
+    for region in regions:
+        for noise in ignore_selector(region):
+            noise.drop_tree()
+        for element in region.iter():
+            if not isinstance(element.tag, str):
+                continue  # comments and processing instructions
+            if element.text:
+                tokens.extend(TOKEN_PATTERN.findall(element.text.lower()))
+            href = element.get('href')
+            if href:
+                tokens.append(href)
+            if element is not region and element.tail:
+                tokens.extend(TOKEN_PATTERN.findall(element.tail.lower()))
+    return tokens
+
+
+def simhash(tokens, shingle=3):
+    """64-bit simhash (signed, to fit SQLite INTEGER) of token shingles"""
+    if len(tokens) < shingle:
+        features = [' '.join(tokens)]
+    else:
+        # Distinct shingles only: markup repeated per item would otherwise outvote
+        # the product-specific text and pin the hash for every page of a template
+        features = list({' '.join(tokens[i:i + shingle]) for i in range(len(tokens) - shingle + 1)})
+
+    digests = b''.join(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest() for f in features)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    # Per bit position: set in more than half of the features?
+    fingerprint = np.packbits(bits.sum(axis=0) * 2 > len(features)).tobytes()
+    return int.from_bytes(fingerprint, 'big', signed=True)
+
+
+def hamming_distance(a, b):
+    return bin((a ^ b) & 0xFFFFFFFFFFFFFFFF).count('1')
+
+
+def fingerprint(html, region_selector=REGION_SELECTOR, ignore_selector=IGNORE_SELECTOR):
+    """(exact digest, simhash) of a page's product-list region"""
+    tokens = region_tokens(html, region_selector, ignore_selector)
+    digest = hashlib.blake2b(' '.join(tokens).encode('utf-8'), digest_size=16).hexdigest()
+    return digest, simhash(tokens)
+
+
+class PageChangeDetector:
+    """Decide per page whether the previous crawl's records can be reused"""
+
+    def __init__(self, store, max_distance=0, region_selector=REGION_SELECTOR,
+                 ignore_selector=IGNORE_SELECTOR):
+        # store: anything with get_fingerprint/store_fingerprint (CrawlFrontier).
+        # A single changed price moves the simhash by a bit or two, so any
+        # max_distance above 0 trades freshness of small edits for skips
+        self.store = store
+        self.max_distance = max_distance
+        self.region_selector = region_selector
+        self.ignore_selector = ignore_selector
+        self.counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'similar': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def check(self, url, html):
+        """Return (previous page result or None, fingerprint of this page)"""
+        try:
+            page_fingerprint = fingerprint(html, self.region_selector, self.ignore_selector)
+        except (etree.ParserError, ValueError):
+            # Empty or unparseable body: let the normal parser deal with it
+            self._count('new')
+            return None, None
+        previous = self.store.get_fingerprint(url)
+        if previous is None:
+            self._count('new')
+            return None, page_fingerprint
+
+        digest, simhash_value, result = previous
+        if digest == page_fingerprint[0]:
+            self._count('unchanged')
+            return result, page_fingerprint
+        if self.max_distance and hamming_distance(simhash_value, page_fingerprint[1]) <= self.max_distance:
+            self._count('similar')
+            return result, page_fingerprint
+
+        self._count('changed')
+        return None, page_fingerprint
+
+    def remember(self, url, page_fingerprint, result):
+        if page_fingerprint is not None:
+            self.store.store_fingerprint(url, page_fingerprint[0], page_fingerprint[1], result)
+
+    def metrics(self):
+        """Page counts by outcome plus the share of pages that skipped parsing"""
+        with self._lock:
+            counts = dict(self.counts)
+        pages = sum(counts.values())
+        skipped = counts['unchanged'] + counts['similar']
+        counts['pages'] = pages
+        counts['skip_rate'] = skipped / pages if pages else 0.0
+        return counts
+
+
+# Usage
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    from CrawlFrontier import CrawlFrontier
+    from ExOfScraper import EcommerceScraper
+    from FixtureServer import FixtureServer
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'recrawl.sqlite')
+
+    with FixtureServer(latency=0, total_pages=200, products_per_page=48) as server:
+        # Every response differs in its ad slot and timestamp, never in products
+        server.httpd.page_noise = True
+        for day in (1, 2):
+            frontier = CrawlFrontier(db_path)
+            # A new daily pass over the same categories, keeping fingerprints
+            frontier.reset_crawl('/electronics')
+            detector = PageChangeDetector(frontier)
+            scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), frontier=frontier,
+                                       change_detector=detector)
+            start = time.perf_counter()
+            scraper.navigate_category('/electronics', max_pages=200)
+            elapsed = time.perf_counter() - start
+            frontier.close()
+            print(f"day {day}: {len(scraper.results)} records in {elapsed:.2f}s, {detector.metrics()}")
@@ -0,0 +1,225 @@
+"""
+Persistent crawl frontier so long pagination runs can resume after a crash
+
+Extracted records are checkpointed in the same transaction as the
+pagination cursor, so a restarted crawl continues from the last checkpoint
+without re-fetching completed pages. The cursor is all the de-duplication
+a listing crawl needs: one row per crawl key however many pages it has.
+Discovered product URLs are kept as 64-bit hashes, so each is queued once
+and fetched again only when its lastmod moves.
+"""
+
+import hashlib
+import json
+import sqlite3
+import struct
+import threading
+
+
+def url_hash(url):
+    """Stable signed 64-bit hash of a URL (fits an SQLite INTEGER)"""
+    digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+    return struct.unpack('>q', digest)[0]
+
+
+class CrawlFrontier:
+    """SQLite-backed frontier tracking cursors, checkpointed records and product URLs"""
+
+    def __init__(self, db_path='crawl_frontier.sqlite', checkpoint_every=25):
+        self.checkpoint_every = checkpoint_every
+        self.pages_since_checkpoint = 0
+
+        self._lock = threading.RLock()
+        self._pending_records = []
+        self._pending_cursors = {}
+        self._pending_fingerprints = {}
+        self._pending_products = []
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS cursors (
+                crawl_key TEXT PRIMARY KEY,
+                next_page INTEGER,
+                finished INTEGER DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                crawl_key TEXT,
+                data TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_records_key ON records(crawl_key);
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                url_hash INTEGER PRIMARY KEY,
+                digest TEXT,
+                simhash INTEGER,
+                result TEXT
+            );
+            CREATE TABLE IF NOT EXISTS product_urls (
+                url_hash INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                lastmod TEXT,
+                fetched_lastmod TEXT,
+                pending INTEGER DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_product_urls_pending ON product_urls(pending);
+        """)
+        self._db.commit()
+
+    def resume_page(self, crawl_key, default=1):
+        """Page to start from for a crawl key (1 for a new crawl)"""
+        with self._lock:
+            if crawl_key in self._pending_cursors:
+                return self._pending_cursors[crawl_key][0]
+            row = self._db.execute(
+                "SELECT next_page FROM cursors WHERE crawl_key = ?", (crawl_key,)
+            ).fetchone()
+        return row[0] if row else default
+
+    def is_finished(self, crawl_key):
+        with self._lock:
+            if crawl_key in self._pending_cursors:
+                return self._pending_cursors[crawl_key][1]
+            row = self._db.execute(
+                "SELECT finished FROM cursors WHERE crawl_key = ?", (crawl_key,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def complete_page(self, crawl_key, page, records):
+        """Record a finished page; flushed to disk every checkpoint_every pages"""
+        with self._lock:
+            self._pending_records.extend((crawl_key, json.dumps(r)) for r in records)
+            self._pending_cursors[crawl_key] = (page + 1, False)
+            self.pages_since_checkpoint += 1
+            if self.pages_since_checkpoint >= self.checkpoint_every:
+                self.checkpoint()
+
+    def mark_finished(self, crawl_key):
+        """Flag a crawl key as fully paginated and checkpoint immediately"""
+        with self._lock:
+            next_page = self.resume_page(crawl_key)
+            self._pending_cursors[crawl_key] = (next_page, True)
+            self.checkpoint()
+
+    def get_fingerprint(self, url):
+        """(digest, simhash, page result) stored for a URL by an earlier crawl, or None"""
+        h = url_hash(url)
+        with self._lock:
+            if h in self._pending_fingerprints:
+                digest, simhash, result = self._pending_fingerprints[h]
+            else:
+                row = self._db.execute(
+                    "SELECT digest, simhash, result FROM fingerprints WHERE url_hash = ?", (h,)
+                ).fetchone()
+                if row is None:
+                    return None
+                digest, simhash, result = row
+        return digest, simhash, json.loads(result)
+
+    def store_fingerprint(self, url, digest, simhash, result):
+        """Remember a page's content fingerprint and parsed result until the next checkpoint"""
+        with self._lock:
+            self._pending_fingerprints[url_hash(url)] = (digest, simhash, json.dumps(result))
+
+    def queue_product_urls(self, entries):
+        """Queue (url, lastmod) pairs from discovery; returns how many were (re)queued
+
+        A known URL is only queued again when its lastmod is newer than the one
+        it was last fetched at, or when the sitemap gives no lastmod for it.
+        lastmod must be a normalised ISO string so it compares as text.
+        """
+        with self._lock:
+            before = self._db.total_changes
+            with self._db:
+                self._db.executemany("""
+                    INSERT INTO product_urls (url_hash, url, lastmod, pending) VALUES (?, ?, ?, 1)
+                    ON CONFLICT(url_hash) DO UPDATE SET lastmod = excluded.lastmod, pending = 1
+                    WHERE (pending = 1 AND excluded.lastmod IS NOT lastmod)
+                       OR (pending = 0 AND (excluded.lastmod IS NULL OR fetched_lastmod IS NULL
+                                            OR excluded.lastmod > fetched_lastmod))
+                """, ((url_hash(url), url, lastmod) for url, lastmod in entries))
+            return self._db.total_changes - before
+
+    def pending_product_urls(self, limit=None):
+        """(url, lastmod) of queued product URLs not yet fetched"""
+        with self._lock:
+            # Completions not yet checkpointed are no longer pending
+            done = {h for _, h in self._pending_products}
+            rows = self._db.execute(
+                "SELECT url_hash, url, lastmod FROM product_urls WHERE pending = 1 ORDER BY rowid"
+            )
+            urls = []
+            for h, url, lastmod in rows:
+                if h in done:
+                    continue
+                urls.append((url, lastmod))
+                if limit is not None and len(urls) >= limit:
+                    break
+        return urls
+
+    def complete_product_url(self, url, lastmod):
+        """Mark a product URL fetched at the given lastmod; flushed with the next checkpoint"""
+        with self._lock:
+            self._pending_products.append((lastmod, url_hash(url)))
+            self.pages_since_checkpoint += 1
+            if self.pages_since_checkpoint >= self.checkpoint_every:
+                self.checkpoint()
+
+    def reset_crawl(self, crawl_key):
+        """Start a fresh pass over a crawl key, keeping page fingerprints"""
+        with self._lock:
+            self.checkpoint()
+            with self._db:
+                self._db.execute("DELETE FROM cursors WHERE crawl_key = ?", (crawl_key,))
+                self._db.execute("DELETE FROM records WHERE crawl_key = ?", (crawl_key,))
+
+    def checkpoint(self):
+        """Atomically persist records, cursors, fingerprints and fetched product URLs"""
+        with self._lock:
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO records (crawl_key, data) VALUES (?, ?)", self._pending_records
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO cursors (crawl_key, next_page, finished) VALUES (?, ?, ?)",
+                    [(key, page, int(done)) for key, (page, done) in self._pending_cursors.items()]
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO fingerprints (url_hash, digest, simhash, result) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(h, *values) for h, values in self._pending_fingerprints.items()]
+                )
+                self._db.executemany(
+                    "UPDATE product_urls SET pending = 0, fetched_lastmod = ? WHERE url_hash = ?",
+                    self._pending_products
+                )
+            self._pending_records = []
+            self._pending_cursors = {}
+            self._pending_fingerprints = {}
+            self._pending_products = []
+            self.pages_since_checkpoint = 0
+
+    def load_records(self, crawl_key):
+        """Records checkpointed for a crawl key by earlier runs"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM records WHERE crawl_key = ? ORDER BY id", (crawl_key,)
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def close(self):
+        self.checkpoint()
+        self._db.close()
+
+
+# Usage
+if __name__ == "__main__":
+    from ExOfScraper import EcommerceScraper
+
+    frontier = CrawlFrontier('electronics_crawl.sqlite', checkpoint_every=25)
+    scraper = EcommerceScraper("https://example-store.com", frontier=frontier)
+
+    # Safe to kill and re-run: completed pages are not fetched again
+    scraper.navigate_category("/electronics", max_pages=5000)
+    frontier.close()
+    print(f"{len(scraper.results)} products (including resumed checkpoints)")
@@ -0,0 +1,203 @@
+"""
+Crawl instrumentation: latency, size and error histograms per run
+
+Scrapers and the HTTP transport report into a CrawlProfiler: DNS, TCP
+connect, TTFB and download time per request, parse and validate time per
+page, bytes and items per page, and errors by type. Histograms use fixed
+log-spaced buckets (about 4% relative error), so recording is a log2 and
+a list increment and memory does not grow with the number of pages.
+report() gives a JSON-ready dict; ProfileReport.py renders and compares
+saved runs.
+"""
+
+import json
+import math
+import platform
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+UNITS = {
+    'dns': 's', 'connect': 's', 'ttfb': 's', 'download': 's',
+    'parse': 's', 'validate': 's',
+    'bytes_per_page': 'bytes', 'items_per_page': 'items',
+}
+
+
+class Histogram:
+    """Log-bucketed histogram with O(1) record and bounded memory"""
+
+    def __init__(self, unit='s', min_value=None, buckets_per_octave=16, octaves=48):
+        # Bucket 0 holds values <= min_value; bucket i covers up to min_value * 2**(i / per_octave)
+        self.unit = unit
+        self.min_value = min_value or (1e-6 if unit == 's' else 1.0)
+        self.per_octave = buckets_per_octave
+        self.counts = [0] * (buckets_per_octave * octaves + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = min(math.ceil(math.log2(value / self.min_value) * self.per_octave),
+                        len(self.counts) - 1)
+        self.counts[index] += 1
+
+    def upper_bound(self, index):
+        return self.min_value * 2 ** (index / self.per_octave)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, capped at the max"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if bucket and seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'unit': self.unit, 'count': 0}
+        return {
+            'unit': self.unit,
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count,
+            'min': self.min,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+            # Sparse buckets keep the report mergeable and small
+            'buckets': {f"{self.upper_bound(i):.6g}": n for i, n in enumerate(self.counts) if n},
+        }
+
+
+class CrawlProfiler:
+    """Thread-safe collection of histograms and error counts for one crawl run"""
+
+    def __init__(self, run_name=None, **labels):
+        # labels: free-form run metadata (release, scraper, target site, ...)
+        self.run_name = run_name or datetime.now().strftime('crawl-%Y%m%d-%H%M%S')
+        self.labels = labels
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.histograms = {name: Histogram(unit) for name, unit in UNITS.items()}
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, metric, value):
+        with self._lock:
+            histogram = self.histograms.get(metric)
+            if histogram is None:
+                histogram = self.histograms[metric] = Histogram(UNITS.get(metric, 's'))
+            histogram.record(value)
+
+    @contextmanager
+    def timer(self, metric):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - start)
+
+    def error(self, kind, count=1):
+        """Count an error by type (an exception, its class name or 'HTTP 503')"""
+        if isinstance(kind, BaseException):
+            kind = type(kind).__name__
+        with self._lock:
+            self.errors[kind] += count
+
+    def observe_request(self, metric):
+        """Record an HttpTransport RequestMetric"""
+        if metric.dns:
+            self.observe('dns', metric.dns)
+        if metric.connect:
+            self.observe('connect', metric.connect)
+        if metric.error:
+            self.error(metric.error)
+            return
+        self.observe('ttfb', metric.ttfb)
+        self.observe('download', metric.total - metric.ttfb)
+        if metric.bytes:
+            self.observe('bytes_per_page', metric.bytes)
+        if metric.status is not None and metric.status >= 400:
+            self.error(f"HTTP {metric.status}")
+
+    def report(self):
+        """JSON-ready profile of the run so far"""
+        with self._lock:
+            histograms = {name: h.summary() for name, h in self.histograms.items() if h.count}
+            errors = dict(self.errors.most_common())
+        pages = histograms.get('bytes_per_page', {}).get('count', 0)
+        return {
+            'run': self.run_name,
+            'labels': self.labels,
+            'started': datetime.fromtimestamp(self.started).isoformat(),
+            'duration': time.perf_counter() - self._start,
+            'python': platform.python_version(),
+            'pages': pages,
+            'errors_total': sum(errors.values()),
+            'errors': errors,
+            'histograms': histograms,
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+# Usage
+if __name__ == "__main__":
+    import sys
+    from ExOfScraper import EcommerceScraper
+    from FixtureServer import FixtureServer, FlakyHandler
+    from PaginationHandling import PaginationScraper
+    from RoburstScrapingPattern import RobustScraper
+
+    output = sys.argv[1] if len(sys.argv) > 1 else 'crawl_profile.json'
+
+    # Overhead of one observation, which the scrapers pay per stage per page
+    profiler = CrawlProfiler()
+    start = time.perf_counter()
+    for i in range(200_000):
+        profiler.observe('parse', 0.001 + i * 1e-9)
+    print(f"observe(): {(time.perf_counter() - start) / 200_000 * 1e6:.2f} us per call")
+
+    profiler = CrawlProfiler(release='dev', target='fixture')
+    with FixtureServer(FlakyHandler, latency=0.01, total_pages=30) as server:
+        EcommerceScraper(server.base_url, delay_range=(0, 0), profiler=profiler).navigate_category(
+            '/electronics', max_pages=30, parallel=True
+        )
+        pagination = PaginationScraper(f"{server.base_url}/books", profiler=profiler)
+        pagination.scrape_all_pages(parallel=True)
+        # Inject 503s for the retrying scraper only; the others stop at an empty page
+        server.httpd.failure_rate = 0.2
+        robust = RobustScraper(profiler=profiler)
+        for page in range(1, 11):
+            try:
+                robust.scrape_with_fallbacks(f"{server.base_url}/home?page={page}")
+            except Exception:
+                pass  # counted by the profiler
+
+    profiler.save(output)
+    report = profiler.report()
+    print(f"{report['pages']} pages, errors: {report['errors']}")
+    for name, stats in report['histograms'].items():
+        print(f"{name:<16}{stats['count']:>6}  p50={stats['p50']:.4g}  p99={stats['p99']:.4g} {stats['unit']}")
+    print(f"Saved {output}; render it with: python ProfileReport.py {output} --html profile.html")
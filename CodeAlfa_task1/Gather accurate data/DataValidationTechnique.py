@@ -1,17 +1,67 @@
 import re
 from urllib.parse import urlparse
 
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    # Arrow-backed strings run .str regex ops as C++ kernels
+    STRING_DTYPE = pd.ArrowDtype(pa.string())
+    FLOAT_DTYPE = pd.ArrowDtype(pa.float64())
+except ImportError:
+    pa = None
+    STRING_DTYPE = 'string'
+    FLOAT_DTYPE = 'Float64'
+
+# Compiled once, shared by the scalar and column validators; unanchored so
+# both sides fullmatch it (re's $ also matches before a trailing newline)
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PRICE_JUNK_PATTERN = re.compile(r'[^\d.]')
+# What float() accepts once only digits and dots are left
+PRICE_NUMBER_PATTERN = re.compile(r'\d+\.?\d*|\.\d+')
+# Column equivalent of urlparse() having both a scheme and a netloc
+# (urlparse() strips leading spaces)
+URL_PATTERN = re.compile(r'^ *[A-Za-z][A-Za-z0-9+.-]*://[^/?#]')
+# Arrow's RE2 kernels treat \w and \d as ASCII, float() reads any Unicode
+# digit and urlparse() drops tabs/newlines: rows outside printable ASCII take
+# the scalar path, as do URLs with brackets (urlparse() checks IPv6 hosts)
+URL_SCALAR_ONLY_PATTERN = re.compile(r'[\[\]]')
+
+def _string_series(values):
+    """pandas Series / Arrow array / list -> Series of (Arrow) strings"""
+    if pa is not None and isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return pd.Series(values.cast(pa.string()), dtype=STRING_DTYPE)
+    if isinstance(values, pd.Series) and values.dtype == STRING_DTYPE:
+        return values
+    return pd.Series(values, dtype=STRING_DTYPE)
+
+def _scalar_fallback(strings, result, validator, pattern=None):
+    """Redo rows outside printable ASCII (or matching pattern) with the scalar validator, in place"""
+    if pa is not None:
+        # Plain kernel, no regex: much cheaper than the validation itself
+        printable = pc.ascii_is_printable(pa.array(strings)).fill_null(True)
+        rows = ~printable.to_numpy(zero_copy_only=False)
+    else:
+        rows = ~strings.str.fullmatch(r'[\x20-\x7e]*').fillna(True).to_numpy(dtype=bool)
+    if pattern is not None:
+        rows |= strings.str.contains(pattern.pattern).fillna(False).to_numpy(dtype=bool)
+    for i in np.flatnonzero(rows):
+        value = validator(strings.iat[i])
+        result[i] = np.nan if value is None else value
+    return result
+
 class DataValidator:
     @staticmethod
     def validate_email(email):
-        pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-        return re.match(pattern, email) is not None
+        return EMAIL_PATTERN.fullmatch(email) is not None
     
     @staticmethod
     def validate_price(price_str):
         """Validate and clean price data"""
         # Remove currency symbols and convert to float
-        cleaned = re.sub(r'[^\d.]', '', price_str)
+        cleaned = PRICE_JUNK_PATTERN.sub('', price_str)
         try:
             return float(cleaned)
         except ValueError:
@@ -36,4 +86,44 @@ class DataValidator:
         for item in data_list[1:]:
             if set(item.keys()) != expected_fields:
                 return False
-        return True
\ No newline at end of file
+        return True
+    
+    # Column variants: whole Series/Arrow arrays at once, nulls count as invalid
+    
+    @staticmethod
+    def validate_email_column(values):
+        """Boolean mask of valid emails"""
+        strings = _string_series(values)
+        matched = strings.str.fullmatch(EMAIL_PATTERN.pattern).fillna(False).to_numpy(dtype=bool)
+        return _scalar_fallback(strings, matched, DataValidator.validate_email)
+    
+    @staticmethod
+    def validate_price_column(values):
+        """Cleaned prices as float64, NaN where the scalar version returns None"""
+        strings = _string_series(values)
+        cleaned = strings.str.replace(PRICE_JUNK_PATTERN.pattern, '', regex=True)
+        # Blank out unparseable values so the cast stays a single kernel call
+        parseable = cleaned.str.fullmatch(PRICE_NUMBER_PATTERN.pattern).fillna(False)
+        prices = cleaned.where(parseable).astype(FLOAT_DTYPE)
+        prices = prices.to_numpy(dtype='float64', na_value=np.nan)
+        return _scalar_fallback(strings, prices, DataValidator.validate_price)
+    
+    @staticmethod
+    def validate_url_column(values):
+        """Boolean mask of URLs with both a scheme and a host"""
+        strings = _string_series(values)
+        matched = strings.str.match(URL_PATTERN.pattern).fillna(False).to_numpy(dtype=bool)
+        return _scalar_fallback(strings, matched, DataValidator.validate_url, URL_SCALAR_ONLY_PATTERN)
+    
+    @staticmethod
+    def check_schema_conformance(data_list, expected_fields=None):
+        """One pass over the records: mask of those whose keys match the schema"""
+        if not data_list:
+            return np.ones(0, dtype=bool)
+    
+        expected_fields = set(expected_fields or data_list[0].keys())
+        # dict key views compare against a set without building one per record
+        return np.fromiter(
+            (item.keys() == expected_fields for item in data_list),
+            dtype=bool, count=len(data_list)
+        )
\ No newline at end of file
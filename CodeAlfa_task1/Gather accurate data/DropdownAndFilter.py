@@ -1,24 +1,31 @@
-from selenium import webdriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
 
-def scrape_with_filters(url):
-    driver = webdriver.Chrome()
+from BrowserPool import get_default_pool, wait_for_idle
+
+def filter_and_extract(driver, url, category='Electronics'):
+    """Apply the category and in-stock filters, then read the results"""
     driver.get(url)
+    wait_for_idle(driver)
     
     # Handle dropdown selection
     category_dropdown = Select(driver.find_element(By.ID, 'category'))
-    category_dropdown.select_by_visible_text('Electronics')
+    category_dropdown.select_by_visible_text(category)
     
     # Wait for AJAX content to load
-    time.sleep(3)
+    wait_for_idle(driver)
     
     # Apply checkbox filter
     filter_checkbox = driver.find_element(By.ID, 'in-stock-only')
     filter_checkbox.click()
     
-    time.sleep(2)
+    wait_for_idle(driver)
     
     # Extract filtered results
     results = driver.find_elements(By.CLASS_NAME, 'result-item')
-    
-    driver.quit()
\ No newline at end of file
+    return [result.text for result in results]
+
+def scrape_with_filters(url, pool=None):
+    pool = pool or get_default_pool()
+    with pool.driver() as driver:
+        return filter_and_extract(driver, url)
\ No newline at end of file
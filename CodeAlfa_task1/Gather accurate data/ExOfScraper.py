@@ -2,21 +2,51 @@
 Complete example scraping an e-commerce site with proper navigation
 """
 
-import requests
+import re
 from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime
+from urllib.parse import urljoin, urlparse
 import time
 import random
+from contextlib import closing
+from HttpTransport import HttpTransport
+from ProductRecords import ProductBatch
+from SpeculativePagination import SpeculativePaginator, detect_page_count
+
+# 4xx answers that say "not now" rather than "not here"
+RETRY_LATER_STATUSES = (408, 425, 429)
 
 class EcommerceScraper:
-    def __init__(self, base_url):
+    def __init__(self, base_url, delay_range=(1, 3), cache=None, frontier=None,
+                 rate_limiter=None, selector_backend='bs4', sink=None, transport=None,
+                 change_detector=None, columnar=False, profiler=None):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.sink = sink
+        self.site = urlparse(base_url).netloc
+        self.selector_backend = selector_backend
+        self.selector_chains = None
+        if selector_backend == 'lxml':
+            from SelectorChain import product_selector_chains
+            self.selector_chains = product_selector_chains()
+        self.delay_range = delay_range
+        self.cache = cache
+        self.frontier = frontier
+        self.change_detector = change_detector
+        self.rate_limiter = rate_limiter
+        self.transport = transport or HttpTransport()
+        if rate_limiter is not None:
+            self.transport.rate_limiter = rate_limiter
+        # Optional CrawlProfiler: request timings via the transport, parse time here
+        self.profiler = profiler
+        if profiler is not None:
+            self.transport.profiler = profiler
+        self.session = self.transport.session
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        self.results = []
+        # columnar=True keeps results in typed column buffers instead of dicts
+        self.results = ProductBatch() if columnar else []
     
     def parse_product(self, product_html):
         """Parse individual product element"""
@@ -47,44 +77,249 @@ class EcommerceScraper:
         
         return product
     
-    def navigate_category(self, category_url, max_pages=10):
-        """Navigate through category pages"""
-        page = 1
+    def collect(self, records):
+        """Hand parsed records to the streaming sink, or keep them in memory"""
+        if self.sink is not None:
+            self.sink.write_many(records)
+        else:
+            self.results.extend(records)
+    
+    def page_url(self, category_url, page):
+        """Build the absolute URL of a category listing page"""
+        return urljoin(self.base_url, f"{category_url}?page={page}")
+    
+    def parse_listing(self, html, category_url):
+        """Parse a listing page into a product count, records and a has-next flag"""
+        if self.selector_chains is not None:
+            return self.parse_listing_lxml(html, category_url)
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find all product elements
+        products = soup.select('.product-item, .product, .card')
+        
+        # Parse each product; one timestamp covers the whole page
+        scrape_date = datetime.now().isoformat()
+        records = []
+        for product_html in products:
+            product_data = self.parse_product(product_html)
+            if product_data and product_data.get('title'):
+                product_data['category'] = category_url.split('/')[-1]
+                product_data['scrape_date'] = scrape_date
+                records.append(product_data)
+        
+        # Check for next page
+        has_next = soup.select_one('.pagination .next:not(.disabled)') is not None
+        return len(products), records, has_next
+    
+    def parse_listing_lxml(self, html, category_url):
+        """lxml variant of parse_listing using compiled selector chains"""
+        from SelectorChain import clean_price, NEXT_PAGE_SELECTOR
+        
+        tree, products = self.selector_chains.items(html)
+        
+        scrape_date = datetime.now().isoformat()
+        records = []
+        for product_html in products:
+            product_data = self.selector_chains.extract(product_html, self.site)
+            if product_data['title']:
+                if product_data['price'] is not None:
+                    product_data['price'] = clean_price(product_data['price'])
+                else:
+                    del product_data['price']
+                product_data['category'] = category_url.split('/')[-1]
+                product_data['scrape_date'] = scrape_date
+                records.append(product_data)
+        
+        has_next = bool(NEXT_PAGE_SELECTOR(tree))
+        return len(products), records, has_next
+    
+    def listing_navigation(self, html):
+        """Product count and has-next flag of a listing page, without parsing the products"""
+        from lxml import html as lxml_html
+        from SelectorChain import NEXT_PAGE_SELECTOR, product_selector_chains
+        
+        chains = self.selector_chains or product_selector_chains()
+        tree, products = chains.items(lxml_html.fromstring(html))
+        return len(products), bool(NEXT_PAGE_SELECTOR(tree))
+    
+    def parse_or_reuse(self, url, html, category_url):
+        """parse_listing, unless the product list is unchanged since the last crawl"""
+        if self.change_detector is None:
+            return self.parse_listing(html, category_url)
+        
+        previous, page_fingerprint = self.change_detector.check(url, html)
+        if previous is not None:
+            # Same products as last time: reuse the records, re-stamped for this crawl.
+            # Pagination lies outside the fingerprinted region, so it is always re-read
+            product_count, has_next = self.listing_navigation(html)
+            scrape_date = datetime.now().isoformat()
+            records = [dict(r, scrape_date=scrape_date) for r in previous['records']]
+            return product_count, records, has_next
+        
+        product_count, records, has_next = self.parse_listing(html, category_url)
+        self.change_detector.remember(url, page_fingerprint, {'records': records})
+        return product_count, records, has_next
+    
+    def fetch_page(self, category_url, page):
+        """Fetch and parse one listing page, going through the cache if configured"""
+        return self.fetch_page_with_count(category_url, page)[0]
+    
+    def fetch_page_with_count(self, category_url, page, count_pages=False):
+        """fetch_page plus the page count the listing advertises (None if unknown)"""
+        url = self.page_url(category_url, page)
+        page_count = None
+        
+        def read(html):
+            nonlocal page_count
+            if self.profiler is None:
+                result = self.parse_or_reuse(url, html, category_url)
+            else:
+                with self.profiler.timer('parse'):
+                    result = self.parse_or_reuse(url, html, category_url)
+                self.profiler.observe('items_per_page', result[0])
+            if count_pages:
+                # This page's item count is the page size behind an "N results" total
+                page_count = detect_page_count(html, per_page=result[0])
+            return result
+        
+        if self.cache is None:
+            response = self.session.get(url)
+            return read(response.text), page_count
+        
+        def parse_page(html):
+            product_count, records, has_next = read(html)
+            return {'product_count': product_count, 'records': records, 'has_next': has_next}
         
+        result = self.cache.fetch(self.session, url, parse_page)
+        return (result['product_count'], result['records'], result['has_next']), page_count
+    
+    def iter_pages_sequential(self, category_url, page, max_pages):
+        """Yield (page, fetch_page result) one request at a time up to max_pages"""
         while page <= max_pages:
             print(f"Scraping page {page}...")
+            yield page, self.fetch_page(category_url, page)
             
-            # Construct page URL
-            url = f"{category_url}?page={page}"
+            # Random delay to be polite (the rate limiter paces requests itself)
+            if self.rate_limiter is None and page < max_pages:
+                time.sleep(random.uniform(*self.delay_range))
+            page += 1
+    
+    def navigate_category(self, category_url, max_pages=10, parallel=False,
+                          max_workers=8, prefetch=4):
+        """Navigate through category pages
+        
+        With parallel=True, pages 2..N are fetched concurrently when page 1
+        shows the page count, else the next `prefetch` pages speculatively.
+        """
+        page = 1
+        
+        # Resume from the last checkpoint of an interrupted run; a streaming
+        # sink already wrote those records during the earlier run
+        if self.frontier is not None:
+            if self.sink is None:
+                self.results.extend(self.frontier.load_records(category_url))
+            if self.frontier.is_finished(category_url):
+                return
+            page = self.frontier.resume_page(category_url)
+        
+        if parallel:
+            paginator = SpeculativePaginator(
+                lambda p, count_pages: self.fetch_page_with_count(category_url, p, count_pages),
+                max_workers, prefetch
+            )
+            pages = paginator.iter_pages(page, last=max_pages)
+        else:
+            pages = self.iter_pages_sequential(category_url, page, max_pages)
+        
+        with closing(pages):
+            for page, (product_count, records, has_next) in pages:
+                if not product_count:
+                    break
+                
+                self.collect(records)
+                if self.frontier is not None:
+                    self.frontier.complete_page(category_url, page, records)
+                
+                if not has_next:
+                    break
+            else:
+                # Stopped by max_pages; keep the cursor open for a later run
+                if self.frontier is not None:
+                    self.frontier.checkpoint()
+                return
+        
+        if self.frontier is not None:
+            self.frontier.mark_finished(category_url)
+    
+    def parse_product_page(self, html, url):
+        """Parse a product detail page into one record (None without a title)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        product_html = soup.select_one('.product-item, .product, main') or soup
+        record = self.parse_product(product_html)
+        if not record.get('title'):
+            return None
+        record['url'] = url
+        record['scrape_date'] = datetime.now().isoformat()
+        return record
+    
+    def scrape_discovered(self, max_products=None):
+        """Fetch the product URLs queued in the frontier by SitemapDiscovery
+        
+        Returns the number of product pages fetched. Only URLs that are new
+        or whose sitemap lastmod changed are queued, so re-runs stay small.
+        """
+        if self.frontier is None:
+            raise ValueError("scrape_discovered needs a frontier with queued product URLs")
+        
+        fetched = 0
+        for url, lastmod in self.frontier.pending_product_urls(max_products):
             response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            fetched += 1
+            if response.status_code == 200:
+                if self.profiler is not None:
+                    with self.profiler.timer('parse'):
+                        record = self.parse_product_page(response.text, url)
+                else:
+                    record = self.parse_product_page(response.text, url)
+                if record is not None:
+                    self.collect([record])
+            if response.status_code < 500 and response.status_code not in RETRY_LATER_STATUSES:
+                # Gone or parsed: either way done until the lastmod moves again.
+                # Throttled and server errors stay pending for the next run
+                self.frontier.complete_product_url(url, lastmod)
             
-            # Find all product elements
-            products = soup.select('.product-item, .product, .card')
-            
-            if not products:
-                break
-            
-            # Parse each product
-            for product_html in products:
-                product_data = self.parse_product(product_html)
-                if product_data and product_data.get('title'):
-                    product_data['category'] = category_url.split('/')[-1]
-                    product_data['scrape_date'] = datetime.now().isoformat()
-                    self.results.append(product_data)
-            
-            # Check for next page
-            next_page = soup.select_one('.pagination .next:not(.disabled)')
-            if not next_page:
-                break
-            
-            # Random delay to be polite
-            time.sleep(random.uniform(1, 3))
-            page += 1
+            if self.rate_limiter is None:
+                time.sleep(random.uniform(*self.delay_range))
+        
+        self.frontier.checkpoint()
+        return fetched
+    
+    def navigate_categories_async(self, category_urls, max_pages=10,
+                                  max_concurrency=50, per_host_limit=8):
+        """Crawl several categories concurrently with the asyncio crawler"""
+        from AsyncCrawler import AsyncCategoryCrawler
+        
+        crawler = AsyncCategoryCrawler(
+            self, max_concurrency=max_concurrency, per_host_limit=per_host_limit
+        )
+        return crawler.run(category_urls, max_pages=max_pages)
     
     def save_results(self, filename):
-        """Save scraped data"""
-        df = pd.DataFrame(self.results)
+        """Save scraped data
+        
+        With a streaming sink the records are already on disk, so this just
+        flushes the last batch and returns (output_path, summary).
+        """
+        if self.sink is not None:
+            summary = self.sink.close()
+            print(f"Streamed {summary['total_products']} records to {self.sink.output_path}")
+            return self.sink.output_path, summary
+        
+        if isinstance(self.results, ProductBatch):
+            df = self.results.to_pandas()
+        else:
+            df = pd.DataFrame(self.results)
         
         # Save with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -104,8 +339,9 @@ class EcommerceScraper:
         return df, summary
 
 # Usage
-scraper = EcommerceScraper("https://example-store.com")
-scraper.navigate_category("/electronics", max_pages=5)
-df, summary = scraper.save_results("electronics_products")
+if __name__ == "__main__":
+    scraper = EcommerceScraper("https://example-store.com")
+    scraper.navigate_category("/electronics", max_pages=5)
+    df, summary = scraper.save_results("electronics_products")
 
-print("Summary:", summary)
\ No newline at end of file
+    print("Summary:", summary)
@@ -0,0 +1,181 @@
+"""
+Replaying stand-in for a Selenium WebDriver
+
+A FakeDriver is built from recorded DOM states (HTML snapshots, e.g.
+saved from driver.page_source). It starts on the first state after get()
+and moves to the next one whenever the page would change: a scroll to
+the bottom or an element click. The last state repeats once the
+recording runs out, which is what an exhausted infinite scroll looks like.
+Enough of the WebDriver/WebElement API is implemented for BrowserPool and
+the Selenium helpers, including selenium's own Select and WebDriverWait.
+"""
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from BrowserPool import SCROLL_TO_BOTTOM_JS, SCROLL_HEIGHT_JS, WAIT_FOR_IDLE_JS
+from InfiniteScrollHandling import COLLECT_NEW_ITEMS_JS
+
+
+def _find_all(root, by, value):
+    if by == By.CLASS_NAME:
+        return CSSSelector(f".{value}")(root)
+    if by == By.CSS_SELECTOR:
+        return CSSSelector(value)(root)
+    if by == By.ID:
+        return CSSSelector(f"#{value}")(root)
+    if by == By.TAG_NAME:
+        return CSSSelector(value)(root)
+    if by == By.NAME:
+        return CSSSelector(f'[name="{value}"]')(root)
+    if by == By.XPATH:
+        return [el for el in root.xpath(value) if hasattr(el, 'tag')]
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+class FakeElement:
+    """WebElement backed by an lxml element from the current DOM state"""
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._el = element
+
+    @property
+    def tag_name(self):
+        return self._el.tag
+
+    @property
+    def text(self):
+        return ' '.join(self._el.text_content().split())
+
+    def get_attribute(self, name):
+        return self._el.get(name)
+
+    def get_dom_attribute(self, name):
+        return self._el.get(name)
+
+    def is_selected(self):
+        return self._el.get('selected') is not None or self._el.get('checked') is not None
+
+    def is_enabled(self):
+        return self._el.get('disabled') is None
+
+    def is_displayed(self):
+        return self.value_of_css_property('display') != 'none'
+
+    def value_of_css_property(self, name):
+        style = dict(
+            part.split(':', 1) for part in (self._el.get('style') or '').replace(' ', '').split(';')
+            if ':' in part
+        )
+        return style.get(name, {'display': 'block', 'visibility': 'visible', 'opacity': '1'}.get(name))
+
+    def click(self):
+        self._driver.actions.append(('click', self._el.get('id') or self._el.tag))
+        self._driver.advance()
+
+    def find_element(self, by=By.ID, value=None):
+        return self._driver._first(self._el, by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return [FakeElement(self._driver, el) for el in _find_all(self._el, by, value)]
+
+
+class FakeDriver:
+    """Driver that replays a list of HTML states (or a dict of url -> states)"""
+
+    def __init__(self, states):
+        self.states = states
+        self.current_url = None
+        self.actions = []
+        self.quit_called = False
+        self.script_timeout = None
+        self._collected = set()
+        self._sequence = []
+        self._index = 0
+        self._tree = None
+
+    @classmethod
+    def from_files(cls, paths):
+        """Replay states saved to disk, one HTML file per state"""
+        states = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                states.append(f.read())
+        return cls(states)
+
+    def _load(self):
+        self._tree = lxml_html.fromstring(self._sequence[self._index])
+
+    def advance(self):
+        """Move to the next recorded state, staying on the last one"""
+        if self._index < len(self._sequence) - 1:
+            self._index += 1
+            self._load()
+
+    @property
+    def page_source(self):
+        return self._sequence[self._index]
+
+    def get(self, url):
+        self.current_url = url
+        self.actions.append(('get', url))
+        self._sequence = self.states[url] if isinstance(self.states, dict) else self.states
+        self._index = 0
+        self._collected = set()
+        self._load()
+
+    def _collect_new_items(self, item_selector, fields):
+        """Python mirror of COLLECT_NEW_ITEMS_JS; snapshots are fresh trees, so track ids"""
+        out = []
+        for node in CSSSelector(item_selector)(self._tree):
+            links = CSSSelector('a[href]')(node)
+            item_id = (node.get('data-id') or node.get('id')
+                       or (links[0].get('href') if links else None) or node.text_content().strip())
+            if item_id in self._collected:
+                continue
+            self._collected.add(item_id)
+            item = {'id': item_id}
+            for name, selector in fields.items():
+                found = CSSSelector(selector)(node)
+                item[name] = (found[0].get('datetime') or found[0].text_content().strip()) if found else None
+            out.append(item)
+        return out
+
+    def execute_script(self, script, *args):
+        if script == SCROLL_TO_BOTTOM_JS:
+            self.actions.append(('scroll', self._index))
+            self.advance()
+            return None
+        if script == SCROLL_HEIGHT_JS:
+            # Grows with the content, like the real scrollHeight
+            return len(self.page_source)
+        if script == COLLECT_NEW_ITEMS_JS:
+            return self._collect_new_items(*args)
+        raise NotImplementedError(f"FakeDriver cannot run script: {script[:60]}")
+
+    def execute_async_script(self, script, *args):
+        if script == WAIT_FOR_IDLE_JS:
+            # Recorded states are already settled
+            return True
+        raise NotImplementedError(f"FakeDriver cannot run async script: {script[:60]}")
+
+    def set_script_timeout(self, timeout):
+        self.script_timeout = timeout
+
+    def _first(self, root, by, value):
+        found = _find_all(root, by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r}")
+        return FakeElement(self, found[0])
+
+    def find_element(self, by=By.ID, value=None):
+        return self._first(self._tree, by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return [FakeElement(self, el) for el in _find_all(self._tree, by, value)]
+
+    def quit(self):
+        self.quit_called = True
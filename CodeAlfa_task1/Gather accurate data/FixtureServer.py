@@ -0,0 +1,310 @@
+"""
+Local fixture HTTP server serving synthetic catalog pages for benchmarks
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def render_listing_page(category, page, products_per_page=24, total_pages=10, show_page_count=True):
+    """Render one listing page in the markup the scrapers expect"""
+    items = []
+    for i in range(products_per_page):
+        product_id = (page - 1) * products_per_page + i
+        items.append(
+            f'<article class="product-item" data-product-id="{product_id}">'
+            f'<h2 class="product-title title">{category.title()} Product {product_id}</h2>'
+            f'<div class="price-wrapper"><span class="price">${10 + product_id % 500}.99</span></div>'
+            f'<div class="rating">{1 + product_id % 41 / 10:.1f} out of 5</div>'
+            f'<a href="/product/{category}/{product_id}" class="view-details">View Details</a>'
+            f'</article>'
+        )
+
+    next_class = 'next' if page < total_pages else 'next disabled'
+    page_info = f'<span class="page-info">Page {page} of {total_pages}</span>' if show_page_count else ''
+    return (
+        '<!DOCTYPE html><html><head><title>Catalog</title></head><body>'
+        f'<section class="products">{"".join(items)}</section>'
+        f'<nav class="pagination">{page_info}<a href="?page={page + 1}" class="{next_class}">Next</a></nav>'
+        '</body></html>'
+    )
+
+
+def render_product_page(category, product_id):
+    """Render a product detail page with the same markup as a listing item"""
+    return (
+        '<!DOCTYPE html><html><head><title>Product</title></head><body><main>'
+        f'<article class="product-item" data-product-id="{product_id}">'
+        f'<h1 class="product-title title">{category.title()} Product {product_id}</h1>'
+        f'<div class="price-wrapper"><span class="price">${10 + product_id % 500}.99</span></div>'
+        f'<div class="rating">{1 + product_id % 41 / 10:.1f} out of 5</div>'
+        f'<a href="/product/{category}/{product_id}" class="permalink">Permalink</a>'
+        '</article></main></body></html>'
+    )
+
+
+def render_sitemap_index(base_url, sitemaps):
+    """<sitemapindex> over (path, lastmod) pairs"""
+    entries = ''.join(
+        f'<sitemap><loc>{base_url}{path}</loc><lastmod>{lastmod}</lastmod></sitemap>'
+        for path, lastmod in sitemaps
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{entries}</sitemapindex>')
+
+
+def render_sitemap(base_url, urls):
+    """<urlset> over (path, lastmod) pairs"""
+    entries = ''.join(
+        f'<url><loc>{base_url}{path}</loc><lastmod>{lastmod}</lastmod></url>'
+        for path, lastmod in urls
+    )
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{entries}</urlset>')
+
+
+class CatalogHandler(BaseHTTPRequestHandler):
+    """Serve /<category>?page=N listing pages with simulated latency"""
+    protocol_version = 'HTTP/1.1'
+    # Buffer headers with the body and disable Nagle; small separate writes
+    # trip delayed-ACK stalls that would dominate the benchmarks
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        if parsed.path == '/robots.txt' or parsed.path.startswith(('/sitemap', '/product/')):
+            return self.send_discovery(parsed.path)
+        category = parsed.path.strip('/').split('/')[-1] or 'catalog'
+        page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+
+        # Simulate network/server latency
+        if server.latency:
+            time.sleep(server.latency)
+
+        if page > server.total_pages:
+            body = b'<html><body><section class="products"></section></body></html>'
+        else:
+            body = render_listing_page(
+                category, page, server.products_per_page, server.total_pages,
+                server.show_page_count
+            ).encode('utf-8')
+            if server.page_noise:
+                # Per-request ad slot and timestamp outside the product list
+                noise = (f'<aside class="ad" data-ad-slot="{random.random()}"></aside>'
+                         f'<footer><time>{time.time()}</time></footer></body>')
+                body = body.replace(b'</body>', noise.encode('utf-8'))
+
+        # Support conditional GETs so cache revalidation can be exercised
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sitemap_chunks(self):
+        """(path, product ids) of each product sitemap, per category"""
+        server = self.server
+        total = server.total_pages * server.products_per_page
+        for category in server.sitemap_categories:
+            for n, start in enumerate(range(0, total, server.sitemap_chunk)):
+                ids = range(start, min(start + server.sitemap_chunk, total))
+                yield f'/sitemaps/{category}-{n}.xml.gz', category, ids
+
+    def product_lastmod(self, category, product_id):
+        return self.server.lastmod_overrides.get((category, product_id), self.server.sitemap_lastmod)
+
+    def send_discovery(self, path):
+        """robots.txt, gzipped sitemap index and sitemaps, and product pages"""
+        server = self.server
+        host, port = server.server_address[:2]
+        base_url = f"http://{host}:{port}"
+        content_type = 'application/x-gzip'
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if path == '/robots.txt':
+            body = (f"User-agent: *\nDisallow: /product/private/\n"
+                    f"Sitemap: {base_url}/sitemap_index.xml.gz\n").encode('utf-8')
+            content_type = 'text/plain'
+        elif path == '/sitemap_index.xml.gz':
+            sitemaps = [
+                (chunk_path, max(self.product_lastmod(category, i) for i in ids))
+                for chunk_path, category, ids in self.sitemap_chunks()
+            ]
+            body = gzip.compress(render_sitemap_index(base_url, sitemaps).encode('utf-8'))
+        elif path.startswith('/sitemaps/'):
+            chunk = next((c for c in self.sitemap_chunks() if c[0] == path), None)
+            if chunk is None:
+                return self.send_error(404)
+            _, category, ids = chunk
+            urls = [(f'/product/{category}/{i}', self.product_lastmod(category, i)) for i in ids]
+            body = gzip.compress(render_sitemap(base_url, urls).encode('utf-8'))
+        else:
+            # /product/<category>/<id>
+            parts = path.strip('/').split('/')
+            if len(parts) != 3 or not parts[2].isdigit():
+                return self.send_error(404)
+            body = render_product_page(parts[1], int(parts[2])).encode('utf-8')
+            content_type = 'text/html; charset=utf-8'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+class FlakyHandler(CatalogHandler):
+    """Catalog handler that injects 503s and slow-tail responses"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests_seen += 1
+            roll = server.rng.random()
+
+        if roll < server.failure_rate:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if roll < server.failure_rate + server.slow_rate:
+            time.sleep(server.slow_latency)
+        super().do_GET()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Mock JSON API: /api/products?page=&limit= (page counts) and /api/feed?cursor= (cursors)"""
+    protocol_version = 'HTTP/1.1'
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        limit = int(query.get('limit', ['50'])[0])
+        total = server.api_total_items
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if parsed.path.endswith('/feed'):
+            start = int(query.get('cursor', ['0'])[0] or 0)
+            end = min(start + limit, total)
+            payload = {
+                'items': [self._item(i) for i in range(start, end)],
+                'next_cursor': str(end) if end < total else None,
+            }
+        else:
+            page = int(query.get('page', ['1'])[0])
+            start = (page - 1) * limit
+            payload = {
+                'meta': {'page': page, 'total': total,
+                         'total_pages': -(-total // limit)},
+                'products': [self._item(i) for i in range(start, min(start + limit, total))],
+            }
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _item(i):
+        return {
+            'id': i,
+            'name': f"Api Product {i}",
+            'price': {'amount': f"{10 + i % 500}.99", 'currency': 'USD'},
+            'permalink': f"/product/api/{i}",
+            'category': 'electronics',
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Run a catalog fixture server on localhost in a background thread"""
+
+    def __init__(self, handler=CatalogHandler, latency=0.05, total_pages=10,
+                 products_per_page=24, host='127.0.0.1', port=0):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.total_pages = total_pages
+        self.httpd.products_per_page = products_per_page
+        self.httpd.page_noise = False
+        self.httpd.show_page_count = True
+        # Sitemaps: every product of each category, lastmod per (category, id)
+        self.httpd.sitemap_categories = ('electronics',)
+        self.httpd.sitemap_chunk = 5000
+        self.httpd.sitemap_lastmod = '2026-01-01T00:00:00+00:00'
+        self.httpd.lastmod_overrides = {}
+        # Knobs for FlakyHandler
+        self.httpd.lock = threading.Lock()
+        self.httpd.rng = random.Random(42)
+        self.httpd.requests_seen = 0
+        self.httpd.failure_rate = 0.0
+        self.httpd.slow_rate = 0.0
+        self.httpd.slow_latency = 1.0
+        # Size of the ApiHandler catalog
+        self.httpd.api_total_items = 5000
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# Usage
+if __name__ == "__main__":
+    with FixtureServer(latency=0) as server:
+        print(f"Fixture catalog running at {server.base_url}/electronics?page=1")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,208 @@
+"""
+On-disk conditional-GET cache for listing pages
+
+Stores ETag/Last-Modified validators together with the records extracted
+from each page, so a 304 Not Modified reuses them without re-parsing HTML.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+
+class DiskResponseCache:
+    """
+    SQLite-backed response cache with LRU size eviction and per-domain TTLs
+
+    Any object exposing fetch(session, url, parse_page) can be plugged into
+    the scrapers in its place; parse_page receives the HTML text and must
+    return a JSON-serialisable page result.
+    """
+
+    def __init__(self, cache_dir='.http_cache', max_bytes=512 * 1024**2,
+                 default_ttl=0, domain_ttls=None):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.domain_ttls = domain_ttls or {}
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0}
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, 'responses.sqlite'), check_same_thread=False
+        )
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                domain TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL,
+                last_access REAL,
+                size INTEGER,
+                body BLOB,
+                page_result TEXT
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        # Running total of responses.size, kept in step by store() and evict()
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache_size (total INTEGER NOT NULL)")
+        if self._db.execute("SELECT 1 FROM cache_size").fetchone() is None:
+            # New cache, or one written before the counter existed: count it once
+            self._db.execute(
+                "INSERT INTO cache_size SELECT COALESCE(SUM(size), 0) FROM responses"
+            )
+        self._db.commit()
+
+    def ttl_for(self, url):
+        """TTL in seconds for a URL, honouring per-domain overrides"""
+        domain = urlparse(url).netloc
+        return self.domain_ttls.get(domain, self.default_ttl)
+
+    def lookup(self, url):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, stored_at, page_result FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'stored_at': row[2],
+            'page_result': json.loads(row[3]),
+        }
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers from a cached entry"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_fresh(self, url, entry):
+        return time.time() - entry['stored_at'] < self.ttl_for(url)
+
+    def touch(self, url, refresh=False):
+        """Mark an entry as recently used; refresh resets its TTL clock"""
+        now = time.time()
+        with self._lock:
+            if refresh:
+                self._db.execute(
+                    "UPDATE responses SET last_access = ?, stored_at = ? WHERE url = ?",
+                    (now, now, url)
+                )
+            else:
+                self._db.execute(
+                    "UPDATE responses SET last_access = ? WHERE url = ?", (now, url)
+                )
+            self._db.commit()
+
+    def store(self, url, response, page_result):
+        """Store validators, compressed body and the extracted page result"""
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+
+        body = zlib.compress(response.content)
+        payload = json.dumps(page_result)
+        size = len(body) + len(payload)
+        now = time.time()
+
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, urlparse(url).netloc, response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), now, now, size, body, payload)
+            )
+            self._db.execute(
+                "UPDATE cache_size SET total = total + ?", (size - (previous[0] if previous else 0),)
+            )
+            self._db.commit()
+        self.evict()
+
+    def body(self, url):
+        """Return the cached raw body for a URL, if any"""
+        with self._lock:
+            row = self._db.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def total_size(self):
+        with self._lock:
+            return self._db.execute("SELECT total FROM cache_size").fetchone()[0]
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes"""
+        excess = self.total_size() - self.max_bytes
+        if excess <= 0:
+            return
+
+        with self._lock:
+            victims = []
+            freed = 0
+            for url, size in self._db.execute(
+                "SELECT url, size FROM responses ORDER BY last_access ASC"
+            ):
+                victims.append((url,))
+                freed += size
+                if freed >= excess:
+                    break
+            self._db.executemany("DELETE FROM responses WHERE url = ?", victims)
+            self._db.execute("UPDATE cache_size SET total = total - ?", (freed,))
+            self._db.commit()
+        self.stats['evictions'] += len(victims)
+
+    def fetch(self, session, url, parse_page, **kwargs):
+        """GET a page through the cache and return its parsed page result"""
+        entry = self.lookup(url)
+
+        # Within TTL: no network round trip at all
+        if entry is not None and self.is_fresh(url, entry):
+            self.touch(url)
+            self.stats['fresh_hits'] += 1
+            return entry['page_result']
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(self.conditional_headers(entry))
+        response = session.get(url, headers=headers, **kwargs)
+
+        # Not modified: reuse the previously extracted records, skip parsing
+        if response.status_code == 304 and entry is not None:
+            self.touch(url, refresh=True)
+            self.stats['revalidated'] += 1
+            return entry['page_result']
+
+        self.stats['misses'] += 1
+        page_result = parse_page(response.text)
+        if response.ok:
+            self.store(url, response, page_result)
+        return page_result
+
+    def close(self):
+        self._db.close()
+
+
+# Usage
+if __name__ == "__main__":
+    from ExOfScraper import EcommerceScraper
+
+    cache = DiskResponseCache(
+        '.http_cache',
+        max_bytes=256 * 1024**2,
+        default_ttl=0,                                # always revalidate
+        domain_ttls={'example-store.com': 6 * 3600},  # trust this host for 6h
+    )
+    scraper = EcommerceScraper("https://example-store.com", cache=cache)
+    scraper.navigate_category("/electronics", max_pages=5)
+    print("Cache stats:", cache.stats)
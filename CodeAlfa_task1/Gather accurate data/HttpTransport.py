@@ -0,0 +1,263 @@
+"""
+Shared HTTP transport for all scrapers
+
+One place to tune throughput: keep-alive connection pools sized per host,
+gzip/deflate/brotli negotiation, a process-wide DNS cache, a default
+timeout policy and per-request metrics (bytes, DNS, connect, TTFB, total
+time, status), optionally forwarded to a CrawlProfiler.
+"""
+
+import socket
+import threading
+import time
+from collections import deque, namedtuple
+from urllib.parse import urlparse
+
+import requests
+import urllib3.util.connection
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes br when this is importable)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+RequestMetric = namedtuple(
+    'RequestMetric', 'url host method status bytes wire_bytes ttfb total error dns connect',
+    defaults=(0.0, 0.0)
+)
+
+_dns_lock = threading.Lock()
+_dns_cache = {}
+_original_getaddrinfo = socket.getaddrinfo
+_original_create_connection = urllib3.util.connection.create_connection
+# Per-thread DNS and connect seconds of the request in flight
+_timing = threading.local()
+
+
+def install_dns_cache(ttl=300):
+    """Cache getaddrinfo results process-wide for ttl seconds (idempotent)"""
+    def cached_getaddrinfo(host, port, *args, **kwargs):
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with _dns_lock:
+            hit = _dns_cache.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+        start = time.perf_counter()
+        result = _original_getaddrinfo(host, port, *args, **kwargs)
+        _timing.dns = getattr(_timing, 'dns', 0.0) + time.perf_counter() - start
+        with _dns_lock:
+            _dns_cache[key] = (now + cached_getaddrinfo.ttl, result)
+        return result
+
+    if getattr(socket.getaddrinfo, 'ttl', None) is not None:
+        socket.getaddrinfo.ttl = ttl
+        return
+    cached_getaddrinfo.ttl = ttl
+    socket.getaddrinfo = cached_getaddrinfo
+
+
+def _timed_create_connection(*args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return _original_create_connection(*args, **kwargs)
+    finally:
+        _timing.connect = getattr(_timing, 'connect', 0.0) + time.perf_counter() - start
+
+
+def install_connect_timing():
+    """Time new TCP connections opened by urllib3 (idempotent)"""
+    urllib3.util.connection.create_connection = _timed_create_connection
+
+
+class TimeoutPolicy:
+    """(connect, read) timeouts with optional per-host overrides"""
+
+    def __init__(self, connect=5.0, read=30.0, per_host=None):
+        self.default = (connect, read)
+        self.per_host = per_host or {}
+
+    def for_url(self, url):
+        return self.per_host.get(urlparse(url).netloc, self.default)
+
+
+class TransportMetrics:
+    """Bounded log of per-request metrics plus per-host aggregates"""
+
+    def __init__(self, max_records=100_000):
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def add(self, metric):
+        with self._lock:
+            self.records.append(metric)
+
+    def summary(self):
+        by_host = {}
+        with self._lock:
+            records = list(self.records)
+        for m in records:
+            by_host.setdefault(m.host, []).append(m)
+
+        summary = {}
+        for host, items in by_host.items():
+            totals = sorted(m.total for m in items)
+            summary[host] = {
+                'requests': len(items),
+                'errors': sum(1 for m in items if m.error or (m.status or 0) >= 400),
+                'bytes': sum(m.bytes for m in items),
+                'wire_bytes': sum(m.wire_bytes for m in items),
+                'mean_ttfb': sum(m.ttfb for m in items) / len(items),
+                'mean_total': sum(totals) / len(totals),
+                'p95_total': totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+            }
+        return summary
+
+
+class TransportAdapter(HTTPAdapter):
+    """Connection-pooling adapter applying timeouts, rate limits and metrics"""
+
+    def __init__(self, transport, **kwargs):
+        self.transport = transport
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        transport = self.transport
+        if timeout is None:
+            timeout = transport.timeouts.for_url(request.url)
+        limiter = transport.rate_limiter
+        if limiter is not None:
+            limiter.wait(request.url)
+
+        host = urlparse(request.url).netloc
+        # Only set when this request resolves a name / opens a connection
+        _timing.dns = _timing.connect = 0.0
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream=stream, timeout=timeout, **kwargs)
+            ttfb = time.perf_counter() - start
+            if not stream:
+                response.content  # read the body here so total time covers download
+        except requests.RequestException as e:
+            elapsed = time.perf_counter() - start
+            metric = RequestMetric(
+                request.url, host, request.method, None, 0, 0, elapsed, elapsed, type(e).__name__,
+                *self._connection_timing()
+            )
+            transport.record(metric)
+            if limiter is not None:
+                limiter.record(request.url, 599, elapsed)
+            raise
+
+        total = time.perf_counter() - start
+        body_bytes = len(response.content) if not stream else 0
+        try:
+            wire_bytes = response.raw.tell()
+        except (AttributeError, OSError):
+            wire_bytes = body_bytes
+        transport.record(RequestMetric(
+            request.url, host, request.method, response.status_code,
+            body_bytes, wire_bytes, ttfb, total, None, *self._connection_timing()
+        ))
+        if limiter is not None:
+            limiter.record(request.url, response.status_code, total, response.headers)
+        return response
+
+    @staticmethod
+    def _connection_timing():
+        # The connect timer wraps the whole create_connection, name lookup included
+        dns, connect = _timing.dns, _timing.connect
+        return dns, max(0.0, connect - dns) if connect else 0.0
+
+
+class HttpTransport:
+    """Pooled keep-alive transport shared by the scraper classes"""
+
+    def __init__(self, pool_connections=32, pool_maxsize=16, per_host_pool_sizes=None,
+                 timeouts=None, dns_ttl=300, headers=None, rate_limiter=None,
+                 max_records=100_000, profiler=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.per_host_pool_sizes = per_host_pool_sizes or {}
+        self.timeouts = timeouts or TimeoutPolicy()
+        self.rate_limiter = rate_limiter
+        self.metrics = TransportMetrics(max_records)
+        self.profiler = profiler
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        if dns_ttl:
+            install_dns_cache(dns_ttl)
+        install_connect_timing()
+        self.session = self.new_session()
+
+    def new_session(self):
+        """A Session wired to this transport (e.g. one per worker thread)"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        default = TransportAdapter(
+            self, pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount('http://', default)
+        session.mount('https://', default)
+
+        # Longer prefixes win, so busy hosts get their own larger pools
+        for host, size in self.per_host_pool_sizes.items():
+            adapter = TransportAdapter(self, pool_connections=1, pool_maxsize=size)
+            session.mount(f"http://{host}", adapter)
+            session.mount(f"https://{host}", adapter)
+        return session
+
+    def record(self, metric):
+        self.metrics.add(metric)
+        if self.profiler is not None:
+            self.profiler.observe_request(metric)
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport():
+    """Process-wide transport for callers that don't bring their own"""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = HttpTransport()
+        return _default_transport
+
+
+# Usage
+if __name__ == "__main__":
+    from ExOfScraper import EcommerceScraper
+    from PaginationHandling import PaginationScraper
+
+    transport = HttpTransport(
+        per_host_pool_sizes={'example-store.com': 32},
+        timeouts=TimeoutPolicy(connect=3, read=20),
+    )
+    EcommerceScraper("https://example-store.com", transport=transport).navigate_category(
+        "/electronics", max_pages=5
+    )
+    PaginationScraper("https://example-store.com/books", transport=transport).scrape_all_pages()
+
+    for host, stats in transport.metrics.summary().items():
+        print(host, stats)
@@ -1,27 +1,65 @@
-from selenium import webdriver
+from datetime import datetime, timezone
+
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 
-def scrape_infinite_scroll(url):
-    """Handle websites with infinite scroll"""
-    driver = webdriver.Chrome()
+from BrowserPool import get_default_pool, wait_for_idle, SCROLL_TO_BOTTOM_JS, SCROLL_HEIGHT_JS
+
+ITEM_SELECTOR = '.product-item'
+ITEM_FIELDS = {'title': '.title', 'price': '.price', 'date': 'time'}
+
+# Returns only item nodes not returned before, keyed by a stable id.
+# Seen nodes live in a WeakSet so marking them doesn't mutate the DOM.
+COLLECT_NEW_ITEMS_JS = """
+var itemSelector = arguments[0], fields = arguments[1], out = [];
+var seen = window.__scrapedNodes = window.__scrapedNodes || new WeakSet();
+document.querySelectorAll(itemSelector).forEach(function (node) {
+  if (seen.has(node)) { return; }
+  seen.add(node);
+  var link = node.querySelector('a[href]');
+  var item = {id: node.getAttribute('data-id') || node.id ||
+                  (link && link.getAttribute('href')) || node.textContent.trim()};
+  Object.keys(fields).forEach(function (name) {
+    var el = node.querySelector(fields[name]);
+    item[name] = el ? (el.getAttribute('datetime') || el.textContent.trim()) : null;
+  });
+  out.push(item);
+});
+return out;
+"""
+
+def _as_utc(moment):
+    """Aware datetimes converted to UTC; naive ones are taken to be UTC already"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+def _before_cutoff(value, since):
+    # Items without a (parseable) date never stop the feed
+    if not value:
+        return False
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return _as_utc(moment) < since
+
+def scroll_and_extract(driver, url, quiet_ms=300, max_scrolls=200):
+    """Scroll a feed until it stops growing, then extract the products"""
     driver.get(url)
+    wait_for_idle(driver, quiet_ms)
     
     # Scroll to load more content
-    scroll_pause_time = 2
-    last_height = driver.execute_script("return document.body.scrollHeight")
+    last_height = driver.execute_script(SCROLL_HEIGHT_JS)
     
-    while True:
+    for _ in range(max_scrolls):
         # Scroll down to bottom
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        
-        # Wait to load page
-        time.sleep(scroll_pause_time)
-        
+        driver.execute_script(SCROLL_TO_BOTTOM_JS)
+    
+        # Wait until the new batch has rendered instead of sleeping a fixed time
+        wait_for_idle(driver, quiet_ms)
+    
         # Calculate new scroll height and compare with last height
-        new_height = driver.execute_script("return document.body.scrollHeight")
+        new_height = driver.execute_script(SCROLL_HEIGHT_JS)
         if new_height == last_height:
             break
         last_height = new_height
@@ -35,5 +73,91 @@ def scrape_infinite_scroll(url):
             'price': product.find_element(By.CLASS_NAME, 'price').text
         })
     
-    driver.quit()
-    return data
\ No newline at end of file
+    return data
+
+def scrape_infinite_scroll(url, pool=None, incremental=False, max_items=None, since=None):
+    """Handle websites with infinite scroll"""
+    if incremental:
+        return list(stream_infinite_scroll(url, pool, max_items=max_items, since=since))
+    
+    pool = pool or get_default_pool()
+    with pool.driver() as driver:
+        return scroll_and_extract(driver, url)
+
+def iter_new_items(driver, url, max_items=None, since=None, quiet_ms=300, max_scrolls=200,
+                   item_selector=ITEM_SELECTOR, fields=ITEM_FIELDS):
+    """
+    Yield feed items as they are appended, scrolling only as far as needed
+
+    Each scroll step pulls just the unseen nodes out of the page, so memory
+    and per-step work don't grow with the feed. Stops after max_items, or at
+    the first item dated before since (feeds are assumed newest-first).
+    Dates with and without offsets are compared in UTC, naive ones taken as UTC.
+    """
+    if isinstance(since, str):
+        since = datetime.fromisoformat(since)
+    if since is not None:
+        since = _as_utc(since)
+    driver.get(url)
+    wait_for_idle(driver, quiet_ms)
+    
+    seen_ids = set()
+    count = 0
+    last_height = driver.execute_script(SCROLL_HEIGHT_JS)
+    
+    for _ in range(max_scrolls + 1):
+        for item in driver.execute_script(COLLECT_NEW_ITEMS_JS, item_selector, fields):
+            # Virtualised feeds re-render nodes; the id keeps them unique
+            item_id = item.pop('id')
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+    
+            if since is not None and _before_cutoff(item.get('date'), since):
+                return
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+    
+        driver.execute_script(SCROLL_TO_BOTTOM_JS)
+        wait_for_idle(driver, quiet_ms)
+    
+        new_height = driver.execute_script(SCROLL_HEIGHT_JS)
+        if new_height == last_height:
+            break
+        last_height = new_height
+
+def stream_infinite_scroll(url, pool=None, **kwargs):
+    """Generator over a feed's items using a pooled driver"""
+    pool = pool or get_default_pool()
+    with pool.driver() as driver:
+        yield from iter_new_items(driver, url, **kwargs)
+
+
+# Usage
+if __name__ == "__main__":
+    from BrowserPool import BrowserPool
+    from FakeDriver import FakeDriver
+
+    from datetime import timedelta
+
+    # 20 scroll steps of 250 items each, newest first, one item per hour
+    newest = datetime(2024, 6, 30, 23)
+    items = [
+        f'<div class="product-item" data-id="p{i}"><span class="title">Item {i}</span>'
+        f'<span class="price">${i}.00</span>'
+        f'<time datetime="{(newest - timedelta(hours=i)).isoformat()}"></time></div>'
+        for i in range(5_000)
+    ]
+    states = ["<div>" + "".join(items[:n]) + "</div>" for n in range(250, 5_001, 250)]
+
+    with BrowserPool(lambda: FakeDriver(states), size=1) as pool:
+        first = next(stream_infinite_scroll("https://example.com/feed", pool))
+        print("First item available before scrolling finishes:", first)
+
+        latest = scrape_infinite_scroll("https://example.com/feed", pool, incremental=True, max_items=500)
+        recent = scrape_infinite_scroll("https://example.com/feed", pool, incremental=True,
+                                        since="2024-06-29T00:00:00")
+        print(f"max_items=500 -> {len(latest)} items; since cutoff -> {len(recent)} items")
+        print(f"drivers launched: {pool.drivers_created}")
\ No newline at end of file
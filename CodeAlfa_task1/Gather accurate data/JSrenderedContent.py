@@ -1,35 +1,33 @@
-from selenium.webdriver import Chrome
-from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-def scrape_js_website(url):
-    """Handle JavaScript-heavy websites"""
+from BrowserPool import get_default_pool, wait_for_idle, SCROLL_HEIGHT_JS
+
+def extract_js_products(driver, url):
+    """Read the rendered product list from a JavaScript-heavy page"""
+    driver.get(url)
+    
+    # Wait for specific element to load
+    wait = WebDriverWait(driver, 10)
+    element = wait.until(
+        EC.presence_of_element_located(("class name", "product-list"))
+    )
+    # ...and for the scripts filling it to settle
+    wait_for_idle(driver)
     
-    # Configure Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')  # Run in background
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
+    # Execute JavaScript to get data
+    page_height = driver.execute_script(SCROLL_HEIGHT_JS)
     
-    driver = Chrome(options=chrome_options)
+    # Extract after JavaScript execution
+    products = driver.find_elements(By.CLASS_NAME, "product")
     
-    try:
-        driver.get(url)
-        
-        # Wait for specific element to load
-        wait = WebDriverWait(driver, 10)
-        element = wait.until(
-            EC.presence_of_element_located(("class name", "product-list"))
-        )
-        
-        # Execute JavaScript to get data
-        page_height = driver.execute_script("return document.body.scrollHeight")
-        
-        # Extract after JavaScript execution
-        products = driver.find_elements_by_class_name("product")
-        
-        return [product.text for product in products]
+    return [product.text for product in products]
+
+def scrape_js_website(url, pool=None):
+    """Handle JavaScript-heavy websites"""
     
-    finally:
-        driver.quit()
\ No newline at end of file
+    # Headless Chrome comes from the pool, already warm and blocking images/fonts
+    pool = pool or get_default_pool()
+    with pool.driver() as driver:
+        return extract_js_products(driver, url)
\ No newline at end of file
@@ -1,48 +1,121 @@
-import requests
 from bs4 import BeautifulSoup
 import time
+from datetime import datetime
+from contextlib import closing
+from HttpTransport import HttpTransport
+from ProductRecords import ProductBatch
+from SpeculativePagination import SpeculativePaginator, detect_page_count
 
 class PaginationScraper:
-    def __init__(self, base_url):
+    def __init__(self, base_url, cache=None, frontier=None, rate_limiter=None,
+                 transport=None, columnar=False, profiler=None):
         self.base_url = base_url
-        self.session = requests.Session()
+        # columnar=True collects pages into a ProductBatch instead of a list of dicts
+        self.columnar = columnar
+        self.cache = cache
+        self.frontier = frontier
+        self.rate_limiter = rate_limiter
+        self.transport = transport or HttpTransport()
+        if rate_limiter is not None:
+            self.transport.rate_limiter = rate_limiter
+        self.profiler = profiler
+        if profiler is not None:
+            self.transport.profiler = profiler
+        self.session = self.transport.session
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
-    def scrape_all_pages(self):
-        page = 1
-        all_data = []
+    def fetch_page(self, page, count_pages=False):
+        """Fetch and parse one page; optionally also read the advertised page count"""
+        url = f"{self.base_url}?page={page}"
+        page_count = None
+        
+        def parse(html):
+            nonlocal page_count
+            if self.profiler is None:
+                page_data, has_next = self.parse_page(html)
+            else:
+                with self.profiler.timer('parse'):
+                    page_data, has_next = self.parse_page(html)
+                self.profiler.observe('items_per_page', len(page_data))
+            if count_pages:
+                # This page's item count is the page size behind an "N results" total
+                page_count = detect_page_count(html, per_page=len(page_data))
+            return page_data, has_next
+        
+        # Fetch page (a cache hit or 304 skips the parse entirely)
+        if self.cache is not None:
+            page_data, has_next = self.cache.fetch(self.session, url, parse)
+        else:
+            response = self.session.get(url)
+            page_data, has_next = parse(response.text)
+        return (page_data, has_next), page_count
         
+    def iter_pages_sequential(self, page):
+        """Yield (page, (page_data, has_next)) one request at a time"""
         while True:
-            # Construct page URL
-            url = f"{self.base_url}?page={page}"
             print(f"Scraping page {page}...")
-            
-            # Fetch page
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract data from current page
-            page_data = self.extract_page_data(soup)
-            
-            if not page_data:  # No more data
-                break
-                
-            all_data.extend(page_data)
-            
-            # Check for next page
-            next_button = soup.select_one('.pagination .next:not(.disabled)')
-            if not next_button:
-                # Alternative: check if current page has less than expected items
-                break
-            
-            # Polite delay between requests
-            time.sleep(2)
+            result, _ = self.fetch_page(page)
+            yield page, result
+        
+            # Polite delay between requests (the rate limiter paces requests itself)
+            if self.rate_limiter is None:
+                time.sleep(2)
             page += 1
+    
+    def scrape_all_pages(self, parallel=False, max_workers=8, prefetch=4):
+        """Scrape every page; parallel=True fans out once the page count is known"""
+        page = 1
+        all_data = ProductBatch() if self.columnar else []
+        
+        # Resume from the last checkpoint of an interrupted run
+        if self.frontier is not None:
+            all_data.extend(self.frontier.load_records(self.base_url))
+            if self.frontier.is_finished(self.base_url):
+                return all_data
+            page = self.frontier.resume_page(self.base_url)
         
+        if parallel:
+            # Concurrency is bounded by max_workers; pace with a rate limiter
+            paginator = SpeculativePaginator(
+                self.fetch_page, max_workers, prefetch
+            )
+            pages = paginator.iter_pages(page)
+        else:
+            pages = self.iter_pages_sequential(page)
+        
+        with closing(pages):
+            for page, (page_data, has_next) in pages:
+                if not page_data:  # No more data
+                    break
+                    
+                all_data.extend(page_data)
+                if self.frontier is not None:
+                    self.frontier.complete_page(self.base_url, page, page_data)
+                
+                # Check for next page
+                if not has_next:
+                    # Alternative: check if current page has less than expected items
+                    break
+        
+        if self.frontier is not None:
+            self.frontier.mark_finished(self.base_url)
         return all_data
     
+    def parse_page(self, html):
+        """Parse a page into its records and whether a next page exists"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract data from current page; one timestamp covers the whole page,
+        # so list and columnar results carry the same scrape_date
+        page_data = self.extract_page_data(soup)
+        scrape_date = datetime.now().isoformat()
+        for data in page_data:
+            data['scrape_date'] = scrape_date
+        next_button = soup.select_one('.pagination .next:not(.disabled)')
+        return page_data, next_button is not None
+    
     def extract_page_data(self, soup):
         """Extract product data from a single page"""
         products = []
@@ -0,0 +1,251 @@
+"""
+Pipelined crawl: fetcher threads feed raw HTML to a process pool of parsers
+
+Fetching is I/O bound and parsing is CPU bound, so the two stages get
+their own independently sized pools joined by bounded queues. When the
+parsers fall behind, the queues fill up and the fetchers block
+(backpressure) instead of buffering pages in memory.
+
+Within a category the next page is queued as soon as a fetch returns, so
+page N+1 downloads while page N is parsed; the parse result then decides
+whether the category stops, discarding at most one speculative page.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from ExOfScraper import EcommerceScraper
+
+RECORD_FIELDS = ('title', 'price', 'url', 'category', 'scrape_date')
+
+_worker_parser = None
+
+
+def _init_parser_worker(base_url, selector_backend):
+    global _worker_parser
+    _worker_parser = EcommerceScraper(base_url, selector_backend=selector_backend)
+
+
+def parse_raw_page(raw, category_url):
+    """Parser-process entry point: bytes in, compact tuples out"""
+    start = time.perf_counter()
+    html = raw.decode('utf-8', errors='replace')
+    product_count, records, has_next = _worker_parser.parse_listing(html, category_url)
+    rows = [tuple(record.get(field) for field in RECORD_FIELDS) for record in records]
+    return product_count, rows, has_next, time.perf_counter() - start
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage"""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.pages = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds, nbytes=0, error=False):
+        with self._lock:
+            self.pages += 1
+            self.bytes += nbytes
+            self.busy_seconds += seconds
+            self.errors += int(error)
+
+    def report(self, wall_seconds):
+        per_worker = self.pages / self.busy_seconds if self.busy_seconds else 0.0
+        return {
+            'workers': self.workers,
+            'pages': self.pages,
+            'errors': self.errors,
+            'megabytes': round(self.bytes / 1024**2, 2),
+            'busy_seconds': round(self.busy_seconds, 2),
+            'pages_per_sec': round(self.pages / wall_seconds, 1) if wall_seconds else 0.0,
+            'pages_per_worker_sec': round(per_worker, 1),
+            'utilisation': round(self.busy_seconds / (wall_seconds * self.workers), 2)
+            if wall_seconds else 0.0,
+        }
+
+
+class ParsePipeline:
+    """Two-stage fetch -> parse pipeline over category paginations"""
+
+    def __init__(self, scraper, fetch_workers=8, parse_workers=None, queue_size=64):
+        self.scraper = scraper
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.logger = logging.getLogger(__name__)
+        self.fetch_stats = StageStats('fetch', self.fetch_workers)
+        self.parse_stats = StageStats('parse', self.parse_workers)
+        self.wall_seconds = 0.0
+        self._local = threading.local()
+
+    def _session(self):
+        """One keep-alive session per fetcher thread, sharing the scraper's transport"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self.scraper.transport.new_session()
+            session.headers.update(self.scraper.session.headers)
+        return session
+
+    def _fetcher(self, tasks, raw_pages, stopped):
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            category_url, page = task
+            if category_url in stopped:
+                # An earlier page already ended the category; pass an empty slot
+                # through so the consumer's page count stays exact
+                raw_pages.put((category_url, page, None, None))
+                continue
+            url = self.scraper.page_url(category_url, page)
+            start = time.perf_counter()
+            try:
+                response = self._session().get(url, timeout=30)
+                raw, error = response.content, None
+            except requests.RequestException as e:
+                raw, error = b'', e
+            self.fetch_stats.add(time.perf_counter() - start, len(raw), error is not None)
+            # Blocks when the parsers are behind
+            raw_pages.put((category_url, page, raw, error))
+
+    def _dispatcher(self, pool, raw_pages, parsed):
+        while True:
+            item = raw_pages.get()
+            if item is None:
+                return
+            category_url, page, raw, error = item
+            future = None
+            if raw is not None and error is None:
+                future = pool.submit(parse_raw_page, raw, category_url)
+            # Bounded too, so at most queue_size pages are in flight in the pool
+            parsed.put((category_url, page, future, error))
+
+    def _shutdown(self, tasks, raw_pages, parsed, fetchers, dispatcher):
+        """Stop both stages, draining queues so an early exit cannot deadlock"""
+        while True:
+            try:
+                tasks.get_nowait()
+            except queue.Empty:
+                break
+        for _ in fetchers:
+            tasks.put(None)
+
+        sentinel_sent = False
+        while dispatcher.is_alive():
+            try:
+                _, _, future, _ = parsed.get(timeout=0.05)
+                if future is not None:
+                    future.cancel()
+            except queue.Empty:
+                pass
+            if not sentinel_sent and not any(thread.is_alive() for thread in fetchers):
+                try:
+                    raw_pages.put(None, timeout=0.05)
+                    sentinel_sent = True
+                except queue.Full:
+                    pass
+
+    def stream(self, category_urls, max_pages=10):
+        """Yield product records as parsed pages come back from the pool"""
+        tasks = queue.Queue()
+        raw_pages = queue.Queue(maxsize=self.queue_size)
+        parsed = queue.Queue(maxsize=self.queue_size)
+        stopped = set()
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            self.parse_workers, initializer=_init_parser_worker,
+            initargs=(self.scraper.base_url, self.scraper.selector_backend)
+        ) as pool:
+            fetchers = [
+                threading.Thread(
+                    target=self._fetcher, args=(tasks, raw_pages, stopped), daemon=True
+                )
+                for _ in range(self.fetch_workers)
+            ]
+            dispatcher = threading.Thread(
+                target=self._dispatcher, args=(pool, raw_pages, parsed), daemon=True
+            )
+            for thread in fetchers + [dispatcher]:
+                thread.start()
+
+            pending = 0
+            for category_url in category_urls:
+                tasks.put((category_url, 1))
+                pending += 1
+
+            try:
+                while pending:
+                    category_url, page, future, error = parsed.get()
+                    pending -= 1
+
+                    if category_url in stopped:
+                        # Speculative page past the end of the category
+                        if future is not None:
+                            future.cancel()
+                        continue
+
+                    if error is not None:
+                        self.logger.warning(f"Fetch failed for {category_url} page {page}: {error}")
+                        stopped.add(category_url)
+                        continue
+
+                    # Page N is fetched and submitted: fetch N+1 while it parses
+                    if page < max_pages:
+                        tasks.put((category_url, page + 1))
+                        pending += 1
+
+                    product_count, rows, has_next, parse_seconds = future.result()
+                    self.parse_stats.add(parse_seconds)
+
+                    # Same stopping rules as navigate_category
+                    if not (product_count and has_next):
+                        stopped.add(category_url)
+                    if not product_count:
+                        continue
+
+                    for row in rows:
+                        yield dict(zip(RECORD_FIELDS, row))
+            finally:
+                self._shutdown(tasks, raw_pages, parsed, fetchers, dispatcher)
+                self.wall_seconds = time.perf_counter() - start
+
+    def run(self, category_urls, max_pages=10):
+        """Collect all records through scraper.collect and return the stage report"""
+        for record in self.stream(category_urls, max_pages=max_pages):
+            self.scraper.collect([record])
+        return self.report()
+
+    def report(self):
+        """Per-stage throughput, for sizing fetch and parse pools independently"""
+        return {
+            'wall_seconds': round(self.wall_seconds, 2),
+            'fetch': self.fetch_stats.report(self.wall_seconds),
+            'parse': self.parse_stats.report(self.wall_seconds),
+        }
+
+
+# Usage
+if __name__ == "__main__":
+    from FixtureServer import FixtureServer
+
+    with FixtureServer(latency=0.05, total_pages=20, products_per_page=200) as server:
+        scraper = EcommerceScraper(server.base_url, delay_range=(0, 0))
+        pipeline = ParsePipeline(scraper, fetch_workers=16, parse_workers=4, queue_size=32)
+        report = pipeline.run([f"/category-{i}" for i in range(8)], max_pages=20)
+
+    print(f"Collected {len(scraper.results)} products")
+    for stage in ('fetch', 'parse'):
+        print(f"{stage:>6}: {report[stage]}")
+    print(f"  wall: {report['wall_seconds']}s")
@@ -0,0 +1,265 @@
+"""
+Compact product records for large crawls
+
+ProductRecord is a slotted dataclass: no per-instance __dict__, so an item
+costs its field values plus a small fixed header instead of a dict with
+repeated string keys. ProductBatch goes further and stores a batch
+column by column: prices, ratings and timestamps in typed arrays, titles
+and URLs as one UTF-8 buffer plus offsets, and categories as codes into an
+interned dictionary. Its buffers are handed to Arrow without copying, so
+converting a full batch to a pyarrow Table or an Arrow-backed pandas
+DataFrame costs only the validity bitmaps.
+"""
+
+import math
+import re
+from array import array
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+
+PRICE_JUNK_PATTERN = re.compile(r'[^\d.]')
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAN = float('nan')
+
+
+def to_float(value):
+    """Number or price-like string ('$1,299.99') to float, None when not numeric"""
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, int):
+        return float(value)
+    try:
+        return float(PRICE_JUNK_PATTERN.sub('', str(value)))
+    except ValueError:
+        return None
+
+
+def timestamp_micros(value=None):
+    """Datetime or ISO string (naive = local time) to UTC microseconds; now when None"""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.astimezone()
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """One scraped product; price/rating may hold raw strings until normalised"""
+    title: str = None
+    price: float = None
+    url: str = None
+    category: str = None
+    rating: float = None
+    scrape_date: str = None
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Build from a scraper dict, accepting 'name' for title and 'link' for url"""
+        return cls(
+            title=mapping.get('title', mapping.get('name')),
+            price=mapping.get('price'),
+            url=mapping.get('url', mapping.get('link')),
+            category=mapping.get('category'),
+            rating=mapping.get('rating'),
+            scrape_date=mapping.get('scrape_date'),
+        )
+
+    def get(self, key, default=None):
+        # Dict-style reads so existing record consumers keep working
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def as_dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+class _StringColumn:
+    """Nullable strings as one UTF-8 buffer plus int64 offsets (Arrow large_string layout)"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('q', [0])
+        self.valid = bytearray()
+
+    def append(self, value):
+        if value is None:
+            self.valid.append(0)
+        else:
+            self.data += str(value).encode('utf-8')
+            self.valid.append(1)
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i):
+        if not self.valid[i]:
+            return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def to_arrow(self):
+        n = len(self.valid)
+        return pa.Array.from_buffers(pa.large_string(), n, [
+            _validity_bitmap(self.valid, n), pa.py_buffer(self.offsets), pa.py_buffer(self.data)
+        ])
+
+    @property
+    def nbytes(self):
+        return len(self.data) + self.offsets.itemsize * len(self.offsets) + len(self.valid)
+
+
+def _null_bitmap(missing):
+    """Arrow validity bitmap from a boolean 'is missing' mask (None when nothing is)"""
+    if not missing.any():
+        return None
+    return pa.py_buffer(np.packbits(~missing, bitorder='little'))
+
+
+def _validity_bitmap(valid, n):
+    return _null_bitmap(np.frombuffer(valid, dtype=np.uint8, count=n) == 0)
+
+
+def _float_array(values):
+    """Zero-copy float64 Arrow array, with NaN (missing) marked null"""
+    n = len(values)
+    missing = np.isnan(np.frombuffer(values, dtype=np.float64, count=n))
+    return pa.Array.from_buffers(pa.float64(), n, [_null_bitmap(missing), pa.py_buffer(values)])
+
+
+class ProductBatch:
+    """Append-only columnar buffer of product records"""
+
+    def __init__(self):
+        self.title = _StringColumn()
+        self.url = _StringColumn()
+        self.price = array('d')
+        self.rating = array('d')
+        self.category_codes = array('i')
+        self.scrape_ts = array('q')
+        # Interned category dictionary: one string per distinct category
+        self.categories = []
+        self._category_index = {}
+        self._page_ts = None
+        self._last_date = (None, None)
+        self._exported = False
+
+    def start_page(self, when=None):
+        """Stamp the records of the next page with one timestamp (now by default)"""
+        self._page_ts = timestamp_micros(when)
+        return self._page_ts
+
+    def _category_code(self, category):
+        if category is None:
+            return -1
+        code = self._category_index.get(category)
+        if code is None:
+            code = self._category_index[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+    def _timestamp(self, scrape_date):
+        if scrape_date is None:
+            if self._page_ts is None:
+                self.start_page()
+            return self._page_ts
+        # Records of one page share their scrape_date: convert it once
+        last_date, last_ts = self._last_date
+        if scrape_date != last_date:
+            last_ts = timestamp_micros(scrape_date)
+            self._last_date = (scrape_date, last_ts)
+        return last_ts
+
+    def append(self, record):
+        """Add a dict or ProductRecord"""
+        if self._exported:
+            raise ValueError("Batch was exported to Arrow; start a new ProductBatch")
+        get = record.get
+        self.title.append(get('title', get('name')))
+        self.url.append(get('url', get('link')))
+        price = to_float(get('price'))
+        rating = to_float(get('rating'))
+        self.price.append(NAN if price is None else price)
+        self.rating.append(NAN if rating is None else rating)
+        self.category_codes.append(self._category_code(get('category')))
+        self.scrape_ts.append(self._timestamp(get('scrape_date')))
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return len(self.price)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        code = self.category_codes[i]
+        ts = self.scrape_ts[i]
+        return ProductRecord(
+            title=self.title[i],
+            price=None if math.isnan(self.price[i]) else self.price[i],
+            url=self.url[i],
+            category=self.categories[code] if code >= 0 else None,
+            rating=None if math.isnan(self.rating[i]) else self.rating[i],
+            scrape_date=datetime.fromtimestamp(ts / 1_000_000, timezone.utc).isoformat(),
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_arrow(self):
+        """pyarrow Table sharing this batch's buffers; the batch becomes read-only"""
+        n = len(self)
+        missing = np.frombuffer(self.category_codes, dtype=np.int32, count=n) < 0
+        codes = pa.Array.from_buffers(pa.int32(), n, [
+            _null_bitmap(missing), pa.py_buffer(self.category_codes)
+        ])
+        # Exported buffers cannot grow, so appends are refused from here on
+        self._exported = True
+        return pa.table({
+            'title': self.title.to_arrow(),
+            'price': _float_array(self.price),
+            'url': self.url.to_arrow(),
+            'category': pa.DictionaryArray.from_arrays(codes, pa.array(self.categories, pa.string())),
+            'rating': _float_array(self.rating),
+            'scrape_date': pa.Array.from_buffers(pa.timestamp('us', tz='UTC'), n,
+                                                 [None, pa.py_buffer(self.scrape_ts)]),
+        })
+
+    def to_pandas(self):
+        """Arrow-backed DataFrame over the same buffers (no per-value conversion)"""
+        import pandas as pd
+        return self.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column buffers and the category dictionary"""
+        numeric = sum(a.itemsize * len(a) for a in
+                      (self.price, self.rating, self.category_codes, self.scrape_ts))
+        interned = sum(len(c) for c in self.categories)
+        return self.title.nbytes + self.url.nbytes + numeric + interned
+
+
+# Usage
+if __name__ == "__main__":
+    batch = ProductBatch()
+    for page in range(3):
+        batch.start_page()
+        batch.extend(
+            {'title': f"Product {i}", 'price': f"${10 + i}.99", 'url': f"/product/{i}",
+             'category': 'electronics' if i % 2 else 'books'}
+            for i in range(page * 4, page * 4 + 4)
+        )
+    print(batch[5])
+    print(f"{len(batch)} records in {batch.nbytes} bytes")
+    print(batch.to_pandas().head())
@@ -0,0 +1,191 @@
+"""
+Render CrawlProfiler runs as JSON/HTML reports and flag regressions
+
+    python ProfileReport.py run.json --html run.html
+    python ProfileReport.py run.json --baseline last_release.json \\
+        --html diff.html --json diff.json --fail-on-regression
+
+Against a baseline, every histogram's p50/p90/p99 is compared. Timings
+that grew, items per page that shrank, or an error rate that rose by more
+than the threshold count as regressions.
+"""
+
+import argparse
+import html
+import json
+import sys
+
+# Which direction is worse, per metric (bytes per page is informational)
+WORSE_WHEN = {
+    'dns': 'higher', 'connect': 'higher', 'ttfb': 'higher', 'download': 'higher',
+    'parse': 'higher', 'validate': 'higher', 'items_per_page': 'lower',
+}
+PERCENTILES = ('p50', 'p90', 'p99')
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def error_rate(report):
+    requests_seen = report.get('pages', 0) + report.get('errors_total', 0)
+    return report.get('errors_total', 0) / requests_seen if requests_seen else 0.0
+
+
+def compare(report, baseline, threshold=0.10):
+    """Per-metric percentile changes of report vs baseline, plus the regressions"""
+    rows = []
+    for metric, stats in report['histograms'].items():
+        base = baseline['histograms'].get(metric)
+        if not base or not base.get('count'):
+            continue
+        for stat in PERCENTILES:
+            old, new = base.get(stat), stats.get(stat)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            direction = WORSE_WHEN.get(metric)
+            regressed = (direction == 'higher' and change > threshold) or \
+                        (direction == 'lower' and change < -threshold)
+            rows.append({'metric': metric, 'stat': stat, 'baseline': old, 'current': new,
+                         'change': change, 'regressed': regressed})
+
+    old_rate, new_rate = error_rate(baseline), error_rate(report)
+    rows.append({'metric': 'errors', 'stat': 'rate', 'baseline': old_rate, 'current': new_rate,
+                 'change': (new_rate - old_rate) / old_rate if old_rate else (1.0 if new_rate else 0.0),
+                 'regressed': new_rate > old_rate * (1 + threshold) and new_rate - old_rate > 0.001})
+    return {
+        'run': report['run'],
+        'baseline_run': baseline['run'],
+        'threshold': threshold,
+        'comparisons': rows,
+        'regressions': [r for r in rows if r['regressed']],
+    }
+
+
+def format_value(value, unit):
+    if value is None:
+        return '-'
+    if unit == 's':
+        return f"{value * 1000:.2f} ms"
+    if unit == 'bytes':
+        return f"{value / 1024:.1f} KiB"
+    return f"{value:.1f}"
+
+
+def render_text(report, comparison=None):
+    lines = [f"Run {report['run']}: {report['pages']} pages in {report['duration']:.1f}s, "
+             f"{report['errors_total']} errors {report['errors'] or ''}"]
+    for metric, stats in report['histograms'].items():
+        unit = stats['unit']
+        lines.append(f"  {metric:<16}{stats['count']:>8}  " + '  '.join(
+            f"{stat}={format_value(stats[stat], unit)}" for stat in ('p50', 'p90', 'p99', 'max')))
+    if comparison is not None:
+        lines.append(f"vs {comparison['baseline_run']}: {len(comparison['regressions'])} regressions "
+                     f"(threshold {comparison['threshold']:.0%})")
+        for row in comparison['regressions']:
+            lines.append(f"  REGRESSION {row['metric']} {row['stat']}: {row['change']:+.1%}")
+    return '\n'.join(lines)
+
+
+def _bucket_bars(stats):
+    """Inline bar chart of a histogram's buckets"""
+    buckets = stats.get('buckets', {})
+    if not buckets:
+        return ''
+    peak = max(buckets.values())
+    bars = ''.join(
+        f'<div class="bar" style="height:{max(2, round(48 * count / peak))}px" '
+        f'title="&le; {html.escape(bound)}: {count}"></div>'
+        for bound, count in buckets.items()
+    )
+    return f'<div class="bars">{bars}</div>'
+
+
+def render_html(report, comparison=None):
+    esc = html.escape
+    labels = ', '.join(f"{esc(str(k))}={esc(str(v))}" for k, v in report.get('labels', {}).items())
+    rows = []
+    for metric, stats in report['histograms'].items():
+        unit = stats['unit']
+        cells = ''.join(f"<td>{format_value(stats[s], unit)}</td>"
+                        for s in ('mean', 'p50', 'p90', 'p99', 'max'))
+        rows.append(f"<tr><th>{esc(metric)}</th><td>{stats['count']}</td>{cells}"
+                    f"<td>{_bucket_bars(stats)}</td></tr>")
+    errors = ''.join(f"<tr><th>{esc(kind)}</th><td>{count}</td></tr>"
+                     for kind, count in report['errors'].items()) or '<tr><td>none</td></tr>'
+
+    diff = ''
+    if comparison is not None:
+        units = {m: s['unit'] for m, s in report['histograms'].items()}
+        diff_rows = ''.join(
+            f"<tr class=\"{'bad' if r['regressed'] else ''}\"><th>{esc(r['metric'])}</th>"
+            f"<td>{r['stat']}</td>"
+            f"<td>{format_value(r['baseline'], units.get(r['metric'], ''))}</td>"
+            f"<td>{format_value(r['current'], units.get(r['metric'], ''))}</td>"
+            f"<td>{r['change']:+.1%}</td></tr>"
+            for r in comparison['comparisons']
+        )
+        diff = (f"<h2>Compared with {esc(comparison['baseline_run'])}: "
+                f"{len(comparison['regressions'])} regressions</h2>"
+                "<table><tr><th>Metric</th><th>Stat</th><th>Baseline</th><th>Current</th>"
+                f"<th>Change</th></tr>{diff_rows}</table>")
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Crawl profile {esc(report['run'])}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: right; }}
+th:first-child {{ text-align: left; }}
+tr.bad {{ background: #fdd; }}
+.bars {{ display: flex; align-items: flex-end; height: 48px; gap: 1px; }}
+.bar {{ width: 4px; background: #4a7ab5; }}
+</style></head><body>
+<h1>Crawl profile {esc(report['run'])}</h1>
+<p>Started {esc(report['started'])}, {report['duration']:.1f}s, {report['pages']} pages,
+Python {esc(report.get('python', ''))}. {labels}</p>
+{diff}
+<h2>Histograms</h2>
+<table><tr><th>Metric</th><th>Count</th><th>Mean</th><th>p50</th><th>p90</th><th>p99</th>
+<th>Max</th><th>Distribution</th></tr>{''.join(rows)}</table>
+<h2>Errors ({report['errors_total']})</h2>
+<table>{errors}</table>
+</body></html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a CrawlProfiler run report")
+    parser.add_argument('report', help="JSON written by CrawlProfiler.save()")
+    parser.add_argument('--baseline', help="earlier run to compare against")
+    parser.add_argument('--html', help="write an HTML report here")
+    parser.add_argument('--json', help="write the report (with comparison) as JSON here")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative change that counts as a regression (default 0.10)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 when any regression is found")
+    args = parser.parse_args(argv)
+
+    report = load_report(args.report)
+    comparison = None
+    if args.baseline:
+        comparison = compare(report, load_report(args.baseline), args.threshold)
+
+    print(render_text(report, comparison))
+    if args.html:
+        with open(args.html, 'w', encoding='utf-8') as f:
+            f.write(render_html(report, comparison))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(report, comparison=comparison), f, indent=2)
+
+    if args.fail_on_regression and comparison and comparison['regressions']:
+        return 1
+    return 0
+
+
+# Usage
+if __name__ == "__main__":
+    sys.exit(main())
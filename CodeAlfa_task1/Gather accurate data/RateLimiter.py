@@ -0,0 +1,181 @@
+"""
+Adaptive per-domain rate limiting to replace fixed politeness sleeps
+
+Each domain gets a token bucket whose rate grows additively while
+responses stay fast and healthy, and shrinks multiplicatively on 429/503
+(AIMD). robots.txt Crawl-delay caps the rate and Retry-After pauses the
+domain entirely.
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+
+def parse_retry_after(value):
+    """Retry-After header (seconds or HTTP-date) to seconds from now"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class DomainState:
+    """Token bucket and health signals for a single domain"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.max_rate = None
+        self.latency_ewma = None
+        self.latency_floor = None
+        self.robots_checked = False
+        # Held while robots.txt is fetched so no request slips out before Crawl-delay applies
+        self.robots_lock = threading.Lock()
+
+
+class AdaptiveRateLimiter:
+    """Per-domain AIMD token buckets honouring Crawl-delay and Retry-After"""
+
+    def __init__(self, initial_rate=0.5, min_rate=0.05, max_rate=10.0, burst=1,
+                 increase_step=0.25, backoff_factor=0.5, latency_tolerance=2.0,
+                 respect_robots=True, user_agent='*'):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.domains = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key):
+        with self._lock:
+            state = self.domains.get(key)
+            if state is None:
+                state = self.domains[key] = DomainState(self.initial_rate, self.burst)
+                state.max_rate = self.max_rate
+        return state
+
+    def _domain(self, url):
+        parsed = urlparse(url)
+        state = self._state(parsed.netloc)
+
+        if self.respect_robots and not state.robots_checked:
+            with state.robots_lock:
+                if not state.robots_checked:
+                    delay = self.crawl_delay(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
+                    if delay:
+                        with self._lock:
+                            state.max_rate = min(self.max_rate, 1.0 / delay)
+                            state.rate = min(state.rate, state.max_rate)
+                    state.robots_checked = True
+        return state
+
+    def crawl_delay(self, robots_url):
+        """Crawl-delay from robots.txt, or None when absent/unreachable"""
+        try:
+            response = requests.get(robots_url, timeout=10)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        delay = parser.crawl_delay(self.user_agent)
+        return float(delay) if delay else None
+
+    def reserve(self, url):
+        """Take a token for url and return how long the caller must wait"""
+        state = self._domain(url)
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - state.last_refill
+            state.tokens = min(state.capacity, state.tokens + elapsed * state.rate)
+            state.last_refill = now
+            state.tokens -= 1
+
+            delay = 0.0 if state.tokens >= 0 else -state.tokens / state.rate
+            return max(delay, state.blocked_until - now)
+
+    def wait(self, url):
+        """Block the calling thread until a request to url is allowed"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        """Event-loop friendly variant of wait(); robots.txt is read in a worker thread"""
+        if self.respect_robots and not self._state(urlparse(url).netloc).robots_checked:
+            await asyncio.get_running_loop().run_in_executor(None, self._domain, url)
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, url, status_code, latency, headers=None):
+        """Feed a response back so the domain's rate can adapt"""
+        state = self._domain(url)
+        headers = headers or {}
+
+        with self._lock:
+            if state.latency_ewma is None:
+                state.latency_ewma = latency
+            else:
+                state.latency_ewma = 0.8 * state.latency_ewma + 0.2 * latency
+            if state.latency_floor is None or latency < state.latency_floor:
+                state.latency_floor = latency
+
+            if status_code in (429, 503):
+                # Multiplicative decrease and a hard pause if the server asked for one
+                state.rate = max(self.min_rate, state.rate * self.backoff_factor)
+                pause = parse_retry_after(headers.get('Retry-After'))
+                if pause is None:
+                    pause = 1.0 / state.rate
+                state.blocked_until = max(state.blocked_until, time.monotonic() + pause)
+                state.tokens = min(state.tokens, 0)
+            elif status_code >= 500:
+                state.rate = max(self.min_rate, state.rate * self.backoff_factor)
+            elif state.latency_ewma > state.latency_floor * self.latency_tolerance + 0.05:
+                # Server is slowing down; ease off before it starts failing
+                state.rate = max(self.min_rate, state.rate * 0.9)
+            else:
+                state.rate = min(state.max_rate, state.rate + self.increase_step)
+
+    def current_rates(self):
+        """Snapshot of requests/second per domain"""
+        with self._lock:
+            return {domain: round(state.rate, 3) for domain, state in self.domains.items()}
+
+
+# Usage
+if __name__ == "__main__":
+    from ExOfScraper import EcommerceScraper
+    from PaginationHandling import PaginationScraper
+
+    limiter = AdaptiveRateLimiter(initial_rate=0.5, max_rate=5.0)
+
+    # One limiter can be shared so all scrapers respect the same per-domain budget
+    shop = EcommerceScraper("https://example-store.com", rate_limiter=limiter)
+    shop.navigate_category("/electronics", max_pages=5)
+
+    books = PaginationScraper("https://example-store.com/books", rate_limiter=limiter)
+    books.scrape_all_pages()
+
+    print("Learned rates:", limiter.current_rates())
@@ -0,0 +1,148 @@
+"""
+Streaming output for scraped records
+
+Records are buffered into fixed-size batches and flushed to a
+Hive-partitioned Parquet dataset (or appended to a CSV file) as pages are
+parsed, so memory stays bounded and a crash loses at most one batch.
+Summary statistics are accumulated as records arrive, so the end-of-run
+summary never needs the full dataset.
+"""
+
+import csv
+import os
+import uuid
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PRODUCT_SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('price', pa.float64()),
+    ('url', pa.string()),
+    ('category', pa.string()),
+    ('scrape_date', pa.string()),
+])
+
+
+class RunningSummary:
+    """Incremental version of the save_results summary dict"""
+
+    def __init__(self):
+        self.count = 0
+        self.categories = set()
+        self.price_count = 0
+        self.price_sum = 0.0
+        self.min_date = None
+        self.max_date = None
+
+    def update(self, record):
+        self.count += 1
+        category = record.get('category')
+        if category is not None:
+            self.categories.add(category)
+        price = record.get('price')
+        if isinstance(price, (int, float)):
+            self.price_count += 1
+            self.price_sum += price
+        # ISO-8601 strings sort chronologically
+        date = record.get('scrape_date')
+        if date is not None:
+            if self.min_date is None or date < self.min_date:
+                self.min_date = date
+            if self.max_date is None or date > self.max_date:
+                self.max_date = date
+
+    def as_dict(self):
+        return {
+            'total_products': self.count,
+            'unique_categories': len(self.categories),
+            'avg_price': self.price_sum / self.price_count if self.price_count else 0,
+            'date_range': f"{self.min_date} to {self.max_date}",
+        }
+
+
+class StreamingRecordSink:
+    """Batching writer for partitioned Parquet or append-only CSV output"""
+
+    def __init__(self, output_path, format='parquet', batch_size=10_000,
+                 partition_cols=('category',), schema=PRODUCT_SCHEMA):
+        if format not in ('parquet', 'csv'):
+            raise ValueError(f"Unknown sink format: {format}")
+        self.output_path = output_path
+        self.format = format
+        self.batch_size = batch_size
+        self.partition_cols = list(partition_cols or [])
+        self.schema = schema
+        self.buffer = []
+        self.batches_written = 0
+        self.running = RunningSummary()
+        self.run_id = uuid.uuid4().hex[:8]
+        self._csv_fields = None
+
+    def write(self, record):
+        self.buffer.append(record)
+        self.running.update(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write the buffered batch to disk"""
+        if not self.buffer:
+            return
+        if self.format == 'parquet':
+            self._flush_parquet()
+        else:
+            self._flush_csv()
+        self.buffer = []
+        self.batches_written += 1
+
+    def _flush_parquet(self):
+        if self.schema is None:
+            self.schema = pa.Table.from_pylist(self.buffer).schema
+        rows = [{name: record.get(name) for name in self.schema.names} for record in self.buffer]
+        table = pa.Table.from_pylist(rows, schema=self.schema)
+        pq.write_to_dataset(
+            table,
+            root_path=self.output_path,
+            partition_cols=self.partition_cols or None,
+            basename_template=f"{self.run_id}-batch-{self.batches_written:06d}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+
+    def _flush_csv(self):
+        new_file = not os.path.exists(self.output_path) or os.path.getsize(self.output_path) == 0
+        if self._csv_fields is None:
+            self._csv_fields = self.schema.names if self.schema is not None else list(self.buffer[0])
+        with open(self.output_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self._csv_fields, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            writer.writerows(self.buffer)
+
+    def summary(self):
+        return self.running.as_dict()
+
+    def close(self):
+        self.flush()
+        return self.summary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Usage
+if __name__ == "__main__":
+    from ExOfScraper import EcommerceScraper
+
+    sink = StreamingRecordSink('electronics_products', format='parquet', batch_size=5_000)
+    scraper = EcommerceScraper("https://example-store.com", sink=sink)
+    scraper.navigate_category("/electronics", max_pages=5)
+    output, summary = scraper.save_results("electronics_products")
+    print("Summary:", summary)
@@ -0,0 +1,229 @@
+"""
+Crawl-wide failure controls for RobustScraper
+
+- CircuitBreaker: per-host breaker that fails fast after repeated errors
+  and lets a single probe through once the cooldown has passed
+- RetryBudget: caps retries at a fraction of recent traffic so a dead
+  origin cannot multiply the crawl's request volume
+- HedgedRequester: fires a duplicate request when a call runs past the
+  host's p95 latency and takes whichever answer arrives first
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose breaker is open"""
+
+
+def is_host_failure(exc):
+    """Errors that say something about the origin's health"""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+class CircuitBreaker:
+    """Closed -> open after failure_threshold consecutive failures -> half-open probe"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hosts = {}
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = {
+                'state': self.CLOSED, 'failures': 0, 'opened_at': 0.0, 'probing': False
+            }
+        return state
+
+    def before_request(self, url):
+        """Raise CircuitOpenError unless a request to url may go out"""
+        with self._lock:
+            host = self._host(url)
+            if host['state'] == self.OPEN:
+                if time.monotonic() - host['opened_at'] < self.cooldown:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+                host['state'] = self.HALF_OPEN
+                host['probing'] = False
+            if host['state'] == self.HALF_OPEN:
+                # Exactly one probe at a time while half-open
+                if host['probing']:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit half-open for {urlparse(url).netloc}")
+                host['probing'] = True
+
+    def record_success(self, url):
+        with self._lock:
+            host = self._host(url)
+            host.update(state=self.CLOSED, failures=0, probing=False)
+
+    def record_failure(self, url):
+        with self._lock:
+            host = self._host(url)
+            host['failures'] += 1
+            host['probing'] = False
+            if host['state'] == self.HALF_OPEN or host['failures'] >= self.failure_threshold:
+                host['state'] = self.OPEN
+                host['opened_at'] = time.monotonic()
+
+    def state(self, url):
+        with self._lock:
+            return self._host(url)['state']
+
+
+class RetryBudget:
+    """Allow retries only up to ratio * requests seen in a sliding window"""
+
+    def __init__(self, ratio=0.1, min_retries_per_window=10, window=10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries_per_window
+        self.window = window
+        self.requests = deque()
+        self.retries = deque()
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        cutoff = now - self.window
+        for events in (self.requests, self.retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_request(self):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self.requests.append(now)
+
+    def try_acquire(self):
+        """Spend one retry if the budget allows it"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            allowed = max(self.min_retries, self.ratio * len(self.requests))
+            if len(self.retries) < allowed:
+                self.retries.append(now)
+                return True
+            self.denied += 1
+            return False
+
+
+class HedgedRequester:
+    """Send a backup request when the primary exceeds the host's latency quantile"""
+
+    def __init__(self, transport, quantile=0.95, min_samples=20, history=200,
+                 max_workers=16, retry_budget=None):
+        self.transport = transport
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.history = history
+        self.retry_budget = retry_budget
+        self.latencies = {}
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def hedge_delay(self, url):
+        """Latency quantile for the host, or None until enough samples exist"""
+        with self._lock:
+            samples = self.latencies.get(urlparse(url).netloc)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))]
+
+    def _timed_get(self, url, kwargs):
+        start = time.perf_counter()
+        response = self.transport.get(url, **kwargs)
+        return response, time.perf_counter() - start
+
+    def _observe(self, url, latency):
+        with self._lock:
+            samples = self.latencies.setdefault(urlparse(url).netloc, deque(maxlen=self.history))
+            samples.append(latency)
+
+    def get(self, url, **kwargs):
+        primary = self._pool.submit(self._timed_get, url, kwargs)
+        delay = self.hedge_delay(url)
+
+        if delay is None:
+            response, latency = primary.result()
+            self._observe(url, latency)
+            return response
+
+        done, _ = wait([primary], timeout=delay)
+        if done or (self.retry_budget is not None and not self.retry_budget.try_acquire()):
+            response, latency = primary.result()
+            self._observe(url, latency)
+            return response
+
+        self.hedges_fired += 1
+        backup = self._pool.submit(self._timed_get, url, kwargs)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response, latency = future.result()
+                except requests.RequestException as e:
+                    error = e
+                    continue
+                if future is backup:
+                    self.hedges_won += 1
+                # The primary's full latency is what the quantile should learn
+                self._observe(url, latency if future is primary else latency + delay)
+                return response
+        raise error
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+# Usage
+if __name__ == "__main__":
+    from FixtureServer import FixtureServer, FlakyHandler
+    from RoburstScrapingPattern import RobustScraper
+
+    # Dead origin: the breaker opens and later URLs fail fast without traffic
+    with FixtureServer(handler=FlakyHandler, latency=0) as server:
+        server.httpd.failure_rate = 1.0
+        scraper = RobustScraper(
+            circuit_breaker=CircuitBreaker(failure_threshold=3, cooldown=60),
+            retry_budget=RetryBudget(ratio=0.0, min_retries_per_window=0),
+        )
+        for i in range(10):
+            try:
+                scraper.fetch_with_retry(f"{server.base_url}/dead?page={i}")
+            except requests.RequestException as e:
+                print(f"page {i}: {type(e).__name__}")
+        print(f"Requests reaching the origin: {server.httpd.requests_seen}, "
+              f"rejected by breaker: {scraper.circuit_breaker.rejected}")
+
+    # Slow tail: 3% of responses take 1s; hedging past p95 cuts the tail latency
+    with FixtureServer(handler=FlakyHandler, latency=0.01) as server:
+        server.httpd.slow_rate = 0.03
+        server.httpd.slow_latency = 1.0
+        scraper = RobustScraper(hedge=True)
+        start = time.perf_counter()
+        for i in range(200):
+            scraper.fetch_with_retry(f"{server.base_url}/tail?page={i % 5 + 1}")
+        print(f"200 requests in {time.perf_counter() - start:.2f}s, "
+              f"hedges fired {scraper.hedger.hedges_fired}, won {scraper.hedger.hedges_won}")
@@ -1,17 +1,84 @@
 import logging
+import requests
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
+from HttpTransport import HttpTransport
+from ResilienceControls import CircuitOpenError, HedgedRequester, is_host_failure
+
+MAX_ATTEMPTS = 3
+
+def _should_retry(retry_state):
+    """Retry failures unless the circuit is open, attempts are used up or the retry budget is spent"""
+    if not retry_state.outcome.failed:
+        return False
+    if isinstance(retry_state.outcome.exception(), CircuitOpenError):
+        return False
+    # tenacity asks before checking stop; the last attempt must not spend budget
+    if retry_state.attempt_number >= MAX_ATTEMPTS:
+        return False
+    scraper = retry_state.args[0]
+    return scraper.retry_budget is None or scraper.retry_budget.try_acquire()
 
 class RobustScraper:
-    def __init__(self):
+    def __init__(self, rate_limiter=None, selector_backend='bs4', transport=None,
+                 circuit_breaker=None, retry_budget=None, hedge=False, profiler=None):
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        self.rate_limiter = rate_limiter
+        self.transport = transport or HttpTransport()
+        if rate_limiter is not None:
+            self.transport.rate_limiter = rate_limiter
+        self.profiler = profiler
+        if profiler is not None:
+            self.transport.profiler = profiler
+        self.circuit_breaker = circuit_breaker
+        self.retry_budget = retry_budget
+        self.hedger = None
+        if hedge:
+            self.hedger = HedgedRequester(self.transport, retry_budget=retry_budget)
+        self.price_chain = None
+        if selector_backend == 'lxml':
+            from SelectorChain import SelectorChain
+            self.price_chain = SelectorChain(
+                'price', ['.price', '[itemprop="price"]', '.product-price', '.sale-price']
+            )
     
-    @retry(stop=stop_after_attempt(3), 
-           wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(stop=stop_after_attempt(MAX_ATTEMPTS), 
+           wait=wait_exponential(multiplier=1, min=4, max=10),
+           retry=_should_retry, reraise=True)
     def fetch_with_retry(self, url):
         """Fetch with automatic retry on failure"""
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            try:
+                breaker.before_request(url)
+            except CircuitOpenError as e:
+                # Never reaches the transport, so count it here
+                if self.profiler is not None:
+                    self.profiler.error(e)
+                raise
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+        
+        # The transport applies the rate limiter, so a 429/503 Retry-After
+        # pauses the domain before tenacity's next attempt
+        try:
+            if self.hedger is not None:
+                response = self.hedger.get(url, timeout=10)
+            else:
+                response = self.transport.get(url, timeout=10)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if breaker is not None:
+                if is_host_failure(e):
+                    breaker.record_failure(url)
+                else:
+                    breaker.record_success(url)
+            raise
+        
+        if breaker is not None:
+            breaker.record_success(url)
         return response
     
     def safe_extract(self, soup, selector, attribute=None):
@@ -30,6 +97,19 @@ class RobustScraper:
     def scrape_with_fallbacks(self, url):
         """Try multiple selectors for the same data"""
         response = self.fetch_with_retry(url)
+        
+        if self.profiler is not None:
+            with self.profiler.timer('parse'):
+                return self._extract_price(response, url)
+        return self._extract_price(response, url)
+    
+    def _extract_price(self, response, url):
+        # Compiled chain: the selector that won last time on this site goes first
+        if self.price_chain is not None:
+            from lxml import html as lxml_html
+            tree = lxml_html.fromstring(response.content)
+            return {'price': self.price_chain.extract(tree, urlparse(url).netloc)}
+        
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Try different selectors for price
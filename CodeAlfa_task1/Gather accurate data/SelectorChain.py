@@ -0,0 +1,119 @@
+"""
+Compiled CSS fallback chains evaluated against lxml trees
+
+Each fallback selector is translated to XPath and compiled once. The
+chain remembers which fallback matched on each site and tries that one
+first on later pages, so the common case costs a single XPath evaluation
+per field.
+"""
+
+import logging
+import re
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from cssselect import SelectorError
+
+logger = logging.getLogger(__name__)
+
+NEXT_PAGE_SELECTOR = CSSSelector('.pagination .next:not(.disabled)')
+
+
+class SelectorChain:
+    """Ordered CSS fallbacks compiled to XPath, with per-site winner memory"""
+
+    def __init__(self, name, selectors, attribute=None):
+        self.name = name
+        self.selectors = list(selectors)
+        self.attribute = attribute
+        self.compiled = []
+        for css in self.selectors:
+            try:
+                self.compiled.append(CSSSelector(css))
+            except SelectorError as e:
+                # Leave a gap so indices still line up with self.selectors
+                logger.warning(f"Cannot compile selector {css!r} for {self.name}: {e}")
+                self.compiled.append(None)
+        self.winners = {}
+
+        # Precomputed try-orders: default, and one per possible winner
+        indices = list(range(len(self.compiled)))
+        self._default_order = indices
+        self._winner_orders = [[i] + [j for j in indices if j != i] for i in indices]
+
+    def _order(self, site):
+        winner = self.winners.get(site)
+        if winner is None:
+            return self._default_order
+        return self._winner_orders[winner]
+
+    def select(self, element, site=None):
+        """First element matched by the chain, trying the site's winner first"""
+        for index in self._order(site):
+            selector = self.compiled[index]
+            if selector is None:
+                continue
+            matches = selector(element)
+            if matches:
+                # Plain dict assignment is atomic, so threads can share a chain
+                self.winners[site] = index
+                return matches[0]
+        return None
+
+    def extract(self, element, site=None):
+        """Stripped text (or attribute value) of the first match"""
+        match = self.select(element, site)
+        if match is None:
+            return None
+        if self.attribute:
+            return match.get(self.attribute)
+        return match.text_content().strip()
+
+    def winning_selector(self, site=None):
+        index = self.winners.get(site)
+        return self.selectors[index] if index is not None else None
+
+
+class SelectorChainSet:
+    """Named group of selector chains applied to each item of a listing"""
+
+    def __init__(self, item_selector, chains):
+        self.item_selector = CSSSelector(item_selector)
+        self.chains = {chain.name: chain for chain in chains}
+
+    def items(self, html):
+        tree = lxml_html.fromstring(html) if isinstance(html, (str, bytes)) else html
+        return tree, self.item_selector(tree)
+
+    def extract(self, element, site=None):
+        return {name: chain.extract(element, site) for name, chain in self.chains.items()}
+
+
+def product_selector_chains():
+    """Chains mirroring the fallbacks in EcommerceScraper.parse_product"""
+    return SelectorChainSet('.product-item, .product, .card', [
+        SelectorChain('title', ['.product-title', 'h2 a', '.name']),
+        SelectorChain('price', ['.price', '.current-price', '[itemprop="price"]']),
+        SelectorChain('url', ['a'], attribute='href'),
+    ])
+
+
+def clean_price(price_text):
+    """Same cleaning rule as parse_product"""
+    if not price_text:
+        return None
+    return float(re.sub(r'[^\d.]', '', price_text))
+
+
+# Usage
+if __name__ == "__main__":
+    with open('WebScraping.html', encoding='utf-8') as f:
+        page = f.read()
+
+    chains = product_selector_chains()
+    tree, items = chains.items(page)
+    for item in items:
+        print(chains.extract(item, site='example-store.com'))
+
+    for name, chain in chains.chains.items():
+        print(f"{name}: winning selector {chain.winning_selector('example-store.com')!r}")
@@ -0,0 +1,132 @@
+"""
+Parallel pagination for listing crawls
+
+Page 1 is fetched on its own. If it shows how many pages there are ("Page 1
+of 40", a last-page link, or "960 results" over the items on page 1),
+pages 2..N are fetched concurrently. Otherwise the next `prefetch` pages
+are requested speculatively while the current one is being processed.
+
+Pages are always handed back in order, and the caller keeps its own loop
+and break conditions. Closing the generator cancels anything still queued,
+so stopping behaviour is the same as the sequential loops. Speculative
+requests past the last page are the only extra traffic.
+"""
+
+import math
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
+
+PAGE_OF_PATTERN = re.compile(r'page\s+\d+\s+of\s+(\d+)', re.IGNORECASE)
+RESULT_COUNT_PATTERN = re.compile(r'([\d,]+)\s+(?:results|products|items)\b', re.IGNORECASE)
+PAGE_PARAM_PATTERN = re.compile(r'[?&]page=(\d+)')
+
+
+def detect_page_count(html, per_page=None):
+    """Total number of pages advertised by a listing page, or None"""
+    soup = BeautifulSoup(html, 'html.parser')
+    pagination = soup.select_one('.pagination, nav[aria-label*="agination"]')
+
+    text = (pagination or soup).get_text(' ', strip=True)
+    match = PAGE_OF_PATTERN.search(text)
+    if match:
+        return int(match.group(1))
+
+    if pagination is not None:
+        # Highest page number linked from the pager ("1 2 3 ... 40")
+        numbers = [int(a.get_text(strip=True)) for a in pagination.select('a')
+                   if a.get_text(strip=True).isdigit()]
+        numbers += [int(m) for a in pagination.select('a[href]')
+                    for m in PAGE_PARAM_PATTERN.findall(a['href'])
+                    if 'next' not in (a.get('class') or [])]
+        if numbers:
+            return max(numbers)
+
+    if per_page:
+        match = RESULT_COUNT_PATTERN.search(soup.get_text(' ', strip=True))
+        if match:
+            return math.ceil(int(match.group(1).replace(',', '')) / per_page)
+    return None
+
+
+class SpeculativePaginator:
+    """Fetch listing pages ahead of the consumer, in a thread pool"""
+
+    def __init__(self, fetch, max_workers=8, prefetch=4):
+        # fetch(page, count_pages) -> (result, page_count or None); the count
+        # is only asked for on the first page, the one that advertises it
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.prefetch = prefetch
+        self.page_count = None
+        self.pages_fetched = 0
+        self.pages_wasted = 0
+        self._lock = threading.Lock()
+
+    def _fetch(self, page, count_pages=False):
+        result, page_count = self.fetch(page, count_pages)
+        with self._lock:
+            self.pages_fetched += 1
+        return result, page_count
+
+    def iter_pages(self, start=1, last=None):
+        """Yield (page, result) in page order from start up to last (inclusive)"""
+        if last is not None and start > last:
+            # e.g. a resumed crawl whose cursor is already past max_pages
+            return
+        result, self.page_count = self._fetch(start, count_pages=True)
+        yield start, result
+
+        futures = {}
+        next_to_submit = start + 1
+        page = start + 1
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while last is None or page <= last:
+                # Everything up to the advertised count, or k pages of speculation
+                target = max(self.page_count or 0, page + self.prefetch - 1)
+                if last is not None:
+                    target = min(target, last)
+                while next_to_submit <= target:
+                    futures[next_to_submit] = executor.submit(self._fetch, next_to_submit)
+                    next_to_submit += 1
+
+                result, _ = futures.pop(page).result()
+                yield page, result
+                page += 1
+        finally:
+            # The consumer stopped: drop queued speculation, let running requests finish
+            for future in futures.values():
+                if not future.cancel():
+                    self.pages_wasted += 1
+            executor.shutdown(wait=True)
+
+
+# Usage
+if __name__ == "__main__":
+    import time
+    from ExOfScraper import EcommerceScraper
+    from FixtureServer import FixtureServer
+
+    TOTAL_PAGES = 40
+
+    with FixtureServer(latency=0.1, total_pages=TOTAL_PAGES, products_per_page=24) as server:
+        print(f"{'Page count':<12}{'Mode':<12}{'Records':>9}{'Seconds':>9}{'Pages/s':>9}")
+        for show_page_count in (True, False):
+            server.httpd.show_page_count = show_page_count
+            records = {}
+            for parallel in (False, True):
+                scraper = EcommerceScraper(server.base_url, delay_range=(0, 0))
+                start = time.perf_counter()
+                scraper.navigate_category('/electronics', max_pages=100, parallel=parallel)
+                elapsed = time.perf_counter() - start
+                records[parallel] = [{k: v for k, v in r.items() if k != 'scrape_date'}
+                                     for r in scraper.results]
+                mode = 'parallel' if parallel else 'sequential'
+                label = 'shown' if show_page_count else 'hidden'
+                print(f"{label:<12}{mode:<12}{len(scraper.results):>9}{elapsed:>9.2f}"
+                      f"{TOTAL_PAGES / elapsed:>9.1f}")
+            # Same records, same order, whichever way the pages were fetched
+            assert records[True] == records[False]
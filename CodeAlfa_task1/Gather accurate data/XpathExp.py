@@ -1,8 +1,9 @@
-from lxml import html
-import requests
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-response = requests.get('https://example.com')
-tree = html.fromstring(response.content)
+from lxml import etree, html
+import requests
 
 # XPath examples
 xpath_queries = {
@@ -28,6 +29,102 @@ xpath_queries = {
     "text": "//div[@class='price']/text()"
 }
 
+
+def _plain(value):
+    """Detach a result from its tree so documents can be freed"""
+    if isinstance(value, etree._Element):
+        return ' '.join(value.text_content().split())
+    return value
+
+class XPathQuerySet:
+    """A named set of XPath expressions compiled once and run over many documents"""
+    
+    def __init__(self, queries):
+        self.queries = dict(queries)
+        self.names = list(self.queries)
+        # Compile up front so a bad expression fails here, not mid-archive
+        self._local = threading.local()
+        self._local.compiled = self._compile()
+    
+    def _compile(self):
+        # smart_strings=False returns plain str, not results pinning the tree
+        return {
+            name: etree.XPath(expr, smart_strings=False)
+            for name, expr in self.queries.items()
+        }
+    
+    def _compiled(self):
+        # XPath objects aren't shared between threads: one compiled set per worker
+        compiled = getattr(self._local, 'compiled', None)
+        if compiled is None:
+            compiled = self._local.compiled = self._compile()
+        return compiled
+    
+    def evaluate(self, document):
+        """Run every query on one document (HTML text/bytes or a parsed tree)"""
+        tree = html.fromstring(document) if isinstance(document, (str, bytes)) else document
+        results = {}
+        for name, xpath in self._compiled().items():
+            value = xpath(tree)
+            results[name] = [_plain(v) for v in value] if isinstance(value, list) else value
+        return results
+    
+    def iter_evaluate(self, documents, max_workers=None):
+        """Yield per-document results in input order, parsing in a thread pool if asked"""
+        if not max_workers:
+            for document in documents:
+                yield self.evaluate(document)
+            return
+    
+        # lxml releases the GIL while parsing and evaluating; a bounded
+        # window of futures keeps memory flat on long document streams
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for document in documents:
+                pending.append(executor.submit(self.evaluate, document))
+                if len(pending) >= max_workers * 4:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def evaluate_many(self, documents, max_workers=None):
+        """Columnar results: {query name: [result for document 0, 1, ...]}"""
+        columns = {name: [] for name in self.names}
+        for results in self.iter_evaluate(documents, max_workers):
+            for name in self.names:
+                columns[name].append(results[name])
+        return columns
+
 # Usage example
-prices = tree.xpath('//span[@class="price"]/text()')
-links = tree.xpath('//a[starts-with(@href, "/product")]/@href')
\ No newline at end of file
+if __name__ == "__main__":
+    import time
+    from FixtureServer import render_listing_page
+    
+    response = requests.get('https://example.com')
+    tree = html.fromstring(response.content)
+    prices = tree.xpath('//span[@class="price"]/text()')
+    links = tree.xpath('//a[starts-with(@href, "/product")]/@href')
+    
+    # Fast path over an archive of listing pages
+    listing_queries = {
+        "titles": "//h2[contains(@class, 'product-title')]/text()",
+        "prices": "//span[@class='price']/text()",
+        "links": "//a[starts-with(@href, '/product')]/@href",
+        "product_count": "count(//article[@class='product-item'])",
+        "has_next": "boolean(//nav[@class='pagination']/a[@class='next'])",
+    }
+    archive = [render_listing_page('electronics', page, products_per_page=100, total_pages=2000)
+               for page in range(1, 2001)]
+    
+    start = time.perf_counter()
+    for document in archive:
+        page_tree = html.fromstring(document)
+        raw = {name: page_tree.xpath(expr) for name, expr in listing_queries.items()}
+    print(f"raw tree.xpath strings: {time.perf_counter() - start:.2f}s")
+    
+    query_set = XPathQuerySet(listing_queries)
+    for workers in (None, 4):
+        start = time.perf_counter()
+        columns = query_set.evaluate_many(archive, max_workers=workers)
+        print(f"XPathQuerySet (workers={workers}): {time.perf_counter() - start:.2f}s, "
+              f"{int(sum(columns['product_count']))} products from {len(columns['titles'])} pages")
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Asyncio category crawl against the local catalog fixture
+"""
+
+import threading
+
+import pytest
+
+from AsyncCrawler import AsyncCategoryCrawler
+from CrawlFrontier import CrawlFrontier
+from CrawlProfiler import CrawlProfiler
+from ExOfScraper import EcommerceScraper
+from FixtureServer import FixtureServer, FlakyHandler
+from HttpCache import DiskResponseCache
+
+PAGES, PER_PAGE = 4, 3
+CATEGORIES = ['/electronics', '/books']
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(FlakyHandler, latency=0, total_pages=PAGES, products_per_page=PER_PAGE) as server:
+        yield server
+
+
+def identities(records):
+    return sorted((record['category'], record['title'], record['url']) for record in records)
+
+
+def test_matches_navigate_category(server):
+    reference = EcommerceScraper(server.base_url, delay_range=(0, 0))
+    for category_url in CATEGORIES:
+        reference.navigate_category(category_url, max_pages=10)
+
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0))
+    total = AsyncCategoryCrawler(scraper).run(CATEGORIES, max_pages=10)
+
+    assert total == len(CATEGORIES) * PAGES * PER_PAGE
+    assert identities(scraper.results) == identities(reference.results)
+
+
+def test_parses_off_the_event_loop(server):
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0))
+    threads = set()
+    parse_or_reuse = scraper.parse_or_reuse
+
+    def recording(*args):
+        threads.add(threading.current_thread())
+        return parse_or_reuse(*args)
+
+    scraper.parse_or_reuse = recording
+    AsyncCategoryCrawler(scraper).run(CATEGORIES[:1], max_pages=2)
+    assert threads and threading.main_thread() not in threads
+
+
+def test_error_pages_are_not_parsed_and_stay_open(server, tmp_path):
+    server.httpd.failure_rate = 1.0
+    frontier = CrawlFrontier(str(tmp_path / 'frontier.sqlite'), checkpoint_every=1)
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), frontier=frontier)
+    parsed = []
+    scraper.parse_or_reuse = lambda *args: parsed.append(args)
+
+    assert AsyncCategoryCrawler(scraper).run(CATEGORIES, max_pages=10) == 0
+    assert parsed == []
+    # 503s leave the cursor open so a later run retries
+    assert not any(frontier.is_finished(category_url) for category_url in CATEGORIES)
+    frontier.close()
+
+
+def test_resumes_from_frontier(server, tmp_path):
+    db_path = str(tmp_path / 'frontier.sqlite')
+
+    def crawl(max_pages):
+        frontier = CrawlFrontier(db_path, checkpoint_every=1)
+        scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), frontier=frontier)
+        AsyncCategoryCrawler(scraper).run(CATEGORIES, max_pages=max_pages)
+        finished = [frontier.is_finished(category_url) for category_url in CATEGORIES]
+        frontier.close()
+        return scraper.results, finished
+
+    results, finished = crawl(2)
+    assert len(results) == len(CATEGORIES) * 2 * PER_PAGE
+    assert finished == [False, False]
+
+    before = server.httpd.requests_seen
+    results, finished = crawl(10)
+    assert len(results) == len(CATEGORIES) * PAGES * PER_PAGE
+    assert finished == [True, True]
+    # Only pages 3..PAGES are fetched again
+    assert server.httpd.requests_seen - before == len(CATEGORIES) * (PAGES - 2)
+
+    before = server.httpd.requests_seen
+    results, _ = crawl(10)
+    assert len(results) == len(CATEGORIES) * PAGES * PER_PAGE
+    assert server.httpd.requests_seen == before
+
+
+def test_profiler_sees_requests_and_parses(server):
+    profiler = CrawlProfiler()
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), profiler=profiler)
+    AsyncCategoryCrawler(scraper).run(CATEGORIES, max_pages=10)
+
+    histograms = profiler.report()['histograms']
+    pages = len(CATEGORIES) * PAGES
+    assert histograms['bytes_per_page']['count'] == pages
+    assert histograms['parse']['count'] == pages
+    assert histograms['items_per_page']['count'] == pages
+
+
+def test_rejects_http_cache(server, tmp_path):
+    cache = DiskResponseCache(str(tmp_path / 'cache'))
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), cache=cache)
+    with pytest.raises(ValueError):
+        AsyncCategoryCrawler(scraper)
+    cache.close()
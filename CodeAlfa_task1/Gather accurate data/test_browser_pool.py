@@ -0,0 +1,109 @@
+"""
+BrowserPool checkout, recycling and shutdown with FakeDriver instead of Chrome
+"""
+
+import threading
+
+import pytest
+
+import BrowserPool as browser_pool
+from BrowserPool import BrowserPool
+from FakeDriver import FakeDriver
+
+STATES = ['<div class="product-item">Item</div>']
+
+
+def fake_driver():
+    return FakeDriver(STATES)
+
+
+def checkout_in_thread(pool):
+    """Start a thread that borrows a driver; its event is set once it has one"""
+    got = threading.Event()
+
+    def borrow():
+        with pool.driver():
+            got.set()
+
+    thread = threading.Thread(target=borrow, daemon=True)
+    thread.start()
+    return thread, got
+
+
+def test_drivers_are_reused_and_recycled_after_max_uses():
+    with BrowserPool(fake_driver, size=1, max_uses=2) as pool:
+        with pool.driver() as first:
+            pass
+        with pool.driver() as second:
+            pass
+        assert second is first
+        assert first.quit_called
+        with pool.driver() as third:
+            pass
+        assert third is not first
+        assert pool.drivers_created == 2
+
+
+def test_a_failing_block_replaces_the_driver():
+    with BrowserPool(fake_driver, size=1) as pool:
+        with pytest.raises(ValueError):
+            with pool.driver() as broken:
+                raise ValueError
+        assert broken.quit_called
+        with pool.driver() as driver:
+            assert driver is not broken
+
+
+def test_checkout_blocks_while_the_pool_is_exhausted():
+    with BrowserPool(fake_driver, size=1) as pool:
+        with pool.driver():
+            thread, got = checkout_in_thread(pool)
+            assert not got.wait(0.2)
+        thread.join(timeout=2)
+        assert got.is_set()
+        assert pool.drivers_created == 1
+
+
+def test_failed_launches_give_the_slot_back():
+    launches = []
+
+    def flaky_factory():
+        launches.append(1)
+        if len(launches) <= 3:
+            raise RuntimeError("chrome failed to start")
+        return fake_driver()
+
+    with BrowserPool(flaky_factory, size=2) as pool:
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                with pool.driver():
+                    pass
+        thread, got = checkout_in_thread(pool)
+        thread.join(timeout=2)
+        assert got.is_set()
+        assert pool.drivers_created == 1
+
+
+def test_close_quits_idle_drivers_and_refuses_checkouts():
+    pool = BrowserPool(fake_driver, size=2)
+    with pool.driver() as driver:
+        pass
+    pool.close()
+    assert driver.quit_called
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
+
+
+def test_default_pool_is_closed_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(browser_pool.atexit, 'register', registered.append)
+    monkeypatch.setattr(browser_pool, '_default_pool', None)
+
+    pool = browser_pool.get_default_pool()
+    assert browser_pool.get_default_pool() is pool
+    assert registered == [pool.close]
+
+    # A closed default pool is replaced rather than handed out
+    pool.close()
+    assert browser_pool.get_default_pool() is not pool
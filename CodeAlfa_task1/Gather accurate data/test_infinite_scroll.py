@@ -0,0 +1,47 @@
+"""
+Incremental infinite-scroll extraction over FakeDriver feed recordings
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from BrowserPool import BrowserPool
+from FakeDriver import FakeDriver
+from InfiniteScrollHandling import scrape_infinite_scroll
+
+NEWEST = datetime(2024, 6, 30, 23, tzinfo=timezone.utc)
+ITEMS, STEP = 200, 50
+
+
+def feed_states(offset):
+    """Newest-first items an hour apart, rendered in the given UTC offset (None: naive)"""
+    def stamp(i):
+        moment = NEWEST - timedelta(hours=i)
+        if offset is None:
+            return moment.replace(tzinfo=None).isoformat()
+        return moment.astimezone(timezone(timedelta(hours=offset))).isoformat()
+
+    items = [f'<div class="product-item" data-id="p{i}"><span class="title">Item {i}</span>'
+             f'<span class="price">${i}.00</span><time datetime="{stamp(i)}"></time></div>'
+             for i in range(ITEMS)]
+    return ["<div>" + "".join(items[:n]) + "</div>" for n in range(STEP, ITEMS + 1, STEP)]
+
+
+def scrape(states, **kwargs):
+    with BrowserPool(lambda: FakeDriver(states), size=1) as pool:
+        return scrape_infinite_scroll("https://example.com/feed", pool, incremental=True, **kwargs)
+
+
+def test_max_items_stops_early():
+    assert len(scrape(feed_states(0), max_items=70)) == 70
+
+
+@pytest.mark.parametrize('offset', [None, 0, 2, -5])
+@pytest.mark.parametrize('since', ['2024-06-29T23:00:00', '2024-06-29T23:00:00+00:00',
+                                   '2024-06-30T01:00:00+02:00'])
+def test_since_stops_at_the_same_item_whatever_the_offsets(offset, since):
+    # 24 items are newer than 2024-06-29T23:00Z, plus the one exactly at the cutoff
+    items = scrape(feed_states(offset), since=since)
+    assert len(items) == 25
+    assert items[-1]['title'] == 'Item 24'
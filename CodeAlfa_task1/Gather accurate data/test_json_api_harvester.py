@@ -0,0 +1,95 @@
+"""
+JsonApiHarvester against the fixture JSON API, including APIs that never signal the end
+"""
+
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from FixtureServer import ApiHandler, FixtureServer
+from JsonApiHarvester import JsonApiHarvester
+
+TOTAL = 230
+
+
+class QuirkyApiHandler(ApiHandler):
+    """ApiHandler plus /api/links (next-page URLs), /api/stuck and /api/loop"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        limit = int(query.get('limit', ['50'])[0])
+        if parsed.path == '/api/links':
+            start = int(query.get('offset', ['0'])[0])
+            end = min(start + limit, self.server.api_total_items)
+            host = self.headers['Host']
+            payload = {'items': [self._item(i) for i in range(start, end)],
+                       'links': {'next': f"http://{host}/api/links?offset={end}&limit={limit}"
+                                 if end < self.server.api_total_items else None}}
+        elif parsed.path == '/api/stuck':
+            # Ignores the page parameter and gives no pagination hints
+            payload = {'items': [self._item(i) for i in range(limit)]}
+        elif parsed.path == '/api/loop':
+            # Hands out the same cursor forever
+            payload = {'items': [self._item(i) for i in range(limit)], 'next_cursor': 'again'}
+        else:
+            return super().do_GET()
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope='module')
+def server():
+    with FixtureServer(QuirkyApiHandler, latency=0) as server:
+        server.httpd.api_total_items = TOTAL
+        yield server
+
+
+def harvest(server, endpoint, **kwargs):
+    harvester = JsonApiHarvester(server.base_url + endpoint, page_size=50, **kwargs)
+    return harvester, harvester.run()
+
+
+@pytest.mark.parametrize('endpoint, strategy', [
+    ('/api/products', 'pages'),
+    ('/api/feed', 'cursor'),
+    ('/api/links', 'cursor'),
+])
+def test_every_item_is_harvested_once(server, endpoint, strategy):
+    harvester, records = harvest(server, endpoint)
+    assert harvester.strategy == strategy
+    assert len(records) == len({r['url'] for r in records}) == TOTAL
+    assert harvester.pages_fetched == 5
+
+
+def test_records_use_the_scraper_schema(server):
+    _, records = harvest(server, '/api/products', category='electronics')
+    assert records[0]['title'] == 'Api Product 0'
+    assert records[0]['price'] == 10.99
+    assert records[0]['url'] == '/product/api/0'
+    assert records[0]['category'] == 'electronics'
+
+
+def test_api_ignoring_the_page_parameter_stops_on_a_repeated_page(server):
+    harvester, records = harvest(server, '/api/stuck')
+    assert harvester.strategy == 'sequential'
+    assert len(records) == 50
+    assert harvester.pages_fetched == 2
+
+
+def test_repeated_cursor_stops_the_walk(server):
+    harvester, _ = harvest(server, '/api/loop')
+    assert harvester.strategy == 'cursor'
+    assert harvester.pages_fetched == 2
+
+
+def test_max_pages_caps_every_strategy(server):
+    for endpoint in ('/api/products', '/api/feed', '/api/links'):
+        harvester, records = harvest(server, endpoint, max_pages=3)
+        assert harvester.pages_fetched == 3, endpoint
+        assert len(records) == 150, endpoint
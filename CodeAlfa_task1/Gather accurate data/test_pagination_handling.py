@@ -0,0 +1,31 @@
+"""
+PaginationScraper list and columnar results against the local catalog fixture
+"""
+
+import pytest
+
+import PaginationHandling
+from FixtureServer import FixtureServer
+from PaginationHandling import PaginationScraper
+
+PAGES, PER_PAGE = 3, 2
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(PaginationHandling.time, 'sleep', lambda seconds: None)
+    with FixtureServer(latency=0.01, total_pages=PAGES, products_per_page=PER_PAGE) as server:
+        yield server
+
+
+@pytest.mark.parametrize('columnar', [False, True], ids=['list', 'columnar'])
+def test_scrape_date_is_stamped_per_page(server, columnar):
+    scraper = PaginationScraper(f"{server.base_url}/books", columnar=columnar)
+    records = list(scraper.scrape_all_pages())
+
+    assert len(records) == PAGES * PER_PAGE
+    dates = [record['scrape_date'] if isinstance(record, dict) else record.scrape_date
+             for record in records]
+    pages = [dates[i:i + PER_PAGE] for i in range(0, len(dates), PER_PAGE)]
+    assert all(len(set(page)) == 1 for page in pages)
+    assert len({page[0] for page in pages}) == PAGES
@@ -0,0 +1,55 @@
+"""
+Fetch -> parse pipeline against the local catalog fixture
+"""
+
+import pytest
+
+from ExOfScraper import EcommerceScraper
+from FixtureServer import FixtureServer, FlakyHandler
+from ParsePipeline import ParsePipeline
+
+PAGES, PER_PAGE = 4, 5
+CATEGORIES = ['/electronics', '/books']
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(FlakyHandler, latency=0, total_pages=PAGES, products_per_page=PER_PAGE) as server:
+        yield server
+
+
+def identities(records):
+    return sorted((record['category'], record['title'], record['url']) for record in records)
+
+
+@pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+def test_matches_navigate_category(server, backend):
+    reference = EcommerceScraper(server.base_url, delay_range=(0, 0), selector_backend=backend)
+    for category_url in CATEGORIES:
+        reference.navigate_category(category_url, max_pages=10)
+
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), selector_backend=backend)
+    records = list(ParsePipeline(scraper, fetch_workers=4, parse_workers=2).stream(CATEGORIES, max_pages=10))
+
+    assert len(records) == len(CATEGORIES) * PAGES * PER_PAGE
+    assert identities(records) == identities(reference.results)
+
+
+def test_stops_at_last_page_with_one_speculative_fetch(server):
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0))
+    pipeline = ParsePipeline(scraper, fetch_workers=4, parse_workers=2)
+    records = list(pipeline.stream(CATEGORIES, max_pages=10))
+
+    assert len(records) == len(CATEGORIES) * PAGES * PER_PAGE
+    # Page PAGES + 1 may already be in flight when page PAGES says "no next"
+    assert len(CATEGORIES) * PAGES <= server.httpd.requests_seen <= len(CATEGORIES) * (PAGES + 1)
+    assert pipeline.parse_stats.pages == len(CATEGORIES) * PAGES
+
+
+def test_max_pages_bounds_fetches(server):
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0))
+    pipeline = ParsePipeline(scraper, fetch_workers=4, parse_workers=2)
+    records = list(pipeline.stream(CATEGORIES, max_pages=2))
+
+    assert len(records) == len(CATEGORIES) * 2 * PER_PAGE
+    assert server.httpd.requests_seen == len(CATEGORIES) * 2
@@ -0,0 +1,153 @@
+"""
+CircuitBreaker, RetryBudget and HedgedRequester against a local flaky stub server
+"""
+
+import time
+
+import pytest
+import requests
+from tenacity import wait_none
+
+from FixtureServer import FixtureServer, FlakyHandler
+from HttpTransport import HttpTransport
+from ResilienceControls import CircuitBreaker, CircuitOpenError, HedgedRequester, RetryBudget
+from RoburstScrapingPattern import RobustScraper
+
+
+class SlowNextHandler(FlakyHandler):
+    """FlakyHandler whose next server.slow_next requests take server.slow_latency"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            slow = server.slow_next > 0
+            server.slow_next -= slow
+        if slow:
+            time.sleep(server.slow_latency)
+        super().do_GET()
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(SlowNextHandler, latency=0, total_pages=3, products_per_page=2) as server:
+        server.httpd.slow_next = 0
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # tenacity's 4-10s exponential backoff would dominate the run time
+    monkeypatch.setattr(RobustScraper.fetch_with_retry.retry, 'wait', wait_none())
+
+
+def no_retries():
+    return RetryBudget(ratio=0.0, min_retries_per_window=0)
+
+
+def test_breaker_opens_probes_half_open_and_closes(server):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=0.2)
+    scraper = RobustScraper(circuit_breaker=breaker, retry_budget=no_retries())
+    url = f"{server.base_url}/electronics?page=1"
+
+    server.httpd.failure_rate = 1.0
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            scraper.fetch_with_retry(url)
+    assert breaker.state(url) == CircuitBreaker.OPEN
+
+    # Open: fail fast without touching the origin
+    seen = server.httpd.requests_seen
+    with pytest.raises(CircuitOpenError):
+        scraper.fetch_with_retry(url)
+    assert server.httpd.requests_seen == seen
+    assert breaker.rejected == 1
+
+    # After the cooldown one probe goes out; a failed probe re-opens at once
+    time.sleep(0.25)
+    with pytest.raises(requests.HTTPError):
+        scraper.fetch_with_retry(url)
+    assert server.httpd.requests_seen == seen + 1
+    assert breaker.state(url) == CircuitBreaker.OPEN
+
+    # A successful probe closes the breaker again
+    time.sleep(0.25)
+    server.httpd.failure_rate = 0.0
+    assert scraper.fetch_with_retry(url).status_code == 200
+    assert breaker.state(url) == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.05)
+    url = 'http://origin.test/page'
+    breaker.record_failure(url)
+    time.sleep(0.1)
+
+    breaker.before_request(url)
+    assert breaker.state(url) == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+
+
+def test_retry_budget_stops_retries_once_spent(server):
+    server.httpd.failure_rate = 1.0
+    budget = RetryBudget(ratio=0.0, min_retries_per_window=2, window=60)
+    scraper = RobustScraper(retry_budget=budget)
+
+    for page in (1, 2, 3):
+        with pytest.raises(requests.HTTPError):
+            scraper.fetch_with_retry(f"{server.base_url}/electronics?page={page}")
+
+    # Three attempts for the first URL (two retries), then one attempt each
+    assert server.httpd.requests_seen == 5
+    assert len(budget.retries) == 2
+    assert budget.denied == 2
+
+
+def test_final_attempt_spends_no_budget(server):
+    server.httpd.failure_rate = 1.0
+    budget = RetryBudget(ratio=0.0, min_retries_per_window=10, window=60)
+    scraper = RobustScraper(retry_budget=budget)
+
+    # Running out of attempts raises the last HTTP error, as a denied retry does
+    with pytest.raises(requests.HTTPError):
+        scraper.fetch_with_retry(f"{server.base_url}/electronics?page=1")
+    assert server.httpd.requests_seen == 3
+    assert len(budget.retries) == 2
+    assert budget.denied == 0
+
+
+def test_hedge_fires_past_the_latency_quantile_and_wins(server):
+    hedger = HedgedRequester(HttpTransport(), min_samples=5)
+    url = f"{server.base_url}/electronics?page=1"
+    for _ in range(5):
+        hedger.get(url)
+    assert hedger.hedge_delay(url) is not None
+
+    server.httpd.slow_latency = 1.0
+    server.httpd.slow_next = 1
+    start = time.perf_counter()
+    response = hedger.get(url)
+    elapsed = time.perf_counter() - start
+    hedger.close()
+
+    assert response.status_code == 200
+    assert hedger.hedges_fired == 1
+    assert hedger.hedges_won == 1
+    assert elapsed < 0.5
+
+
+def test_hedge_needs_retry_budget(server):
+    hedger = HedgedRequester(HttpTransport(), min_samples=5, retry_budget=no_retries())
+    url = f"{server.base_url}/electronics?page=1"
+    for _ in range(5):
+        hedger.get(url)
+
+    server.httpd.slow_latency = 0.3
+    server.httpd.slow_next = 1
+    start = time.perf_counter()
+    hedger.get(url)
+    elapsed = time.perf_counter() - start
+    hedger.close()
+
+    assert hedger.hedges_fired == 0
+    assert elapsed >= 0.3
@@ -0,0 +1,132 @@
+"""
+SitemapDiscovery and scrape_discovered against local sitemap fixtures
+"""
+
+import pytest
+
+from CrawlFrontier import CrawlFrontier
+from ExOfScraper import EcommerceScraper
+from FixtureServer import CatalogHandler, FixtureServer
+from SitemapDiscovery import SitemapDiscovery, parse_lastmod
+
+PAGES, PER_PAGE = 5, 24
+PRODUCTS = PAGES * PER_PAGE
+EDITED = '2026-01-02T08:30:00+00:00'
+
+
+class ThrottlingHandler(CatalogHandler):
+    """Answers 429 for the product pages listed in server.throttled"""
+
+    def send_discovery(self, path):
+        parts = path.strip('/').split('/')
+        if path.startswith('/product/') and parts[-1].isdigit() and int(parts[-1]) in self.server.throttled:
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().send_discovery(path)
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(ThrottlingHandler, latency=0, total_pages=PAGES, products_per_page=PER_PAGE) as server:
+        # Two categories of two sitemaps each, behind one gzipped index
+        server.httpd.sitemap_chunk = PRODUCTS // 2
+        server.httpd.sitemap_categories = ('electronics', 'books')
+        server.httpd.throttled = set()
+        yield server
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / 'frontier.sqlite'))
+    yield frontier
+    frontier.close()
+
+
+def scraper_for(server, frontier):
+    return EcommerceScraper(server.base_url, delay_range=(0, 0), frontier=frontier)
+
+
+def test_index_recursion_reaches_every_child_sitemap(server):
+    discovery = SitemapDiscovery(server.base_url, url_pattern=r'/product/')
+    urls = [url for url, _ in discovery.discover()]
+
+    assert len(urls) == len(set(urls)) == 2 * PRODUCTS
+    # The index plus its four child sitemaps
+    assert discovery.stats['sitemaps'] == 5
+    assert discovery.stats['urls_matched'] == 2 * PRODUCTS
+
+
+def test_max_depth_stops_at_the_index(server):
+    discovery = SitemapDiscovery(server.base_url, max_depth=0)
+
+    assert list(discovery.discover()) == []
+    assert discovery.stats['sitemaps'] == 1
+
+
+def test_since_skips_unchanged_sitemaps_and_entries(server):
+    edited = range(0, PRODUCTS, 10)
+    for product_id in edited:
+        server.httpd.lastmod_overrides[('books', product_id)] = EDITED
+
+    discovery = SitemapDiscovery(server.base_url, url_pattern=r'/product/',
+                                 since=parse_lastmod('2026-01-01T12:00:00Z'))
+    found = dict(discovery.discover())
+
+    assert set(found) == {f"{server.base_url}/product/books/{i}" for i in edited}
+    assert set(found.values()) == {EDITED}
+    # Both electronics sitemaps are untouched and never fetched
+    assert discovery.stats['sitemaps_skipped'] == 2
+
+
+def test_recrawl_queues_only_changed_lastmods(server, frontier):
+    discovery = SitemapDiscovery(server.base_url, url_pattern=r'/product/')
+    assert discovery.feed(frontier) == 2 * PRODUCTS
+    assert scraper_for(server, frontier).scrape_discovered() == 2 * PRODUCTS
+
+    # Nothing changed: nothing to fetch
+    assert SitemapDiscovery(server.base_url, url_pattern=r'/product/').feed(frontier) == 0
+
+    server.httpd.lastmod_overrides[('electronics', 7)] = EDITED
+    assert SitemapDiscovery(server.base_url, url_pattern=r'/product/').feed(frontier) == 1
+    assert frontier.pending_product_urls() == [(f"{server.base_url}/product/electronics/7", EDITED)]
+
+
+def test_interrupted_run_resumes_with_the_remaining_urls(server, tmp_path):
+    db_path = str(tmp_path / 'resume.sqlite')
+    frontier = CrawlFrontier(db_path, checkpoint_every=10)
+    SitemapDiscovery(server.base_url, url_pattern=r'/product/').feed(frontier)
+    first = scraper_for(server, frontier)
+    assert first.scrape_discovered(max_products=50) == 50
+    frontier.close()
+
+    # A new process picks up the same database
+    frontier = CrawlFrontier(db_path)
+    assert len(frontier.pending_product_urls()) == 2 * PRODUCTS - 50
+    second = scraper_for(server, frontier)
+    assert second.scrape_discovered() == 2 * PRODUCTS - 50
+    assert frontier.pending_product_urls() == []
+    frontier.close()
+
+    urls = [r['url'] for r in first.results + second.results]
+    assert len(urls) == len(set(urls)) == 2 * PRODUCTS
+
+
+def test_throttled_products_stay_pending(server, frontier):
+    server.httpd.sitemap_categories = ('electronics',)
+    server.httpd.throttled = {3, 4}
+    SitemapDiscovery(server.base_url, url_pattern=r'/product/').feed(frontier)
+
+    scraper = scraper_for(server, frontier)
+    assert scraper.scrape_discovered() == PRODUCTS
+    assert len(scraper.results) == PRODUCTS - 2
+    # Only the throttled URLs are still pending (compared as a set, order aside)
+    pending = {url for url, _ in frontier.pending_product_urls()}
+    assert pending == {f"{server.base_url}/product/electronics/{i}" for i in (3, 4)}
+
+    # Once the site stops throttling they are fetched without a lastmod change
+    server.httpd.throttled = set()
+    assert scraper.scrape_discovered() == 2
+    assert frontier.pending_product_urls() == []
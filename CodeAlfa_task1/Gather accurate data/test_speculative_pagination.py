@@ -0,0 +1,55 @@
+"""
+Parallel pagination against the local catalog fixture, resumed through a CrawlFrontier
+"""
+
+import pytest
+
+from CrawlFrontier import CrawlFrontier
+from ExOfScraper import EcommerceScraper
+from FixtureServer import FixtureServer, FlakyHandler
+from SpeculativePagination import SpeculativePaginator
+
+PAGES, PER_PAGE = 6, 4
+
+
+@pytest.fixture
+def server():
+    # FlakyHandler counts requests; with failure_rate 0 it never fails
+    with FixtureServer(FlakyHandler, latency=0, total_pages=PAGES, products_per_page=PER_PAGE) as server:
+        yield server
+
+
+def crawl(server, db_path, max_pages, parallel):
+    frontier = CrawlFrontier(db_path, checkpoint_every=1)
+    scraper = EcommerceScraper(server.base_url, delay_range=(0, 0), frontier=frontier)
+    scraper.navigate_category('/electronics', max_pages=max_pages, parallel=parallel)
+    frontier.close()
+    return scraper.results
+
+
+def test_start_past_last_fetches_nothing():
+    fetched = []
+    paginator = SpeculativePaginator(lambda page, count_pages: (fetched.append(page), None))
+    assert list(paginator.iter_pages(3, last=2)) == []
+    assert fetched == []
+
+
+@pytest.mark.parametrize('parallel', [False, True], ids=['sequential', 'parallel'])
+def test_resume_past_max_pages_fetches_nothing(server, tmp_path, parallel):
+    db_path = str(tmp_path / 'frontier.sqlite')
+    assert len(crawl(server, db_path, 2, parallel)) == 2 * PER_PAGE
+    seen = server.httpd.requests_seen
+
+    # The cursor is at page 3: the same max_pages only reloads the checkpoint
+    assert len(crawl(server, db_path, 2, parallel)) == 2 * PER_PAGE
+    assert server.httpd.requests_seen == seen
+
+
+@pytest.mark.parametrize('parallel', [False, True], ids=['sequential', 'parallel'])
+def test_resume_continues_from_the_cursor(server, tmp_path, parallel):
+    db_path = str(tmp_path / 'frontier.sqlite')
+    crawl(server, db_path, 2, parallel)
+
+    results = crawl(server, db_path, PAGES, parallel)
+    urls = [r['url'] for r in results]
+    assert len(urls) == len(set(urls)) == PAGES * PER_PAGE
@@ -0,0 +1,76 @@
+"""
+Benchmark: ProductSpider + SQLitePipeline items/sec against the local fixture
+
+Runs the spider three times in one reactor: per-item transactions, batched
+transactions, then a batched re-run over the same database to show the
+upsert keeps one row per URL.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.log import configure_logging
+from scrapy.utils.reactor import install_reactor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Gather accurate data'))
+from FixtureServer import FixtureServer
+from CodeAlfa_AdvScrapy import ProductSpider
+
+TOTAL_PAGES = 100
+PRODUCTS_PER_PAGE = 50
+
+
+def spider_with(db_path, batch_size):
+    """ProductSpider with the pipeline settings overridden for one run"""
+    settings = dict(ProductSpider.custom_settings, SQLITE_PATH=db_path, SQLITE_BATCH_SIZE=batch_size,
+                    LOG_LEVEL='WARNING')
+    return type('BenchmarkProductSpider', (ProductSpider,), {'custom_settings': settings})
+
+
+def row_count(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+
+# Usage
+if __name__ == "__main__":
+    install_reactor('twisted.internet.asyncioreactor.AsyncioSelectorReactor')
+    from twisted.internet import defer, reactor
+
+    configure_logging({'LOG_LEVEL': 'WARNING'})
+    runner = CrawlerRunner()
+    workdir = tempfile.mkdtemp()
+    runs = [
+        ('per-item commits', os.path.join(workdir, 'per_item.db'), 1),
+        ('batched (500)', os.path.join(workdir, 'batched.db'), 500),
+        ('batched re-run', os.path.join(workdir, 'batched.db'), 500),
+    ]
+
+    with FixtureServer(latency=0.01, total_pages=TOTAL_PAGES, products_per_page=PRODUCTS_PER_PAGE) as server:
+        # Seed every listing page so the per-domain concurrency is actually used;
+        # start URLs bypass the dupefilter, so followed pages repeat products
+        start_urls = [f"{server.base_url}/electronics?page={page}" for page in range(1, TOTAL_PAGES + 1)]
+
+        @defer.inlineCallbacks
+        def crawl_all():
+            try:
+                print(f"{'Run':<20}{'Items':>8}{'Dupes':>7}{'Seconds':>9}{'Items/s':>10}{'DB rows':>9}")
+                for label, db_path, batch_size in runs:
+                    crawler = runner.create_crawler(spider_with(db_path, batch_size))
+                    start = time.perf_counter()
+                    yield runner.crawl(crawler, start_urls=start_urls, category='electronics')
+                    elapsed = time.perf_counter() - start
+                    items = crawler.stats.get_value('item_scraped_count', 0)
+                    dupes = crawler.stats.get_value('item_dropped_count', 0)
+                    print(f"{label:<20}{items:>8}{dupes:>7}{elapsed:>9.2f}{items / elapsed:>10.0f}"
+                          f"{row_count(db_path):>9}")
+                assert row_count(runs[-1][1]) == TOTAL_PAGES * PRODUCTS_PER_PAGE
+            finally:
+                reactor.stop()
+
+        crawl_all()
+        reactor.run()
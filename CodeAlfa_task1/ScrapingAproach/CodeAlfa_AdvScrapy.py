@@ -1,29 +1,67 @@
 # Create a Scrapy spider (save as scraper.py)
+import os
+import sys
+import time
+from datetime import datetime
+
 import scrapy
 from scrapy.crawler import CrawlerProcess
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Gather accurate data'))
+from ProductRecords import ProductRecord
+
 class ProductSpider(scrapy.Spider):
     name = 'products'
     start_urls = ['https://example.com/products']
+    category = None
+    
+    # Throughput defaults: parallel requests per site, with AutoThrottle
+    # backing off on its own when the site slows down
+    custom_settings = {
+        'CONCURRENT_REQUESTS': 32,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 16,
+        'DOWNLOAD_DELAY': 0,
+        'AUTOTHROTTLE_ENABLED': True,
+        'AUTOTHROTTLE_START_DELAY': 0.05,
+        'AUTOTHROTTLE_MAX_DELAY': 10,
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': 8.0,
+        'ITEM_PIPELINES': {'CodeAlfa_ScrapyPipelines.SQLitePipeline': 300},
+        'SQLITE_PATH': 'products.db',
+        'SQLITE_BATCH_SIZE': 500,
+        # Set PROFILE_REPORT to a path to write a crawl profile (see ProfileReport.py)
+        'EXTENSIONS': {'CodeAlfa_ScrapyProfiler.ProfilerExtension': 500},
+    }
     
     def parse(self, response):
-        # Extract product information
-        for product in response.css('div.product-item'):
-            yield {
-                'name': product.css('h3::text').get(),
-                'price': product.css('span.price::text').get(),
-                'rating': product.css('div.rating::text').get(),
-                'url': product.css('a::attr(href)').get()
-            }
+        # Extract product information as slotted records, one timestamp per page
+        start = time.perf_counter()
+        scrape_date = datetime.now().isoformat()
+        records = []
+        for product in response.css('div.product-item, article.product-item'):
+            href = product.css('a::attr(href)').get()
+            records.append(ProductRecord(
+                title=product.css('h3::text, h2::text').get(),
+                price=product.css('span.price::text').get(),
+                rating=product.css('div.rating::text').get(),
+                url=response.urljoin(href) if href else None,
+                category=self.category,
+                scrape_date=scrape_date,
+            ))
+        
+        # Parse time excludes the pipelines, which run as items are yielded
+        profiler = getattr(self.crawler, 'profiler', None)
+        if profiler is not None:
+            profiler.observe('parse', time.perf_counter() - start)
+            profiler.observe('items_per_page', len(records))
+        yield from records
         
         # Follow pagination
-        next_page = response.css('a.next::attr(href)').get()
+        next_page = response.css('a.next:not(.disabled)::attr(href)').get()
         if next_page:
             yield response.follow(next_page, self.parse)
 
 # Run the spider
-process = CrawlerProcess(settings={
-    'FEEDS': {'output.json': {'format': 'json'}}
-})
-process.crawl(ProductSpider)
-process.start()
\ No newline at end of file
+if __name__ == "__main__":
+    process = CrawlerProcess()
+    process.crawl(ProductSpider)
+    process.start()
\ No newline at end of file
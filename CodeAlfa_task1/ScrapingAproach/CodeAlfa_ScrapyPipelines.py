@@ -0,0 +1,152 @@
+"""
+Item pipeline persisting ProductSpider items to SQLite
+
+Prices and ratings are normalised to floats, items are de-duplicated by
+URL hash within a crawl, and rows are written in batched transactions as
+an upsert on the URL, so re-running a crawl refreshes rows instead of
+duplicating them and the table can be queried while the crawl runs.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Gather accurate data'))
+from CrawlFrontier import url_hash
+
+PRICE_JUNK_PATTERN = re.compile(r'[^\d.]')
+RATING_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+UPSERT_SQL = """
+    INSERT INTO products (url_hash, url, name, price, rating, category, scrape_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url_hash) DO UPDATE SET
+        name = excluded.name,
+        price = excluded.price,
+        rating = excluded.rating,
+        category = excluded.category,
+        scrape_date = excluded.scrape_date
+"""
+
+
+def normalise_price(value):
+    """'$1,299.99' -> 1299.99; None when nothing numeric is left"""
+    if value is None:
+        return None
+    cleaned = PRICE_JUNK_PATTERN.sub('', str(value))
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def normalise_rating(value):
+    """'4.5 out of 5' -> 4.5, '★★★★☆' -> 4.0"""
+    if value is None:
+        return None
+    match = RATING_PATTERN.search(str(value))
+    if match:
+        return float(match.group())
+    stars = str(value).count('★')
+    return float(stars) if stars else None
+
+
+class SQLitePipeline:
+    """Batched, de-duplicating upsert of product items into SQLite"""
+
+    def __init__(self, db_path='products.db', batch_size=500, crawler=None):
+        self.db_path = db_path
+        # ProfilerExtension may be created after the pipelines; look it up on open
+        self.crawler = crawler
+        self.profiler = None
+        self.batch_size = batch_size
+        self.conn = None
+        self.batch = []
+        self.seen = set()
+        self.items_written = 0
+        self.duplicates = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(
+            db_path=crawler.settings.get('SQLITE_PATH', 'products.db'),
+            batch_size=crawler.settings.getint('SQLITE_BATCH_SIZE', 500),
+            crawler=crawler,
+        )
+
+    # spider stays optional: newer Scrapy versions stop passing it
+    def open_spider(self, spider=None):
+        self.profiler = getattr(self.crawler, 'profiler', None)
+        self.conn = sqlite3.connect(self.db_path)
+        # WAL lets readers query the table while the crawl is writing
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS products (
+                url_hash INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                name TEXT,
+                price REAL,
+                rating REAL,
+                category TEXT,
+                scrape_date TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_products_category ON products (category);
+            CREATE INDEX IF NOT EXISTS idx_products_scrape_date ON products (scrape_date);
+        """)
+
+    def process_item(self, item, spider=None):
+        if self.profiler is None:
+            return self._validate_and_queue(item)
+        start = time.perf_counter()
+        try:
+            return self._validate_and_queue(item)
+        finally:
+            self.profiler.observe('validate', time.perf_counter() - start)
+
+    def _validate_and_queue(self, item):
+        """Drop duplicates, normalise price/rating and add the row to the batch"""
+        # Dicts and ProductRecord dataclass items alike
+        adapter = ItemAdapter(item)
+        url = adapter.get('url')
+        if not url:
+            raise DropItem("Item without a URL")
+
+        key = url_hash(url)
+        if key in self.seen:
+            self.duplicates += 1
+            # Products listed on several pages are routine, not worth a warning each
+            raise DropItem(f"Duplicate item: {url}", log_level='DEBUG')
+        self.seen.add(key)
+
+        adapter['price'] = normalise_price(adapter.get('price'))
+        adapter['rating'] = normalise_rating(adapter.get('rating'))
+        if not adapter.get('scrape_date'):
+            adapter['scrape_date'] = datetime.now().isoformat()
+        name = adapter.get('title', adapter.get('name'))
+        self.batch.append((
+            key, url, (name or '').strip() or None, adapter['price'],
+            adapter['rating'], adapter.get('category'), adapter['scrape_date'],
+        ))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+        return item
+
+    def flush(self):
+        """Write the pending batch in one transaction"""
+        if not self.batch:
+            return
+        with self.conn:
+            self.conn.executemany(UPSERT_SQL, self.batch)
+        self.items_written += len(self.batch)
+        self.batch = []
+
+    def close_spider(self, spider=None):
+        self.flush()
+        self.conn.close()
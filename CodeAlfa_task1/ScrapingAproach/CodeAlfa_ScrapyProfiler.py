@@ -0,0 +1,67 @@
+"""
+Scrapy extension feeding a CrawlProfiler and saving its report on close
+
+Enabled by setting PROFILE_REPORT to an output path. Response latency
+(Scrapy's download_latency, i.e. TTFB), bytes per page and HTTP errors
+come from signals; the spider and SQLitePipeline record parse and
+validate time through crawler.profiler. Downloader exceptions are taken
+from the stats collector when the spider closes.
+"""
+
+import os
+import sys
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Gather accurate data'))
+from CrawlProfiler import CrawlProfiler
+
+EXCEPTION_STAT_PREFIX = 'downloader/exception_type_count/'
+
+
+class ProfilerExtension:
+    """Collect crawl histograms for one spider run"""
+
+    def __init__(self, crawler, output_path):
+        self.crawler = crawler
+        self.output_path = output_path
+        self.profiler = CrawlProfiler(scraper='scrapy')
+        # Spider and pipelines look the profiler up here
+        crawler.profiler = self.profiler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        output_path = crawler.settings.get('PROFILE_REPORT')
+        if not output_path:
+            raise NotConfigured
+        extension = cls(crawler, output_path)
+        crawler.signals.connect(extension.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(extension.response_received, signal=signals.response_received)
+        crawler.signals.connect(extension.spider_error, signal=signals.spider_error)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def spider_opened(self, spider):
+        self.profiler.run_name = f"{spider.name}-{self.profiler.run_name}"
+
+    def response_received(self, response, request, spider):
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            self.profiler.observe('ttfb', latency)
+        if response.status >= 400:
+            self.profiler.error(f"HTTP {response.status}")
+        else:
+            self.profiler.observe('bytes_per_page', len(response.body))
+
+    def spider_error(self, failure, response, spider):
+        self.profiler.error(failure.type.__name__)
+
+    def spider_closed(self, spider, reason):
+        stats = self.crawler.stats.get_stats()
+        for key, count in stats.items():
+            if key.startswith(EXCEPTION_STAT_PREFIX):
+                name = key[len(EXCEPTION_STAT_PREFIX):].rsplit('.', 1)[-1]
+                self.profiler.error(name, count)
+        self.profiler.labels['finish_reason'] = reason
+        self.profiler.save(self.output_path)
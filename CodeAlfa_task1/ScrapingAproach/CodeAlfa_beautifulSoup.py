@@ -1,16 +1,23 @@
-import requests
+import os
+import sys
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
 
+# Shared pooled transport lives with the other scraper building blocks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Gather accurate data'))
+from HttpTransport import get_default_transport
+from ProductRecords import to_float
+
 # Basic web scraping example
-def scrape_basic_info(url):
+def scrape_basic_info(url, sink=None, transport=None):
+    """Scrape titles and prices; with a streaming sink, return its summary instead"""
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
     
     try:
-        response = requests.get(url, headers=headers)
+        response = (transport or get_default_transport()).get(url, headers=headers)
         soup = BeautifulSoup(response.content, 'html.parser')
         
         # Extract specific elements
@@ -24,6 +31,12 @@ def scrape_basic_info(url):
                 'price': price.text.strip()
             })
         
+        # Streaming sinks flush batches to disk instead of building a DataFrame;
+        # their schema stores prices as numbers ('$10.99' -> 10.99)
+        if sink is not None:
+            sink.write_many({**record, 'price': to_float(record['price'])} for record in data)
+            return sink.summary()
+        
         return pd.DataFrame(data)
     
     except Exception as e:
@@ -31,5 +44,6 @@ def scrape_basic_info(url):
         return None
 
 # Save to CSV
-df = scrape_basic_info('https://example.com')
-df.to_csv('scraped_data.csv', index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    df = scrape_basic_info('https://example.com')
+    df.to_csv('scraped_data.csv', index=False)
\ No newline at end of file